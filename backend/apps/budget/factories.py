@@ -0,0 +1,51 @@
+import factory
+from factory import fuzzy
+
+from apps.users.factories import UserFactory
+
+from .models import BudgetAllocation, BudgetCategory, Expense, RelocationCase
+
+CATEGORY_NAMES = ["Housing", "Moving", "Travel", "Schooling", "Visa & Legal", "Storage"]
+
+
+class BudgetCategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = BudgetCategory
+        django_get_or_create = ("name",)
+
+    name = factory.Iterator(CATEGORY_NAMES)
+    default_amount = fuzzy.FuzzyDecimal(500, 5000)
+
+
+class RelocationCaseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = RelocationCase
+
+    user = factory.SubFactory(UserFactory)
+    # RelocationCase.save() generates one too, but bulk_create doesn't call save()
+    case_number = factory.Sequence(lambda n: f"RC-BENCH-{n:08d}")
+    relocation_type = fuzzy.FuzzyChoice([code for code, _ in RelocationCase.RELOCATION_TYPE])
+    total_budget = fuzzy.FuzzyDecimal(5000, 100000)
+
+
+class BudgetAllocationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = BudgetAllocation
+
+    case = factory.SubFactory(RelocationCaseFactory)
+    category = factory.SubFactory(BudgetCategoryFactory)
+    allocated_amount = fuzzy.FuzzyDecimal(500, 20000)
+    actual_spent = fuzzy.FuzzyDecimal(0, 500)
+
+
+class ExpenseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Expense
+
+    case = factory.SubFactory(RelocationCaseFactory)
+    category = factory.SubFactory(BudgetCategoryFactory)
+    title = factory.Faker("sentence", nb_words=3)
+    amount = fuzzy.FuzzyDecimal(10, 3000)
+    expense_date = factory.Faker("date_between", start_date="-6m", end_date="today")
+    status = fuzzy.FuzzyChoice([code for code, _ in Expense.EXPENSE_STATUS])
+    created_by = factory.LazyAttribute(lambda expense: expense.case.user)
@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Sum, Q
+from django.shortcuts import redirect
 from .models import RelocationCase, Expense, BudgetAllocation, BudgetCategory
 from .serializers import *
 from apps.profiles.models import Profile
@@ -18,9 +19,9 @@ class RelocationCaseViewSet(viewsets.ModelViewSet):
         if hasattr(user, "managed_cases"):
             return RelocationCase.objects.filter(
                 Q(user=user) | Q(consultant=user)
-            ).distinct()
+            ).distinct().order_by("-created_at")
         
-        return RelocationCase.objects.filter(user=user)
+        return RelocationCase.objects.filter(user=user).order_by("-created_at")
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -36,7 +37,7 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user=self.request.user
 
-        queryset = Expense.objects.select_related("case", "category")
+        queryset = Expense.objects.select_related("case", "category").order_by("-expense_date", "-created_at")
 
         queryset = queryset.filter(created_by=user)
 
@@ -50,6 +51,14 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    @action(detail=True, methods=["get"])
+    def receipt(self, request, pk=None):
+        """Redirect to a signed, expiring link for the expense's receipt"""
+        expense = self.get_object()
+        if not expense.receipt:
+            return Response({"error": "No receipt uploaded."}, status=status.HTTP_404_NOT_FOUND)
+        return redirect(expense.receipt.url)
+
     @action(detail=True, methods=["post"])
     def submit_for_approval(self, request, pk=None):
         expense = self.get_object()
@@ -89,7 +98,7 @@ class BudgetAllocationViewSet(viewsets.ModelViewSet):
         user = self.request.user
         case_id = self.request.query_params.get('case_id')
         
-        queryset = BudgetAllocation.objects.select_related('case', 'category')
+        queryset = BudgetAllocation.objects.select_related('case', 'category').order_by('created_at')
         
         if case_id:
             queryset = queryset.filter(case_id=case_id)
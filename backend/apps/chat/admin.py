@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Conversation, Message, UserChatProfile
+from .models import ChatConnection, Conversation, Message, UserChatProfile
 
 # Optional: Customize the User model display if needed
 # from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
@@ -77,3 +77,12 @@ class UserChatProfileAdmin(admin.ModelAdmin):
         return obj.user.username
     user_username.short_description = 'Username'
 
+
+@admin.register(ChatConnection)
+class ChatConnectionAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for live WebSocket connections.
+    """
+    list_display = ('channel_name', 'user', 'last_heartbeat', 'created_at')
+    search_fields = ('channel_name', 'user__username')
+    readonly_fields = ('channel_name', 'user', 'groups', 'last_heartbeat', 'created_at', 'updated_at')
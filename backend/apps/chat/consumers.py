@@ -1,8 +1,11 @@
+import asyncio
 import json
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Conversation, Message, UserChatProfile
+from .models import ChatConnection, Conversation, Message, UserChatProfile
 from django.utils.timezone import now
 from channels.layers import get_channel_layer
 from django.db.models import Q
@@ -12,122 +15,193 @@ import base64
 import uuid
 from typing import Optional, Dict, Any
 from channels.db import database_sync_to_async
+from channels.consumer import get_handler_name
+from channels.exceptions import StopConsumer
 from django.utils import timezone
+from apps.common.querycount import query_budget
 
 User = get_user_model()
 
 logger = logging.getLogger(__name__)
 
-class ChatConsumer(AsyncWebsocketConsumer):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.user = None
-        self.other_user = None
-        self.conversation = None
-        self.room_group_name = None
-        self.page_size = 50
-        self.user_chatlist_group = None    # For updating current user's chat list
-        self.other_user_chatlist_group = None  # For updating other user's chat list
-
-    async def connect(self):
-        """Handle WebSocket connection."""
-        self.user = self.scope["user"]
-
-        if not self.user or self.user.is_anonymous:
-            await self.close(code=4001)
-            return
-
-        if not self.user.is_authenticated:
-            await self.close(code=4003)
-            return
-        
-        other_username = self.scope['url_route']['kwargs']['username']
-
-        if self.user.username == other_username:
-            await self.close(code=4002)
-            return
-        
-        try:
-            self.other_user = await self.get_user_by_username(other_username)
-            self.conversation, created = await sync_to_async(Conversation.get_or_create_conversation)(self.user, self.other_user)
+# Close code for sockets dropped by the idle watchdog or the reaper.
+IDLE_CLOSE_CODE = 4008
 
-            # Set room group name
-            self.room_group_name = f'conversation_{self.conversation.id}'
-            
-            self.user_chatlist_group = f'user_{self.user.id}_chatlist'
-            self.other_user_chatlist_group = f'user_{self.other_user.id}_chatlist'
 
-            # Join conversation room
-            await self.channel_layer.group_add(
-                self.room_group_name,
-                self.channel_name
-            )
-            
-            # Join user's chat list group
-            await self.channel_layer.group_add(
-                self.user_chatlist_group,
-                self.channel_name
-            )
+class HeartbeatConsumer(AsyncWebsocketConsumer):
+    """
+    Base consumer with an application-level heartbeat.
 
-            await self.accept()
+    Clients send {"type": "ping"} every CHAT_HEARTBEAT_INTERVAL seconds and get
+    {"type": "pong"} back. Each heartbeat refreshes the socket's group
+    memberships and its ChatConnection row. A socket that sends nothing for
+    CHAT_HEARTBEAT_TIMEOUT seconds is closed, and rows that stop being
+    refreshed are cleaned up by `apps.chat.tasks.reap_stale_connections`.
 
-            # Update user online status
-            await self.set_user_online_status(self.user, True)
+    Subclasses join groups through `join_group()` so memberships are tracked;
+    they are discarded automatically on disconnect.
+    """
+    heartbeat_interval = settings.CHAT_HEARTBEAT_INTERVAL
+    heartbeat_timeout = settings.CHAT_HEARTBEAT_TIMEOUT
 
-            # Send recent messages
-            await self.send_recent_messages()
-
-            logger.info(f"User {self.user.username} connected to chat with {other_username}")
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.joined_groups = set()
+        self.last_activity = time.monotonic()
+        self._idle_watchdog = None
+        self._connection_saved = False
+
+    async def dispatch(self, message):
+        # Query budgets are per handler, e.g. "ChatConsumer.websocket_receive".
+        # websocket_disconnect ends with StopConsumer; it is re-raised outside
+        # the block so the disconnect is still checked.
+        stopped = False
+        with query_budget(f"{type(self).__name__}.{get_handler_name(message)}"):
+            try:
+                await super().dispatch(message)
+            except StopConsumer:
+                stopped = True
+        if stopped:
+            raise StopConsumer
+
+    async def join_group(self, group):
+        await self.channel_layer.group_add(group, self.channel_name)
+        self.joined_groups.add(group)
+        if self._connection_saved:
+            await self.save_connection()
+
+    async def leave_group(self, group):
+        await self.channel_layer.group_discard(group, self.channel_name)
+        self.joined_groups.discard(group)
+        if self._connection_saved:
+            await self.save_connection()
+
+    async def accept(self, subprotocol=None, headers=None):
+        await super().accept(subprotocol, headers)
+        self.last_activity = time.monotonic()
+        await self.save_connection()
+        self._connection_saved = True
+        self._idle_watchdog = asyncio.create_task(self.watch_idle())
+
+    async def websocket_receive(self, message):
+        self.last_activity = time.monotonic()
+        text = message.get("text")
+        # Cheap substring test first so regular frames are not parsed twice.
+        if text and '"ping"' in text:
+            try:
+                if json.loads(text).get('type') == 'ping':
+                    await self.heartbeat()
+                    return
+            except (json.JSONDecodeError, AttributeError):
+                pass
+        await super().websocket_receive(message)
+
+    async def websocket_disconnect(self, message):
+        if self._idle_watchdog:
+            self._idle_watchdog.cancel()
+        for group in self.joined_groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        if self._connection_saved:
+            await self.delete_connection()
+        await super().websocket_disconnect(message)
+
+    async def heartbeat(self):
+        """Refresh group memberships and the connection row, then answer."""
+        for group in self.joined_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.touch_connection()
+        await self.send(text_data=json.dumps({
+            'type': 'pong',
+            'timestamp': now().isoformat()
+        }))
 
-        except Exception as e:
-            logger.error(f"Error connecting chat: {e}")
-            await self.close(code=4003)
+    async def watch_idle(self):
+        """Close the socket once it has been silent for longer than the timeout."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if time.monotonic() - self.last_activity > self.heartbeat_timeout:
+                logger.info(f"Closing idle socket {self.channel_name}")
+                await self.close(code=IDLE_CLOSE_CODE)
+                return
 
-    async def disconnect(self, close_code):
-        """Handle WebSocket disconnection"""
-        if self.user and self.user.is_authenticated:
-            # Leave room group
-            if self.room_group_name:
-                await self.channel_layer.group_discard(
-                    self.room_group_name,
-                    self.channel_name
-                )
-            
-            # Leave chat list group
-            if self.user_chatlist_group:
-                await self.channel_layer.group_discard(
-                    self.user_chatlist_group,
-                    self.channel_name
-                )
-            
-            # Update user online status
-            await self.set_user_online_status(self.user, False)
+    async def connection_reap(self, event):
+        """Sent by the reaper when this connection missed its heartbeats."""
+        await self.close(code=IDLE_CLOSE_CODE)
 
+    @database_sync_to_async
+    def save_connection(self):
+        ChatConnection.objects.update_or_create(
+            channel_name=self.channel_name,
+            defaults={
+                'user': self.user,
+                'groups': sorted(self.joined_groups),
+                'last_heartbeat': timezone.now(),
+            }
+        )
 
-    async def receive(self, text_data=None, bytes_data=None):
-        """Handle incoming WebSocket messages."""
-        try:
-            data = json.loads(text_data) if text_data else None
-            message_type = data.get('type', 'message')
-
-            if message_type == 'message':
-                await self.handle_new_message(data)
-            elif message_type == 'typing':
-                await self.handle_typing_indicator(data)
-            elif message_type == 'read_receipt':
-                await self.handle_read_receipts(data)
-            elif message_type == 'delete_message':
-                await self.handle_delete_message(data)
-            elif message_type == 'load_more':
-                await self.handle_load_more(data)
-            elif message_type == 'update_message':
-                await self.handle_update_message(data)
+    @database_sync_to_async
+    def touch_connection(self):
+        updated = ChatConnection.objects.filter(
+            channel_name=self.channel_name
+        ).update(last_heartbeat=timezone.now())
+        if not updated:
+            # Reaped while the socket was still alive (e.g. a long GC pause).
+            ChatConnection.objects.create(
+                channel_name=self.channel_name,
+                user=self.user,
+                groups=sorted(self.joined_groups),
+            )
 
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON received")
+    @database_sync_to_async
+    def delete_connection(self):
+        ChatConnection.objects.filter(channel_name=self.channel_name).delete()
 
-        except Exception as e:
-            logger.error(f"Error processing message: {e}")
+    @database_sync_to_async
+    def has_other_connections(self):
+        """Whether the user still has another live socket (called after this one is removed)."""
+        return ChatConnection.objects.filter(user=self.user).exists()
+
+
+class ConversationMixin:
+    """
+    Conversation handlers shared by ChatConsumer and the gateway's
+    conversation streams. Expects `user`, `channel_layer` and `send()` on the
+    instance; `open_conversation()` sets up the rest.
+    """
+    other_user = None
+    conversation = None
+    room_group_name = None
+    page_size = 50
+    user_chatlist_group = None    # For updating current user's chat list
+    other_user_chatlist_group = None  # For updating other user's chat list
+
+    async def open_conversation(self, other_username):
+        """Resolve the other user and the conversation, and name its groups."""
+        self.other_user = await self.get_user_by_username(other_username)
+        self.conversation, created = await sync_to_async(Conversation.get_or_create_conversation)(self.user, self.other_user)
+
+        # Set room group name
+        self.room_group_name = f'conversation_{self.conversation.id}'
+
+        self.user_chatlist_group = f'user_{self.user.id}_chatlist'
+        self.other_user_chatlist_group = f'user_{self.other_user.id}_chatlist'
+
+    async def dispatch_conversation_message(self, data):
+        """Route a decoded client frame to its handler."""
+        message_type = data.get('type', 'message')
+
+        if message_type == 'message':
+            await self.handle_new_message(data)
+        elif message_type == 'typing':
+            await self.handle_typing_indicator(data)
+        elif message_type == 'read_receipt':
+            await self.handle_read_receipts(data)
+        elif message_type == 'delete_message':
+            await self.handle_delete_message(data)
+        elif message_type == 'load_more':
+            await self.handle_load_more(data)
+        elif message_type == 'update_message':
+            await self.handle_update_message(data)
 
     async def handle_new_message(self, data):
         message = await self.create_message(text=data.get('text'), temp_id=data.get('temp_id'))
@@ -148,6 +222,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             {
                 'type': 'chat_message',
+                'conversation_id': str(self.conversation.id),
                 'message': serialized
             }
         )
@@ -167,6 +242,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             {
                 'type': 'typing_indicator',
+                'conversation_id': str(self.conversation.id),
                 'user_id': str(self.user.id),
                 'is_typing': is_typing,
                 'timestamp': now().isoformat()
@@ -189,6 +265,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     'type': 'read_receipt',
+                    'conversation_id': str(self.conversation.id),
                     'user_id': str(self.user.id),
                     'message_ids': message_ids,
                     'timestamp': now().isoformat()
@@ -211,6 +288,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     'type': 'message_deleted',
+                    'conversation_id': str(self.conversation.id),
                     'user_id': str(self.user.id),
                     'message_id': message_id,
                     'delete_for_everyone': delete_for_everyone,
@@ -245,6 +323,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     'type': 'message_updated',
+                    'conversation_id': str(self.conversation.id),
                     'message_id': message_id,
                     'new_text': new_text,
                     'updated_by': str(self.user.id),
@@ -358,20 +437,6 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         logger.info(f"📢 Chat list notified for conversation {self.conversation.id}")
 
-    async def chatlist_update(self, event):
-        """
-        Handle chat list update notifications.
-        Frontend uses this to reorder conversations.
-        """
-        await self.send(text_data=json.dumps({
-            'type': 'chatlist_update',
-            'conversation_id': event['conversation_id'],
-            'last_message': event.get('last_message'),
-            'updated_at': event['updated_at'],
-            'action': event['action'],
-            'unread_increment': event.get('unread_increment', 0)
-        }))
-
     
     # Helper methods
     async def send_recent_messages(self):
@@ -399,6 +464,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             {
                 'type': 'chat_message',
+                'conversation_id': str(self.conversation.id),
                 'message': serialized_message,
                 'is_for_receiver': True
             }
@@ -620,8 +686,102 @@ class ChatConsumer(AsyncWebsocketConsumer):
             conversation=self.conversation
         ).update(status='delivered')
 
+
+class ChatListMixin:
+    """Chat list updates, shared by ChatListConsumer, ChatConsumer and the gateway."""
+
+    async def chatlist_update(self, event):
+        """
+        Handle chat list update notifications.
+        Frontend uses this to reorder conversations.
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'chatlist_update',
+            'conversation_id': event['conversation_id'],
+            'last_message': event.get('last_message'),
+            'updated_at': event['updated_at'],
+            'action': event['action'],
+            'unread_increment': event.get('unread_increment', 0)
+        }))
+
+    async def documents_reviewed(self, event):
+        """A consultant reviewed a batch of this user's documents (apps.profiles.reviews)"""
+        await self.send(text_data=json.dumps({
+            'type': 'documents_reviewed',
+            'reviewed_by': event['reviewed_by'],
+            'documents': event['documents'],
+        }))
+
+
+class ChatConsumer(HeartbeatConsumer, ConversationMixin, ChatListMixin):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = None
+
+    async def connect(self):
+        """Handle WebSocket connection."""
+        self.user = self.scope["user"]
+
+        if not self.user or self.user.is_anonymous:
+            await self.close(code=4001)
+            return
+
+        if not self.user.is_authenticated:
+            await self.close(code=4003)
+            return
+        
+        other_username = self.scope['url_route']['kwargs']['username']
+
+        if self.user.username == other_username:
+            await self.close(code=4002)
+            return
+        
+        try:
+            await self.open_conversation(other_username)
+
+            # Join conversation room
+            await self.join_group(self.room_group_name)
+            
+            # Join user's chat list group
+            await self.join_group(self.user_chatlist_group)
+
+            await self.accept()
+
+            # Update user online status
+            await self.set_user_online_status(self.user, True)
+
+            # Send recent messages
+            await self.send_recent_messages()
+
+            logger.info(f"User {self.user.username} connected to chat with {other_username}")
+
+        except Exception as e:
+            logger.error(f"Error connecting chat: {e}")
+            await self.close(code=4003)
+
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        # Groups are left by HeartbeatConsumer
+        if self.user and self.user.is_authenticated:
+            # Update user online status unless another socket is still open
+            if not await self.has_other_connections():
+                await self.set_user_online_status(self.user, False)
+
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """Handle incoming WebSocket messages."""
+        try:
+            data = json.loads(text_data) if text_data else None
+            await self.dispatch_conversation_message(data)
+
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON received")
+
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+
 # consumers.py - Update ChatListConsumer.connect()
-class ChatListConsumer(AsyncWebsocketConsumer):
+class ChatListConsumer(HeartbeatConsumer, ChatListMixin):
     async def connect(self):
         """Connect user to chat list updates"""
         
@@ -642,117 +802,38 @@ class ChatListConsumer(AsyncWebsocketConsumer):
         # Each user has their own chat list group
         self.group_name = f'user_{self.user.id}_chatlist'
         
-        await self.channel_layer.group_add(
-            self.group_name,
-            self.channel_name
-        )
+        await self.join_group(self.group_name)
         
         await self.accept()
         
         print(f"✅ CHATLIST CONSUMER: Connection accepted for user {self.user.username}")
 
-    async def disconnect(self, close_code):
-        """Disconnect from chat list updates"""
-        if hasattr(self, 'group_name'):
-            await self.channel_layer.group_discard(
-                self.group_name,
-                self.channel_name
-            )
-
-    async def chatlist_update(self, event):
-        """
-        Receive chat list update from other consumers.
-        Send to frontend to reorder chats.
-        """
-        await self.send(text_data=json.dumps({
-            'type': 'chatlist_update',
-            'conversation_id': event['conversation_id'],
-            'last_message': event.get('last_message'),
-            'updated_at': event['updated_at'],
-            'action': event['action'],
-            'unread_increment': event.get('unread_increment', 0)
-        }))
-
     async def receive(self, text_data):
         """Handle incoming messages (optional)"""
         pass
     
-class OnlineStatusConsumer(AsyncWebsocketConsumer):
-    """Handle online status updates"""
-
-    async def connect(self):
-        self.user = self.scope["user"]
-        if not self.user.is_authenticated:
-            await self.close(code=4003)
-            return
-        
-        self.user_group = f'status_{self.user.id}'
-
-        self.global_group = 'online_status'
-        await self.channel_layer.group_add(
-            self.user_group,
-            self.channel_name
-        )
-
-        await self.accept()
+class PresenceMixin:
+    """Online status handlers, shared by OnlineStatusConsumer and the gateway."""
+    global_group = 'online_status'
 
-        # Set user online
-        await self.set_user_online(True)
-
-        # Broadcast to all users
+    async def broadcast_status(self, is_online):
+        """Broadcast this user's online status to all users"""
         await self.channel_layer.group_send(
             self.global_group,
             {
                 'type': 'user_status',
                 'user_id': str(self.user.id),
                 'username': self.user.username,
-                'is_online': True,
+                'is_online': is_online,
                 'timestamp': now().isoformat()
             }
         )
 
-    async def disconnect(self, close_code):
-        if hasattr(self, "user") and self.user.is_authenticated:
-            # Set user offline
-
-            await self.set_user_online(False)
-
-            # Broadcast to all users
-            await self.channel_layer.group_send(
-                self.global_group,
-                {
-                    'type': 'user_status',
-                    'user_id': str(self.user.id),
-                    'username': self.user.username,
-                    'is_online': False,
-                    'timestamp': now().isoformat()
-                }
-            )
-
-            # Leave groups
-            await self.channel_layer.group_discard(
-                self.user_group,
-                self.channel_name
-            )
-            await self.channel_layer.group_discard(
-                self.global_group,
-                self.channel_name
-            )
-
-    async def receive(self, text_data=None):
-        """Handle incoming status updates"""
-        try:
-            data = json.loads(text_data) if text_data else None
-
-            if data.get("type") == "update_status":
-                # User can update their status (awat, busy, etc)
-                status = data.get("status", "online")
-                await self.update_user_status(status)
-                await self.update_user_status(status)
-
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON received in OnlineStatusConsumer")
-            pass
+    async def handle_presence_message(self, data):
+        if data.get("type") == "update_status":
+            # User can update their status (awat, busy, etc)
+            status = data.get("status", "online")
+            await self.update_user_status(status)
 
     async def user_status(self, event):
         """Handle user status updates from group"""
@@ -764,7 +845,6 @@ class OnlineStatusConsumer(AsyncWebsocketConsumer):
             'timestamp': event['timestamp']
         }))
 
-    
     @database_sync_to_async
     def set_user_online(self, is_online):
         """Set user online status"""
@@ -780,3 +860,248 @@ class OnlineStatusConsumer(AsyncWebsocketConsumer):
         profile, created = UserChatProfile.objects.get_or_create(user=self.user)
         profile.custom_status = status
         profile.save()
+
+
+class OnlineStatusConsumer(HeartbeatConsumer, PresenceMixin):
+    """Handle online status updates"""
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        if not self.user.is_authenticated:
+            await self.close(code=4003)
+            return
+        
+        self.user_group = f'status_{self.user.id}'
+
+        await self.join_group(self.user_group)
+
+        await self.accept()
+
+        # Set user online
+        await self.set_user_online(True)
+
+        # Broadcast to all users
+        await self.broadcast_status(True)
+
+    async def disconnect(self, close_code):
+        # Groups are left by HeartbeatConsumer
+        if hasattr(self, "user") and self.user.is_authenticated:
+            if await self.has_other_connections():
+                return
+
+            # Set user offline
+            await self.set_user_online(False)
+
+            # Broadcast to all users
+            await self.broadcast_status(False)
+
+    async def receive(self, text_data=None):
+        """Handle incoming status updates"""
+        try:
+            data = json.loads(text_data) if text_data else None
+            await self.handle_presence_message(data)
+
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON received in OnlineStatusConsumer")
+            pass
+
+
+class GatewayStream:
+    """
+    One logical stream on a ChatGatewayConsumer socket.
+
+    Handlers written for the dedicated consumers run unchanged on a stream:
+    `send()` wraps each frame as {"stream": <name>, "payload": <frame>}.
+    """
+
+    def __init__(self, gateway, name, group=None):
+        self.gateway = gateway
+        self.name = name
+        self.group = group
+        self.user = gateway.user
+        self.channel_layer = gateway.channel_layer
+        self.channel_name = gateway.channel_name
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        # Splice the encoded frame in rather than decoding and re-encoding it
+        await self.gateway.send(
+            text_data=f'{{"stream": {json.dumps(self.name)}, "payload": {text_data}}}'
+        )
+
+
+class ConversationStream(GatewayStream, ConversationMixin):
+    pass
+
+
+class ChatListStream(GatewayStream, ChatListMixin):
+    pass
+
+
+class PresenceStream(GatewayStream, PresenceMixin):
+    pass
+
+
+class ChatGatewayConsumer(HeartbeatConsumer):
+    """
+    Multiplexed socket: chat list, presence and any number of conversations
+    over one authenticated connection, instead of one socket each.
+
+    Client frames:
+        {"action": "subscribe", "stream": "chatlist"}
+        {"action": "subscribe", "stream": "presence"}
+        {"action": "subscribe", "stream": "conversation", "username": "<other user>"}
+        {"action": "unsubscribe", "stream": "conversation:<conversation id>"}
+        {"stream": "conversation:<conversation id>", "type": "message", "text": "..."}
+        {"stream": "presence", "type": "update_status", "status": "busy"}
+
+    Server frames are {"stream": <name>, "payload": <frame>}, where <frame> is
+    what the dedicated consumer would have sent. Subscription replies and
+    errors use the "gateway" stream.
+    """
+    max_conversations = 20
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = None
+        self.streams = {}
+
+    async def connect(self):
+        self.user = self.scope["user"]
+
+        if not self.user or not self.user.is_authenticated:
+            await self.close(code=4001)
+            return
+
+        self.control = GatewayStream(self, 'gateway')
+        self.presence = PresenceStream(self, 'presence', group=PresenceMixin.global_group)
+
+        await self.accept()
+
+        await self.presence.set_user_online(True)
+        await self.presence.broadcast_status(True)
+
+    async def disconnect(self, close_code):
+        # Groups are left by HeartbeatConsumer
+        if self.user and self.user.is_authenticated:
+            if not await self.has_other_connections():
+                await self.presence.set_user_online(False)
+                await self.presence.broadcast_status(False)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data) if text_data else {}
+            action = data.get('action')
+
+            if action == 'subscribe':
+                await self.subscribe(data)
+            elif action == 'unsubscribe':
+                await self.unsubscribe(data.get('stream'))
+            else:
+                stream = self.streams.get(data.get('stream'))
+                if isinstance(stream, ConversationStream):
+                    await stream.dispatch_conversation_message(data)
+                elif isinstance(stream, PresenceStream):
+                    await stream.handle_presence_message(data)
+                elif stream is None:
+                    await self.send_control('error', stream=data.get('stream'), message='Not subscribed to stream')
+
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON received in ChatGatewayConsumer")
+
+        except Exception as e:
+            logger.error(f"Error processing gateway message: {e}")
+
+    async def subscribe(self, data):
+        kind = data.get('stream')
+
+        if kind == 'conversation':
+            await self.subscribe_conversation(data.get('username'))
+            return
+
+        if kind == 'chatlist':
+            stream = ChatListStream(self, 'chatlist', group=f'user_{self.user.id}_chatlist')
+        elif kind == 'presence':
+            stream = self.presence
+        else:
+            await self.send_control('error', stream=kind, message='Unknown stream')
+            return
+
+        if stream.name not in self.streams:
+            self.streams[stream.name] = stream
+            await self.join_group(stream.group)
+        await self.send_control('subscribed', stream=stream.name)
+
+    async def subscribe_conversation(self, username):
+        if not username or username == self.user.username:
+            await self.send_control('error', stream='conversation', message='Invalid username')
+            return
+
+        open_conversations = sum(isinstance(s, ConversationStream) for s in self.streams.values())
+        if open_conversations >= self.max_conversations:
+            await self.send_control('error', stream='conversation', message='Too many open conversations')
+            return
+
+        stream = ConversationStream(self, None)
+        try:
+            await stream.open_conversation(username)
+        except Exception as e:
+            logger.error(f"Error opening conversation with {username}: {e}")
+            await self.send_control('error', stream='conversation', message='Conversation not available')
+            return
+
+        stream.name = f'conversation:{stream.conversation.id}'
+        stream.group = stream.room_group_name
+        if stream.name not in self.streams:
+            self.streams[stream.name] = stream
+            await self.join_group(stream.group)
+
+        await self.send_control('subscribed', stream=stream.name, username=username)
+        await self.streams[stream.name].send_recent_messages()
+
+    async def unsubscribe(self, name):
+        stream = self.streams.pop(name, None)
+        if stream is None:
+            await self.send_control('error', stream=name, message='Not subscribed to stream')
+            return
+
+        await self.leave_group(stream.group)
+        await self.send_control('unsubscribed', stream=name)
+
+    async def send_control(self, type, **fields):
+        await self.control.send(text_data=json.dumps({'type': type, **fields}))
+
+    # Group events, routed to the subscribed stream (if any)
+    async def chatlist_update(self, event):
+        stream = self.streams.get('chatlist')
+        if stream:
+            await stream.chatlist_update(event)
+
+    async def documents_reviewed(self, event):
+        stream = self.streams.get('chatlist')
+        if stream:
+            await stream.documents_reviewed(event)
+
+    async def user_status(self, event):
+        stream = self.streams.get('presence')
+        if stream:
+            await stream.user_status(event)
+
+    async def route_conversation_event(self, handler, event):
+        stream = self.streams.get(f"conversation:{event.get('conversation_id')}")
+        if stream:
+            await getattr(stream, handler)(event)
+
+    async def chat_message(self, event):
+        await self.route_conversation_event('chat_message', event)
+
+    async def typing_indicator(self, event):
+        await self.route_conversation_event('typing_indicator', event)
+
+    async def read_receipt(self, event):
+        await self.route_conversation_event('read_receipt', event)
+
+    async def message_deleted(self, event):
+        await self.route_conversation_event('message_deleted', event)
+
+    async def message_updated(self, event):
+        await self.route_conversation_event('message_updated', event)
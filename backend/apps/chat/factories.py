@@ -0,0 +1,26 @@
+import factory
+from factory import fuzzy
+
+from apps.users.factories import UserFactory
+
+from .models import Conversation, Message
+
+
+class ConversationFactory(factory.django.DjangoModelFactory):
+    """Pass users already ordered by id, as Conversation.get_or_create_conversation stores them"""
+
+    class Meta:
+        model = Conversation
+
+    user1 = factory.SubFactory(UserFactory)
+    user2 = factory.SubFactory(UserFactory)
+
+
+class MessageFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Message
+
+    conversation = factory.SubFactory(ConversationFactory)
+    sender = factory.LazyAttribute(lambda message: message.conversation.user1)
+    text = factory.Faker("sentence")
+    status = fuzzy.FuzzyChoice([code for code, _ in Message.STATUS_CHOICES])
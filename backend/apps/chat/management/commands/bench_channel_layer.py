@@ -0,0 +1,98 @@
+import asyncio
+import statistics
+import time
+import uuid
+
+from channels.layers import channel_layers
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Compare group fan-out throughput of the channel layer profiles.
+
+    Each run joins N fresh channels to one group, sends M group messages and
+    waits for every channel to drain them, the same shape as a busy
+    conversation or the global `online_status` group.
+
+        python manage.py bench_channel_layer --receivers 100 --messages 500
+    """
+
+    help = "Benchmark group fan-out throughput for the configured channel layer profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modes", nargs="+", default=["core", "pubsub"],
+            help="CHANNEL_LAYERS aliases to benchmark (default: core pubsub).",
+        )
+        parser.add_argument("--receivers", type=int, default=50, help="Channels joined to the group.")
+        parser.add_argument("--messages", type=int, default=200, help="Messages sent to the group.")
+        parser.add_argument(
+            "--timeout", type=float, default=5.0,
+            help="Seconds a receiver waits for the next message before counting the rest as lost.",
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        for mode in options["modes"]:
+            if mode not in channel_layers:
+                raise CommandError(f"Unknown channel layer alias: {mode}")
+            self.stdout.write(f"Benchmarking '{mode}'...")
+            results.append(asyncio.run(self.run_mode(
+                mode, options["receivers"], options["messages"], options["timeout"]
+            )))
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'mode':<8} {'sent/s':>10} {'delivered/s':>12} {'lost':>6} {'p50 ms':>8} {'p99 ms':>8}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['mode']:<8} {r['send_rate']:>10.0f} {r['delivery_rate']:>12.0f} "
+                f"{r['lost']:>6} {r['p50']:>8.2f} {r['p99']:>8.2f}"
+            )
+
+    async def run_mode(self, mode, receivers, messages, timeout):
+        # A fresh backend per run: layers cache connections per event loop.
+        layer = channel_layers.make_backend(mode)
+        group = f"bench_{uuid.uuid4().hex}"
+        channels = [await layer.new_channel() for _ in range(receivers)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+
+        async def drain(channel):
+            latencies = []
+            for _ in range(messages):
+                try:
+                    message = await asyncio.wait_for(layer.receive(channel), timeout)
+                except asyncio.TimeoutError:
+                    break
+                latencies.append(time.perf_counter() - message["sent"])
+            return latencies
+
+        drains = [asyncio.create_task(drain(channel)) for channel in channels]
+
+        started = time.perf_counter()
+        for i in range(messages):
+            await layer.group_send(group, {"type": "bench.message", "seq": i, "sent": time.perf_counter()})
+        sent_in = time.perf_counter() - started
+
+        latencies = [lat for per_channel in await asyncio.gather(*drains) for lat in per_channel]
+        elapsed = time.perf_counter() - started
+
+        for channel in channels:
+            await layer.group_discard(group, channel)
+        if hasattr(layer, "close_pools"):
+            await layer.close_pools()
+        else:
+            await layer.flush()
+
+        latencies.sort()
+        return {
+            "mode": mode,
+            "send_rate": messages / sent_in if sent_in else 0,
+            "delivery_rate": len(latencies) / elapsed if elapsed else 0,
+            "lost": receivers * messages - len(latencies),
+            "p50": statistics.median(latencies) * 1000 if latencies else 0,
+            "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0,
+        }
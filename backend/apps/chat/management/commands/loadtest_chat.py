@@ -0,0 +1,358 @@
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from urllib.request import urlopen
+
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.chat.models import Conversation
+from apps.users.factories import USERNAME_PREFIX
+
+# Load-test messages are "loadtest <seq>"; receivers look the send time up by text
+TEXT_PREFIX = "loadtest "
+PRESENCE_STATUSES = ["online", "away", "busy"]
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0
+
+
+class InProcessSocket:
+    """A socket on the project's ASGI application, run in this event loop."""
+
+    def __init__(self, path):
+        from backend.asgi import application
+
+        self.communicator = WebsocketCommunicator(application, path)
+
+    async def connect(self, timeout):
+        return await self.communicator.connect(timeout)
+
+    async def send(self, data):
+        await self.communicator.send_to(text_data=json.dumps(data))
+
+    async def receive(self, timeout):
+        # A timeout here stops the consumer too (asgiref), so callers pass the time left in the run
+        message = await self.communicator.receive_output(timeout)
+        return json.loads(message["text"]) if message["type"] == "websocket.send" else None
+
+    async def close(self, timeout):
+        # The consumer is cancelled if its disconnect handler outlives the timeout
+        await self.communicator.disconnect(timeout=timeout)
+
+
+class RemoteSocket:
+    """A socket on a running ASGI server (daphne/uvicorn); needs the `websockets` package."""
+
+    def __init__(self, url):
+        self.url = url
+        self.connection = None
+
+    async def connect(self, timeout):
+        import websockets
+
+        try:
+            self.connection = await websockets.connect(self.url, open_timeout=timeout)
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+            return False, type(e).__name__
+        return True, None
+
+    async def send(self, data):
+        await self.connection.send(json.dumps(data))
+
+    async def receive(self, timeout):
+        import websockets
+
+        try:
+            return json.loads(await asyncio.wait_for(self.connection.recv(), timeout))
+        except websockets.exceptions.ConnectionClosed:
+            return None
+
+    async def close(self, timeout):
+        if self.connection is not None:
+            await asyncio.wait_for(self.connection.close(), timeout)
+
+
+class Stats:
+    def __init__(self):
+        self.connect = defaultdict(list)   # kind -> connect latencies, ms
+        self.failed = Counter()            # (kind, close code) -> sockets
+        self.closed = Counter()            # kind -> sockets closed by the server mid-run
+        self.frames = Counter()            # frame type -> frames received
+        self.sent = {}                     # message text -> perf_counter at send
+        self.latencies = []                # end-to-end delivery, ms
+
+
+class Command(BaseCommand):
+    """
+    Load-test the chat WebSocket consumers.
+
+    Takes --conversations seeded conversations (see seed_benchmark_data) and,
+    for each participant, opens authenticated sockets to ws/chat/<other>/,
+    ws/chat/list/ and ws/status/, ramping connections up over --ramp
+    seconds. For --duration seconds every chat socket then types and sends
+    messages at --message-rate per minute, the other side answers each
+    delivered message with a read receipt, status sockets change status now
+    and then, and every socket pings at CHAT_HEARTBEAT_INTERVAL.
+
+    Reports connect latency per endpoint, end-to-end delivery latency (send
+    on one socket to receipt on the other participant's), lost messages, and
+    the server's CPU, memory and queries per consumer handler from its
+    Prometheus metrics.
+
+    By default the sockets run in process against backend.asgi with the
+    configured channel layer (local Redis), so CPU and memory include the
+    load generator itself. Against a running server, pass its URL; metrics
+    are then scraped from /metrics, which covers one worker process:
+
+        python manage.py loadtest_chat --conversations 500 --duration 60
+        python manage.py loadtest_chat --url ws://localhost:8000 --conversations 2000
+    """
+
+    help = "Open many authenticated chat sockets, replay chat traffic and report latency and server load."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--conversations", type=int, default=250,
+            help="Seeded conversations to load; each participant opens three sockets.",
+        )
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds of traffic once connected.")
+        parser.add_argument("--ramp", type=float, default=10.0, help="Seconds over which sockets connect.")
+        parser.add_argument("--drain", type=float, default=3.0, help="Seconds to wait for in-flight messages.")
+        parser.add_argument("--message-rate", type=float, default=6.0, help="Messages per minute per chat socket.")
+        parser.add_argument("--read-ratio", type=float, default=0.8, help="Share of messages answered with a read receipt.")
+        parser.add_argument("--connect-concurrency", type=int, default=200, help="Handshakes in flight at once.")
+        parser.add_argument("--connect-timeout", type=float, default=10.0, help="Seconds before a handshake counts as failed.")
+        parser.add_argument("--url", default=None, help="Base ws:// URL of a running server instead of in process.")
+        parser.add_argument("--metrics-url", default=None, help="Prometheus endpoint (default: <url>/metrics).")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for the traffic pattern.")
+
+    def handle(self, *args, **options):
+        if options["url"]:
+            try:
+                import websockets  # noqa: F401
+            except ImportError:
+                raise CommandError("--url needs the `websockets` package: pip install websockets")
+            options["metrics_url"] = options["metrics_url"] or (
+                options["url"].replace("ws", "http", 1).rstrip("/") + "/metrics"
+            )
+
+        conversations = list(
+            Conversation.objects.filter(user1__username__startswith=USERNAME_PREFIX)
+            .select_related("user1", "user2").order_by("pkid")[:options["conversations"]]
+        )
+        if not conversations:
+            raise CommandError("No benchmark conversations; run `manage.py seed_benchmark_data` first.")
+
+        sockets = self.plan(conversations)
+        self.options = options
+        self.random = random.Random(options["seed"])
+        self.stats = Stats()
+        self.sequence = itertools.count()
+        self.stdout.write(
+            f"Opening {len(sockets)} sockets for {len(conversations)} conversations "
+            f"({'in process' if not options['url'] else options['url']})..."
+        )
+
+        before = self.server_samples(options["metrics_url"])
+        started = time.perf_counter()
+        # The JWT middleware prints on every handshake; in process that would flood the report
+        quiet = contextlib.nullcontext() if options["url"] else contextlib.redirect_stdout(open(os.devnull, "w"))
+        with quiet:
+            asyncio.run(self.run(sockets))
+        elapsed = time.perf_counter() - started
+        after = self.server_samples(options["metrics_url"])
+
+        self.report(len(sockets), elapsed, before, after)
+
+    def plan(self, conversations):
+        """(kind, user id, path) for every socket: a chat socket per participant, list and status per user"""
+        users = {}
+        sockets = []
+        for conversation in conversations:
+            for user, other in ((conversation.user1, conversation.user2), (conversation.user2, conversation.user1)):
+                users[user.pk] = user
+                sockets.append(("chat", str(user.id), user.pk, f"ws/chat/{other.username}/"))
+        for user in users.values():
+            sockets.append(("list", str(user.id), user.pk, "ws/chat/list/"))
+            sockets.append(("status", str(user.id), user.pk, "ws/status/"))
+
+        tokens = {pk: str(RefreshToken.for_user(user).access_token) for pk, user in users.items()}
+        return [(kind, user_id, f"{path}?token={tokens[pk]}") for kind, user_id, pk, path in sockets]
+
+    def open(self, path):
+        if self.options["url"]:
+            return RemoteSocket(f"{self.options['url'].rstrip('/')}/{path}")
+        return InProcessSocket(f"/{path}")
+
+    async def run(self, sockets):
+        loop = asyncio.get_running_loop()
+        ramp, duration = self.options["ramp"], self.options["duration"]
+        self.stop_sending = loop.time() + ramp + duration
+        self.end = self.stop_sending + self.options["drain"]
+        self.handshakes = asyncio.Semaphore(self.options["connect_concurrency"])
+
+        await asyncio.gather(*(
+            self.client(kind, user_id, path, ramp * i / len(sockets))
+            for i, (kind, user_id, path) in enumerate(sockets)
+        ))
+
+    async def client(self, kind, user_id, path, delay):
+        await asyncio.sleep(delay)
+        socket = self.open(path)
+        async with self.handshakes:
+            started = time.perf_counter()
+            try:
+                connected, code = await socket.connect(self.options["connect_timeout"])
+            except asyncio.TimeoutError:
+                connected, code = False, "timeout"
+        if not connected:
+            self.stats.failed[kind, code] += 1
+            return
+        self.stats.connect[kind].append((time.perf_counter() - started) * 1000)
+
+        workers = [self.read(socket, kind, user_id), self.ping(socket)]
+        if kind == "chat":
+            workers.append(self.talk(socket))
+        elif kind == "status":
+            workers.append(self.change_status(socket))
+        tasks = [asyncio.create_task(worker) for worker in workers]
+        try:
+            await asyncio.sleep(max(self.end - asyncio.get_running_loop().time(), 0))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await socket.close(self.options["connect_timeout"])
+
+    async def read(self, socket, kind, user_id):
+        loop = asyncio.get_running_loop()
+        while True:
+            frame = await socket.receive(timeout=max(self.end - loop.time(), 0) + 30)
+            if frame is None:
+                self.stats.closed[kind] += 1
+                return
+            self.stats.frames[f"{kind}:{frame.get('type')}"] += 1
+
+            # Group deliveries carry no temp_id; the sender's own echo does
+            if frame.get("type") != "message" or frame.get("temp_id") is not None:
+                continue
+            message = frame["message"]
+            sent = self.stats.sent.get(message.get("text"))
+            if sent is None or message["sender"]["id"] == user_id:
+                continue
+            self.stats.latencies.append((time.perf_counter() - sent) * 1000)
+            if self.random.random() < self.options["read_ratio"]:
+                await socket.send({"type": "read_receipt", "message_ids": [message["id"]]})
+
+    async def ping(self, socket):
+        interval = settings.CHAT_HEARTBEAT_INTERVAL
+        await asyncio.sleep(self.random.uniform(0, interval))
+        while True:
+            await socket.send({"type": "ping"})
+            await asyncio.sleep(interval)
+
+    async def talk(self, socket):
+        """Typing, a pause, the message, typing stopped; exponential gaps between messages"""
+        loop = asyncio.get_running_loop()
+        rate = self.options["message_rate"] / 60
+        if rate <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.random.expovariate(rate))
+            if loop.time() >= self.stop_sending:
+                return
+            await socket.send({"type": "typing", "is_typing": True})
+            await asyncio.sleep(self.random.uniform(0.5, 3))
+            seq = next(self.sequence)
+            text = f"{TEXT_PREFIX}{seq}"
+            self.stats.sent[text] = time.perf_counter()
+            await socket.send({"type": "message", "text": text, "temp_id": str(seq)})
+            await socket.send({"type": "typing", "is_typing": False})
+
+    async def change_status(self, socket):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.random.expovariate(1 / 60))
+            if loop.time() >= self.stop_sending:
+                return
+            await socket.send({"type": "update_status", "status": self.random.choice(PRESENCE_STATUSES)})
+
+    def server_samples(self, metrics_url):
+        """{(sample name, labels): value} from this process's registry or the server's /metrics"""
+        if metrics_url:
+            with urlopen(metrics_url, timeout=10) as response:
+                families = text_string_to_metric_families(response.read().decode())
+        else:
+            families = REGISTRY.collect()
+        return {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in families
+            for sample in family.samples
+        }
+
+    def report(self, total, elapsed, before, after):
+        stats = self.stats
+        self.stdout.write("")
+        self.stdout.write(f"{'connect':<10} {'opened':>7} {'failed':>7} {'closed':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for kind in ("chat", "list", "status"):
+            latencies = sorted(stats.connect[kind])
+            failed = sum(count for (failed_kind, _), count in stats.failed.items() if failed_kind == kind)
+            self.stdout.write(
+                f"{kind:<10} {len(latencies):>7} {failed:>7} {stats.closed[kind]:>7} "
+                f"{percentile(latencies, 0.5):>8.1f} {percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f}"
+            )
+        for (kind, code), count in sorted(stats.failed.items(), key=str):
+            self.stdout.write(f"  {kind} failures with close code {code}: {count}")
+
+        latencies = sorted(stats.latencies)
+        sent = len(stats.sent)
+        self.stdout.write("")
+        self.stdout.write(
+            f"Messages: {sent} sent, {len(latencies)} delivered, {sent - len(latencies)} lost, "
+            f"{len(latencies) / elapsed:.1f}/s"
+        )
+        if latencies:
+            self.stdout.write(
+                f"Delivery ms: p50 {statistics.median(latencies):.1f}  p95 {percentile(latencies, 0.95):.1f}  "
+                f"p99 {percentile(latencies, 0.99):.1f}  max {latencies[-1]:.1f}"
+            )
+        self.stdout.write(
+            "Frames received: " + ", ".join(f"{name} {count}" for name, count in sorted(stats.frames.items()))
+        )
+
+        def delta(name, labels=()):
+            if (name, labels) not in after:
+                return None
+            return after[name, labels] - before.get((name, labels), 0)
+
+        self.stdout.write("")
+        self.stdout.write(f"Server, over {elapsed:.1f}s with {total} sockets:")
+        cpu = delta("process_cpu_seconds_total")
+        rss = after.get(("process_resident_memory_bytes", ()))
+        rss_growth = delta("process_resident_memory_bytes")
+        self.stdout.write(f"  CPU: {f'{cpu:.1f}s ({cpu / elapsed:.0%} of a core)' if cpu is not None else 'n/a'}")
+        self.stdout.write(
+            f"  Resident memory: {f'{rss / 2**20:.0f} MiB ({rss_growth / 2**20:+.0f} MiB)' if rss else 'n/a'}"
+        )
+
+        self.stdout.write(f"  {'handler':<42} {'calls':>8} {'queries/call':>13}")
+        for name, labels in sorted(after):
+            view = dict(labels).get("view", "")
+            if name != "atlas_request_queries_count" or "Consumer." not in view:
+                continue
+            calls = delta(name, labels)
+            if calls:
+                queries = delta("atlas_request_queries_sum", labels)
+                self.stdout.write(f"  {view:<42} {calls:>8.0f} {queries / calls:>13.1f}")
@@ -100,4 +100,18 @@ class UserChatProfile(TimeStampedUUIDModel):
     notify_new_messages = models.BooleanField(default=True, verbose_name=_("Notify New Messages"))
 
     def __str__(self) -> str:
-        return f"Chat Profile for {self.user.username}"
\ No newline at end of file
+        return f"Chat Profile for {self.user.username}"
+
+class ChatConnection(TimeStampedUUIDModel):
+    """
+    A live WebSocket connection and the groups it has joined.
+    Refreshed on every heartbeat; rows that stop being refreshed are
+    reaped together with their group memberships.
+    """
+    channel_name = models.CharField(max_length=255, unique=True, verbose_name=_("Channel Name"))
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chat_connections')
+    groups = models.JSONField(default=list, blank=True, verbose_name=_("Groups"))
+    last_heartbeat = models.DateTimeField(default=timezone.now, db_index=True, verbose_name=_("Last Heartbeat"))
+
+    def __str__(self) -> str:
+        return f"Connection {self.channel_name} for {self.user_id}"
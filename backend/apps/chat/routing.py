@@ -5,5 +5,6 @@ websocket_urlpatterns = [
     re_path(r'ws/chat/list/$', consumers.ChatListConsumer.as_asgi()),
     re_path(r'^ws/chat/(?P<username>[^/]+)/$',  consumers.ChatConsumer.as_asgi()),
     re_path(r'ws/status/$', consumers.OnlineStatusConsumer.as_asgi()),
+    re_path(r'ws/gateway/$', consumers.ChatGatewayConsumer.as_asgi()),
     # re_path(r'ws/notifications/$', consumers.NotificationConsumer.as_asgi()),
 ]
\ No newline at end of file
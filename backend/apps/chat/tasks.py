@@ -0,0 +1,67 @@
+import logging
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ChatConnection, UserChatProfile
+
+logger = logging.getLogger(__name__)
+
+
+async def _drop_connections(channel_layer, connections):
+    for channel_name, groups in connections:
+        for group in groups:
+            await channel_layer.group_discard(group, channel_name)
+        # If the consumer is still running somewhere, ask it to close.
+        await channel_layer.send(channel_name, {'type': 'connection.reap'})
+
+
+async def _broadcast_offline(channel_layer, users, timestamp):
+    for user_id, username in users:
+        await channel_layer.group_send('online_status', {
+            'type': 'user_status',
+            'user_id': str(user_id),
+            'username': username,
+            'is_online': False,
+            'timestamp': timestamp,
+        })
+
+
+@shared_task
+def reap_stale_connections():
+    """
+    Remove connections that missed their heartbeats.
+
+    Discards their group memberships so group_send stops paying for them,
+    deletes their ChatConnection rows, and marks users without any live
+    connection left as offline.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CHAT_HEARTBEAT_TIMEOUT)
+    stale = list(
+        ChatConnection.objects.filter(last_heartbeat__lt=cutoff)
+        .values_list('pkid', 'channel_name', 'groups')
+    )
+    channel_layer = get_channel_layer()
+
+    if stale:
+        async_to_sync(_drop_connections)(
+            channel_layer, [(channel_name, groups) for _, channel_name, groups in stale]
+        )
+        ChatConnection.objects.filter(pkid__in=[pkid for pkid, _, _ in stale]).delete()
+
+    # Presence entries left behind by connections that never disconnected
+    offline = UserChatProfile.objects.filter(is_online=True).exclude(
+        user_id__in=ChatConnection.objects.values('user_id')
+    )
+    offline_users = list(offline.values_list('user__id', 'user__username'))
+    if offline_users:
+        now = timezone.now()
+        offline.update(is_online=False, last_seen=now)
+        async_to_sync(_broadcast_offline)(channel_layer, offline_users, now.isoformat())
+
+    logger.info(f"Reaped {len(stale)} stale connections, {len(offline_users)} users now offline")
+    return {'connections': len(stale), 'users_offline': len(offline_users)}
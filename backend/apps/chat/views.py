@@ -5,7 +5,7 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.db import transaction
 
@@ -190,6 +190,14 @@ class MessageViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
+    @action(detail=True, methods=['get'])
+    def image(self, request, pk=None):
+        """Redirect to a signed, expiring link for the message's image"""
+        message = self.get_object()
+        if not message.image:
+            return Response({'error': 'Message has no image'}, status=status.HTTP_404_NOT_FOUND)
+        return redirect(message.image.url)
+
     # views.py - Update the MessageViewSet.mark_as_read method
     @action(detail=False, methods=['post'])
     def mark_as_read(self, request):
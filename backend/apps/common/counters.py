@@ -0,0 +1,23 @@
+from django.db import transaction
+
+from .models import Counter
+
+
+def allocate(name, count=1):
+    """
+    Reserve `count` consecutive values from the named counter.
+
+    The counter row is locked with SELECT ... FOR UPDATE, so concurrent
+    callers are serialized on that one row; the cost doesn't grow with the
+    table the values are used in. Returns a range of the reserved values.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+
+    with transaction.atomic():
+        Counter.objects.get_or_create(name=name)
+        counter = Counter.objects.select_for_update().get(name=name)
+        first = counter.value + 1
+        counter.value += count
+        counter.save(update_fields=["value"])
+    return range(first, first + count)
@@ -0,0 +1,222 @@
+import json
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.budget.models import Expense, RelocationCase
+from apps.chat.models import Conversation, Message
+from apps.common.query_budgets import QUERY_BUDGETS
+from apps.profiles.models import Consultant, Profile, Task
+from apps.users.factories import USERNAME_PREFIX
+from apps.users.models import User
+
+# (URL name, who calls it, path); {conversation} is the largest conversation
+SCENARIOS = [
+    ("chat_list", "chatter", "/api/v1/chat/list/"),
+    ("conversation-list", "chatter", "/api/v1/chat/conversations/"),
+    ("conversation-messages", "thread", "/api/v1/chat/conversations/{conversation}/messages/"),
+    ("profile-list", "consultant", "/api/v1/profile/profiles/"),
+    ("consultant-clients-list", "consultant", "/api/v1/profile/consultant-clients/"),
+    ("task_due_overview", "consultant", "/api/v1/profile/task_due_overview/"),
+    ("document-list", "consultant", "/api/v1/profile/documents/"),
+    ("get_profile", "client", "/api/v1/profile/get_profile/"),
+    ("task-list", "client", "/api/v1/profile/tasks/"),
+    ("cases-list", "client", "/api/v1/budget/cases/"),
+    ("expenses-list", "client", "/api/v1/budget/expenses/"),
+    ("dashboard-budget-summary", "client", "/api/v1/budget/dashboard/budget_summary/"),
+]
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+# Smallest increase counted as a regression, whatever the tolerance: timer
+# and allocator noise on a 5 ms endpoint easily exceeds 25%
+NOISE_FLOOR = {"p50_ms": 2.0, "peak_kb": 64.0}
+
+
+class QueryCounter:
+    """
+    Execute wrapper counting queries. CaptureQueriesContext reads
+    connection.queries, which request_started resets mid-request.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """
+    Measure latency, query count and peak memory of the major endpoints.
+
+    Each endpoint is called through the full middleware stack with a real JWT
+    for the user who makes it heaviest in the seeded dataset: the user in the
+    most conversations, a participant of the longest conversation, the
+    consultant with the most clients, and the client with the most expenses.
+    Latency is taken over --iterations calls after a warmup; peak memory in
+    a separate tracemalloc pass, which would otherwise slow the timed calls.
+
+    Results are compared with the stored baseline, and the command fails on
+    a regression: p50 or peak memory above the baseline by more than
+    --tolerance, or any additional query.
+
+        python manage.py seed_benchmark_data --scale 0.1
+        python manage.py benchmark_endpoints --save-baseline
+        python manage.py benchmark_endpoints            # after a change
+    """
+
+    help = "Benchmark the major API endpoints against the seeded dataset and check for regressions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Timed calls per endpoint.")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed calls per endpoint first.")
+        parser.add_argument("--only", nargs="+", default=None, help="URL names of the endpoints to run.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+        parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed p50 latency and memory increase over the baseline (0.25 = 25%%).",
+        )
+
+    def handle(self, *args, **options):
+        scenarios = [scenario for scenario in SCENARIOS if not options["only"] or scenario[0] in options["only"]]
+        if not scenarios:
+            raise CommandError(f"No such endpoints; choose from: {', '.join(name for name, _, _ in SCENARIOS)}")
+
+        users, conversation = self.representative_users()
+        client = Client()
+        results = {}
+        # Queries are counted here; the budget middleware's own counting is switched off
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], QUERY_BUDGET_MODE="off"):
+            for name, role, path in scenarios:
+                self.stdout.write(f"Benchmarking {name}...")
+                headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(users[role]).access_token}"}
+                results[name] = self.measure(
+                    client, path.format(conversation=conversation.id), headers,
+                    options["iterations"], options["warmup"],
+                )
+
+        self.report(results)
+        run = {"dataset": self.dataset(), "recorded_at": timezone.now().isoformat(), "results": results}
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(run, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+        elif baseline_path.exists():
+            self.compare(run, json.loads(baseline_path.read_text()), options["tolerance"])
+        else:
+            self.stdout.write(self.style.WARNING(f"No baseline at {baseline_path}; run with --save-baseline."))
+
+    def representative_users(self):
+        """The heaviest user of each role in the benchmark dataset, and the longest conversation"""
+        bench = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        conversations = Conversation.objects.filter(user1__in=bench)
+
+        participants = Counter()
+        for user1_id, user2_id in conversations.values_list("user1_id", "user2_id").iterator():
+            participants.update((user1_id, user2_id))
+        longest = conversations.annotate(size=models.Count("messages")).order_by("-size").first()
+        consultant = (
+            Consultant.objects.filter(user__in=bench).select_related("user").order_by("-current_client_count").first()
+        )
+        case = (
+            RelocationCase.objects.filter(user__in=bench)
+            .annotate(size=models.Count("expenses")).select_related("user").order_by("-size").first()
+        )
+        if not (participants and longest and consultant and case):
+            raise CommandError("No benchmark data; run `manage.py seed_benchmark_data` first.")
+
+        users = {
+            "chatter": User.objects.get(pk=participants.most_common(1)[0][0]),
+            "thread": longest.user1,
+            "consultant": consultant.user,
+            "client": case.user,
+        }
+        return users, longest
+
+    def measure(self, client, path, headers, iterations, warmup):
+        for _ in range(max(warmup, 1)):
+            response = client.get(path, **headers)
+        if response.status_code != 200:
+            raise CommandError(f"GET {path} returned {response.status_code}: {response.content[:200]!r}")
+
+        timings = []
+        for _ in range(iterations):
+            queries = QueryCounter()
+            with connection.execute_wrapper(queries):
+                started = time.perf_counter()
+                client.get(path, **headers)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        try:
+            client.get(path, **headers)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            "path": path,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 2),
+            "queries": queries.count,
+            "peak_kb": round(peak / 1024, 1),
+            "bytes": len(response.content),
+        }
+
+    def dataset(self):
+        return {
+            "users": User.objects.count(),
+            "profiles": Profile.objects.count(),
+            "tasks": Task.objects.count(),
+            "messages": Message.objects.count(),
+            "expenses": Expense.objects.count(),
+        }
+
+    def report(self, results):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'endpoint':<26} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'budget':>7} {'peak KB':>9} {'bytes':>9}"
+        )
+        for name, r in results.items():
+            budget = QUERY_BUDGETS.get(name, "-")
+            self.stdout.write(
+                f"{name:<26} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['queries']:>8} {budget:>7} "
+                f"{r['peak_kb']:>9.1f} {r['bytes']:>9}"
+            )
+
+    def compare(self, run, baseline, tolerance):
+        if run["dataset"] != baseline["dataset"]:
+            self.stdout.write(self.style.WARNING(
+                f"Dataset differs from the baseline's ({baseline['dataset']}); comparisons are approximate."
+            ))
+
+        regressions = []
+        for name, current in run["results"].items():
+            previous = baseline["results"].get(name)
+            if previous is None:
+                continue
+            if current["queries"] > previous["queries"]:
+                regressions.append(f"{name}: {current['queries']} queries, baseline {previous['queries']}")
+            for metric, floor in NOISE_FLOOR.items():
+                increase = current[metric] - previous[metric]
+                if increase > floor and current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(f"{name}: {metric} {current[metric]}, baseline {previous[metric]}")
+
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against the baseline ({baseline['recorded_at']})."))
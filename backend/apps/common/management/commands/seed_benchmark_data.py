@@ -0,0 +1,247 @@
+import random
+import time
+
+import factory.random
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from faker import Faker
+
+from apps.budget.factories import (
+    CATEGORY_NAMES,
+    BudgetAllocationFactory,
+    BudgetCategoryFactory,
+    ExpenseFactory,
+    RelocationCaseFactory,
+)
+from apps.budget.models import BudgetAllocation, BudgetCategory, Expense, RelocationCase
+from apps.chat.models import Conversation, Message, UserChatProfile
+from apps.profiles.factories import ConsultantFactory, ProfileFactory
+from apps.profiles.models import Consultant, Profile, Task
+from apps.profiles.progress import deferred_progress
+from apps.profiles.provisioning import provision_default_tasks
+from apps.users.factories import USERNAME_PREFIX, UserFactory
+from apps.users.models import User
+
+# Distinct texts messages are drawn from; generating 1M sentences would dominate the run
+MESSAGE_POOL_SIZE = 2000
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Command(BaseCommand):
+    """
+    Seed a benchmark dataset at production-like volumes.
+
+    Users, clients with their default tasks, consultants, conversations with
+    a heavy-tailed message distribution, and relocation cases with budget
+    allocations and expenses. Field values come from the factories in each
+    app's factories.py; rows are written with bulk_create in chunks, so no
+    per-row signals run. All users are named bench_user_<n>; --flush removes
+    them and everything hanging off them.
+
+        python manage.py seed_benchmark_data                # full volumes
+        python manage.py seed_benchmark_data --scale 0.01   # 1%, for a laptop
+    """
+
+    help = "Seed users, profiles, tasks, chat and budget data for the endpoint benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000, help="Users in total.")
+        parser.add_argument("--clients", type=int, default=50_000, help="Client profiles with default tasks.")
+        parser.add_argument("--consultants", type=int, default=500, help="Consultants the clients are spread over.")
+        parser.add_argument("--conversations", type=int, default=50_000, help="Chat conversations.")
+        parser.add_argument("--messages", type=int, default=1_000_000, help="Chat messages in total.")
+        parser.add_argument("--cases", type=int, default=20_000, help="Relocation cases (one per client).")
+        parser.add_argument("--expenses-per-case", type=int, default=10, help="Expenses per relocation case.")
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiply every volume above.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per bulk_create.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, for a reproducible dataset.")
+        parser.add_argument("--flush", action="store_true", help="Delete existing benchmark data first.")
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        volumes = {
+            key: max(int(options[key] * scale), 1)
+            for key in ("users", "clients", "consultants", "conversations", "messages", "cases")
+        }
+        if volumes["clients"] + volumes["consultants"] > volumes["users"]:
+            raise CommandError("--clients plus --consultants can't exceed --users.")
+        volumes["cases"] = min(volumes["cases"], volumes["clients"])
+
+        self.chunk_size = options["chunk_size"]
+        self.random = random.Random(options["seed"])
+        factory.random.reseed_random(options["seed"])
+
+        existing = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        if options["flush"]:
+            self.step("Flushing benchmark data", lambda: self.flush(existing))
+        elif existing.exists():
+            raise CommandError("Benchmark data already exists; pass --flush to replace it.")
+
+        users = self.step("Users", lambda: self.seed_users(volumes["users"]))
+        consultants = self.step("Consultants", lambda: self.seed_consultants(users[:volumes["consultants"]]))
+        clients = users[volumes["consultants"]:volumes["consultants"] + volumes["clients"]]
+        profiles = self.step("Profiles", lambda: self.seed_profiles(users, consultants, clients))
+        self.step("Default tasks", lambda: self.seed_tasks(profiles))
+        conversations = self.step("Conversations", lambda: self.seed_conversations(users, volumes["conversations"]))
+        self.step("Messages", lambda: self.seed_messages(conversations, volumes["messages"]))
+        self.step("Relocation cases", lambda: self.seed_budgets(
+            clients[:volumes["cases"]], consultants, options["expenses_per_case"]
+        ))
+
+        self.stdout.write(self.style.SUCCESS("Benchmark dataset ready."))
+
+    def step(self, label, seed):
+        self.stdout.write(f"{label}...", ending="")
+        self.stdout.flush()
+        started = time.perf_counter()
+        result = seed()
+        count = len(result) if isinstance(result, (list, dict)) else result
+        self.stdout.write(f" {count} in {time.perf_counter() - started:.1f}s")
+        return result
+
+    @transaction.atomic
+    @deferred_progress()
+    def flush(self, users):
+        """
+        Delete the bulkiest tables first, so the user cascade has little left
+        to collect; task deletes recalculate progress once per profile.
+        """
+        deleted = Message.objects.filter(conversation__user1__in=users).delete()[0]
+        deleted += Expense.objects.filter(case__user__in=users).delete()[0]
+        deleted += BudgetAllocation.objects.filter(case__user__in=users).delete()[0]
+        deleted += Task.objects.filter(profile__user__in=users).delete()[0]
+        return deleted + users.delete()[0]
+
+    def bulk_create(self, model, rows):
+        for chunk in chunked(rows, self.chunk_size):
+            with transaction.atomic():
+                model.objects.bulk_create(chunk, batch_size=self.chunk_size)
+        return rows
+
+    def seed_users(self, count):
+        users = self.bulk_create(User, UserFactory.build_batch(count))
+        # Created by signals for users made one at a time
+        self.bulk_create(UserChatProfile, [UserChatProfile(user=user) for user in users])
+        return users
+
+    def seed_consultants(self, users):
+        consultants = [ConsultantFactory.build(user=user) for user in users]
+        Consultant.assign_employee_ids(consultants)
+        User.objects.filter(pk__in=[user.pk for user in users]).update(is_staff=True)
+        return self.bulk_create(Consultant, consultants)
+
+    def seed_profiles(self, users, consultants, clients):
+        """A profile per user; clients get relocation details and a consultant, round-robin"""
+        consultant_users = {consultant.user_id: consultant for consultant in consultants}
+        client_ids = {user.pk for user in clients}
+        profiles = []
+        client_profiles = []
+        for user in users:
+            if user.pk in client_ids:
+                consultant = consultants[len(client_profiles) % len(consultants)]
+                profile = ProfileFactory.build(user=user, relocation_consultant=consultant)
+                consultant.current_client_count += 1
+                client_profiles.append(profile)
+            else:
+                profile = Profile(user=user, is_consultant=user.pk in consultant_users)
+            profiles.append(profile)
+
+        self.bulk_create(Profile, profiles)
+        Consultant.objects.bulk_update(consultants, ["current_client_count"], batch_size=self.chunk_size)
+        return client_profiles
+
+    def seed_tasks(self, profiles):
+        return sum(
+            provision_default_tasks(chunk, skip_existing=False, batch_size=self.chunk_size)
+            for chunk in chunked(profiles, self.chunk_size)
+        )
+
+    def seed_conversations(self, users, count):
+        """
+        Unique user pairs; a few busy users take part in a large share of
+        them, like consultants and active clients do.
+        """
+        busy = users[:max(len(users) // 100, 2)]
+        pairs = set()
+        attempts = 0
+        while len(pairs) < count and attempts < count * 10:
+            attempts += 1
+            first = self.random.choice(busy) if self.random.random() < 0.5 else self.random.choice(users)
+            second = self.random.choice(users)
+            if first.pk != second.pk:
+                pairs.add(tuple(sorted((first, second), key=lambda user: user.id)))
+
+        conversations = [Conversation(user1=user1, user2=user2) for user1, user2 in pairs]
+        return self.bulk_create(Conversation, conversations)
+
+    def seed_messages(self, conversations, count):
+        """`count` messages over the conversations, Pareto-distributed: a few very long threads"""
+        faker = Faker()
+        faker.seed_instance(self.random.random())
+        texts = [faker.sentence() for _ in range(MESSAGE_POOL_SIZE)]
+        statuses = [code for code, _ in Message.STATUS_CHOICES]
+
+        weights = [self.random.paretovariate(1.2) for _ in conversations]
+        scale = count / sum(weights)
+        sizes = [max(int(weight * scale), 1) for weight in weights]
+        # Rounding leaves a remainder; the longest thread takes it
+        longest = max(range(len(sizes)), key=sizes.__getitem__)
+        sizes[longest] += max(count - sum(sizes), 0)
+
+        created = 0
+        batch = []
+        for conversation, size in zip(conversations, sizes):
+            size = min(size, count - created)
+            for _ in range(size):
+                batch.append(Message(
+                    conversation=conversation,
+                    sender=conversation.user1 if self.random.random() < 0.5 else conversation.user2,
+                    text=self.random.choice(texts),
+                    status=self.random.choice(statuses),
+                ))
+            created += size
+            if len(batch) >= self.chunk_size:
+                self.bulk_create(Message, batch)
+                batch = []
+            if created >= count:
+                break
+        self.bulk_create(Message, batch)
+        return created
+
+    def seed_budgets(self, clients, consultants, expenses_per_case):
+        # Categories are shared with real data; reuse any that already exist
+        categories = [
+            BudgetCategory.objects.filter(name=name).first() or BudgetCategoryFactory(name=name)
+            for name in CATEGORY_NAMES
+        ]
+        consultant_users = {consultant.pk: consultant.user for consultant in consultants}
+        client_consultants = dict(
+            Profile.objects.filter(user__in=clients).values_list("user_id", "relocation_consultant_id")
+        )
+
+        cases = [
+            RelocationCaseFactory.build(user=user, consultant=consultant_users.get(client_consultants.get(user.pk)))
+            for user in clients
+        ]
+        self.bulk_create(RelocationCase, cases)
+
+        allocations = []
+        expenses = []
+        for case in cases:
+            for category in self.random.sample(categories, self.random.randint(3, len(categories))):
+                allocations.append(BudgetAllocationFactory.build(case=case, category=category))
+            for _ in range(expenses_per_case):
+                expenses.append(ExpenseFactory.build(
+                    case=case, category=self.random.choice(categories), created_by=case.user
+                ))
+            if len(expenses) >= self.chunk_size:
+                self.bulk_create(BudgetAllocation, allocations)
+                self.bulk_create(Expense, expenses)
+                allocations, expenses = [], []
+        self.bulk_create(BudgetAllocation, allocations)
+        self.bulk_create(Expense, expenses)
+        return cases
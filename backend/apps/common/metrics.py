@@ -0,0 +1,16 @@
+from prometheus_client import Counter, Histogram
+
+# Queries per request / WebSocket message, by URL name or "<Consumer>.<handler>"
+REQUEST_QUERIES = Histogram(
+    "atlas_request_queries",
+    "Database queries issued while handling a request or WebSocket message.",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+
+# Query budget violations (apps/common/querycount.py)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "atlas_query_budget_exceeded_total",
+    "Requests or WebSocket messages that exceeded their query budget or repeated a query shape.",
+    ["view", "reason"],
+)
@@ -0,0 +1,31 @@
+from .serializers import included_fields
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet counterpart of SparseFieldsetMixin: collapses expandable fields on
+    list and prefetches only the relations the response will contain.
+
+    `expandable_prefetches` maps an expandable field to the prefetch_related
+    lookups it needs.
+    """
+    expandable_prefetches = {}
+
+    def collapse_expandable(self):
+        return getattr(self, "action", None) == "list"
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["collapse_expandable"] = self.collapse_expandable()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        included = included_fields(
+            self.request,
+            self.expandable_prefetches.keys(),
+            expandable=self.expandable_prefetches.keys(),
+            collapse_expandable=self.collapse_expandable(),
+        )
+        lookups = [lookup for name in included for lookup in self.expandable_prefetches[name]]
+        return queryset.prefetch_related(*lookups) if lookups else queryset
@@ -12,3 +12,15 @@ class TimeStampedUUIDModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Counter(models.Model):
+    """
+    A named, gap-tolerant sequence for human-readable identifiers.
+    Allocate from it with `apps.common.counters.allocate`.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
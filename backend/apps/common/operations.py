@@ -0,0 +1,20 @@
+"""Migration operations shared by the apps"""
+from django.db.migrations.operations import RunSQL
+
+
+class PostgresRunSQL(RunSQL):
+    """
+    RunSQL that only runs on Postgres, for Postgres-only DDL such as GIN and
+    trigram indexes.
+
+    These indexes are deliberately kept out of model Meta: SQLite rebuilds a
+    table on most schema changes and would try to recreate them from there.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,94 @@
+"""
+Project-wide pagination policy.
+
+Every list is paginated (StandardPagination is the DRF default) and no page
+can exceed MAX_PAGE_SIZE rows. Time-ordered resources use keyset
+pagination, which doesn't slow down with depth; endpoints that don't need a
+total use CountFreePagination and skip the COUNT(*).
+"""
+from collections import OrderedDict
+
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class StandardPagination(PageNumberPagination):
+    """Page-number pagination with a total count"""
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+
+class TimeCursorPagination(CursorPagination):
+    """Keyset pagination over created_at, newest first"""
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    ordering = '-created_at'
+
+
+class CountFreePagination(BasePagination):
+    """
+    Page-number pagination without a total: fetches one extra row to know
+    whether there is a next page. Responses are {"next", "previous", "results"}.
+    """
+    page_size = DEFAULT_PAGE_SIZE
+    page_query_param = 'page'
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        try:
+            self.page_number = max(1, int(request.query_params.get(self.page_query_param, 1)))
+        except (TypeError, ValueError):
+            self.page_number = 1
+
+        offset = (self.page_number - 1) * self.page_size_value
+        rows = list(queryset[offset:offset + self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        return rows[:self.page_size_value]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
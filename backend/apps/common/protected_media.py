@@ -0,0 +1,72 @@
+"""
+Protected media.
+
+Documents, expense receipts and chat images are not served from the public
+/mediafiles/ location. `ProtectedMediaStorage.url()` returns a signed,
+expiring link for them instead, so every serializer, consumer and admin page
+hands out such links unchanged. The links are only ever minted for objects
+the requester could already load: the views and consumers that serialize
+files are scoped by role.
+
+The download view checks the signature and hands the byte transfer to nginx
+with X-Accel-Redirect; no Django worker streams the file.
+"""
+import mimetypes
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from django.utils.http import content_disposition_header
+
+SALT = 'apps.common.protected_media'
+
+# upload_to directories of the protected file fields
+PROTECTED_PREFIXES = ('documents/', 'expense_receipts/', 'chat_images/')
+
+
+def is_protected(name):
+    return bool(name) and name.startswith(PROTECTED_PREFIXES)
+
+
+def signed_url(name):
+    """Download URL for a stored file, valid for PROTECTED_MEDIA_URL_TTL seconds"""
+    token = signing.dumps(name, salt=SALT, compress=True)
+    return reverse('protected_media', kwargs={'token': token})
+
+
+def resolve(token):
+    """The file name a token grants access to, or None if it is forged or expired"""
+    try:
+        name = signing.loads(token, salt=SALT, max_age=settings.PROTECTED_MEDIA_URL_TTL)
+    except signing.BadSignature:
+        return None
+    if not isinstance(name, str) or not is_protected(name) or '..' in name.split('/'):
+        return None
+    return name
+
+
+def serve(name, storage):
+    """Response for a protected file: an X-Accel-Redirect, or the file itself without nginx"""
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    if settings.PROTECTED_MEDIA_X_ACCEL:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_LOCATION + quote(name)
+    else:
+        response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+
+    response['Content-Disposition'] = content_disposition_header(False, name.rsplit('/', 1)[-1])
+    response['Cache-Control'] = f"private, max-age={settings.PROTECTED_MEDIA_URL_TTL}"
+    return response
+
+
+class ProtectedMediaStorage(FileSystemStorage):
+    """Media storage whose URLs for protected files are signed download links"""
+
+    def url(self, name):
+        if is_protected(name):
+            return signed_url(name)
+        return super().url(name)
@@ -0,0 +1,114 @@
+"""
+Query budgets, checked by apps/common/querycount.py.
+
+Keys are URL names (what `request.resolver_match.view_name` reports) and
+"<Consumer>.<handler>" for WebSocket consumers. A budget is the most queries
+one request may issue, whatever the page size or the number of rows
+involved, including the one JWT authentication costs. Every DRF view in
+apps/ must have an entry; `querycount.unbudgeted_views()` lists those that
+don't.
+
+Budgets are targets, not measurements of the current code: the endpoints
+marked N+1 still issue queries per row (serializer methods and properties
+reading related rows) and are reported until they are batched.
+
+The others are the most queries any caller makes in EndpointQueryBudgetTests
+and ConsumerQueryBudgetTests (apps/common/tests.py), which exercise every
+such endpoint and consumer in raise mode. Endpoint tests run inside a
+transaction, so each transaction.atomic() block there costs a SAVEPOINT and
+a RELEASE, and the SQLite test database counts the BEGIN of consumer
+transactions; on Postgres in production neither is counted, so production
+counts are at most these.
+"""
+
+QUERY_BUDGETS = {
+    # apps.profiles
+    "consultant-list": 4,
+    "consultant-detail": 4,
+    "consultant-available-consultants": 4,
+    "consultant-update-availability": 5,
+    "profile-list": 9,  # 5, plus the prefetches of ?expand=documents,tasks
+    "profile-detail": 13,
+    "profile-auto-assign": 13,
+    "profile-assign-consultant": 10,
+    "profile-client-details": 6,
+    "profile-update-progress": 9,
+    "document-list": 4,
+    "document-detail": 4,
+    "document-download": 4,
+    "document-upload": 8,
+    "document-update-status": 4,
+    "document-update-status-bulk": 4,
+    "document-bulk-review": 6,
+    "task-list": 5,
+    "task-detail": 7,
+    "task-mark-complete": 7,
+    "task-bulk-create": 9,
+    "task-bulk-complete": 10,
+    "task-bulk-reorder": 7,
+    "task-bulk-move": 10,
+    "task-overdue-tasks": 4,
+    "task-overdue-summary": 4,
+    "task-progress": 4,
+    "task-stage-tasks": 4,
+    "consultant-clients-list": 13,
+    "consultant-clients-client-stats": 3,
+    "get_profile": 7,
+    "search_documents": 4,
+    "search_tasks": 4,
+    "document_status_overview": 5,
+    "task_due_overview": 6,
+
+    # apps.budget
+    "cases-list": 5,  # N+1: RelocationCaseSerializer allocations/categories
+    "cases-detail": 5,  # N+1: as cases-list
+    "expenses-list": 4,  # N+1: ExpenseSerializer.created_by_name
+    "expenses-detail": 4,
+    "expenses-receipt": 3,
+    "expenses-submit-for-approval": 5,
+    "expenses-approve": 6,
+    "allocation-list": 4,
+    "allocation-detail": 3,
+    "dashboard-budget-summary": 8,
+
+    # apps.chat
+    "user_search": 4,
+    "test_search": 4,
+    "conversation_stats": 6,  # N+1: ConversationSerializer per conversation
+    "chat_list": 6,  # N+1: ChatListSerializer last message / unread count / profiles
+    "chat_profile": 5,
+    "conversation_search": 6,  # N+1: as chat_list
+    "online_users": 4,
+    "conversation-list": 6,  # N+1: ConversationSerializer
+    "conversation-detail": 9,
+    "conversation-start_conversation": 11,
+    "conversation-archive": 5,
+    "conversation-mark_as_read": 5,
+    "conversation-messages": 6,  # N+1: MessageSerializer.get_receiver / is_deleted_for
+    "message-list": 6,  # N+1: as conversation-messages
+    "message-detail": 9,
+    "message-mark-as-read": 3,
+    "message-mark-as-delivered": 3,
+    "message-delete": 5,
+    "message-update-text": 9,
+    "message-image": 3,
+
+    # apps.uploads
+    "upload-sessions-list": 7,
+    "upload-sessions-detail": 5,
+    "upload-sessions-finalize": 12,
+
+    # WebSocket consumers (apps.chat.consumers), per handled message
+    "ChatConsumer.websocket_connect": 16,
+    "ChatConsumer.websocket_receive": 10,
+    "ChatConsumer.websocket_disconnect": 5,
+    "ChatListConsumer.websocket_connect": 6,
+    "ChatListConsumer.websocket_receive": 3,
+    "ChatListConsumer.websocket_disconnect": 3,
+    "OnlineStatusConsumer.websocket_connect": 9,
+    "OnlineStatusConsumer.websocket_receive": 4,
+    "OnlineStatusConsumer.websocket_disconnect": 5,
+    "ChatGatewayConsumer.websocket_connect": 9,
+    "ChatGatewayConsumer.websocket_receive": 10,
+    "ChatGatewayConsumer.websocket_disconnect": 5,
+}
@@ -0,0 +1,186 @@
+"""
+Per-request query counting and budgets.
+
+Each HTTP request (QueryBudgetMiddleware) and each message a WebSocket
+consumer handles (HeartbeatConsumer.dispatch) runs inside a `query_budget()`
+block. Queries issued on any database connection within the block, including
+those run in `database_sync_to_async` threads, are counted and grouped by
+shape: the SQL with its parameters and IN-lists collapsed.
+
+On exit the block is checked against its budget, from QUERY_BUDGETS in
+apps/common/query_budgets.py, keyed by URL name or "<Consumer>.<handler>":
+
+- more queries than the budget, or
+- one shape issued QUERY_BUDGET_REPEAT_THRESHOLD times or more, the
+  signature of an N+1 loop over a serializer or a consumer helper.
+
+QUERY_BUDGET_MODE decides what happens: "log" warns and counts the violation
+in atlas_query_budget_exceeded_total, "raise" raises QueryBudgetExceeded
+(for tests), "off" skips counting. Blocks without a budget are only checked
+for repeated shapes; `unbudgeted_views()` lists the DRF views still missing
+one.
+
+In tests, endpoints are checked against the registry by the middleware
+(see apps/common/tests.py), and other code with an explicit budget:
+
+    @override_settings(QUERY_BUDGET_MODE="raise")
+    def test_task_list(self):
+        self.client.get("/api/v1/profile/tasks/", HTTP_AUTHORIZATION=...)
+
+    with query_budget("helper", budget=3, mode="raise"):
+        ...
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .metrics import QUERY_BUDGET_EXCEEDED, REQUEST_QUERIES
+from .query_budgets import QUERY_BUDGETS
+
+logger = logging.getLogger(__name__)
+
+# The QueryLog of the innermost active query_budget() block
+_active = ContextVar('query_log', default=None)
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_VALUES_LIST = re.compile(r'(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+', re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def query_shape(sql):
+    """`sql` with literals, IN-lists and multi-row VALUES collapsed"""
+    sql = _LITERAL.sub('%s', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _VALUES_LIST.sub(r'\1, ...', sql)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A block issued more queries than its budget, or repeated a query shape."""
+
+
+class QueryLog:
+    def __init__(self, label=None, budget=None):
+        self.label = label
+        self.budget = budget
+        self.count = 0
+        self.shapes = Counter()
+
+    def record(self, sql):
+        self.count += 1
+        self.shapes[query_shape(sql)] += 1
+
+    def repeated(self, threshold=None):
+        """(shape, count) for the shapes issued at least `threshold` times, most first"""
+        threshold = threshold or settings.QUERY_BUDGET_REPEAT_THRESHOLD
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def limit(self):
+        return self.budget if self.budget is not None else QUERY_BUDGETS.get(self.label)
+
+    def problems(self):
+        """Human-readable budget violations, empty when within budget"""
+        problems = []
+        limit = self.limit()
+        if limit is not None and self.count > limit:
+            problems.append(f"{self.count} queries, budget {limit}")
+        for shape, count in self.repeated():
+            problems.append(f"{count}x {shape[:200]}")
+        return problems
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper feeding the active QueryLog"""
+    log = _active.get()
+    if log is not None:
+        log.record(sql)
+    return execute(sql, params, many, context)
+
+
+def install_wrapper(sender, connection, **kwargs):
+    """connection_created receiver: count queries on every new connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def check(log, mode=None):
+    mode = mode or settings.QUERY_BUDGET_MODE
+    label = log.label or "unlabelled"
+    REQUEST_QUERIES.labels(view=label).observe(log.count)
+
+    problems = log.problems()
+    if not problems:
+        return
+    if log.limit() is not None and log.count > log.limit():
+        QUERY_BUDGET_EXCEEDED.labels(view=label, reason="budget").inc()
+    if log.repeated():
+        QUERY_BUDGET_EXCEEDED.labels(view=label, reason="repeated").inc()
+
+    message = f"Query budget exceeded in {label}: " + "; ".join(problems)
+    if mode == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+@contextmanager
+def query_budget(label=None, budget=None, mode=None):
+    """
+    Count the queries of the block and check them on a clean exit.
+
+    `label` may be set on the yielded QueryLog later (the middleware only
+    knows the view after resolving the URL). `budget` overrides the
+    registry. Nested blocks count into the innermost one only.
+    """
+    if (mode or settings.QUERY_BUDGET_MODE) == "off":
+        yield None
+        return
+
+    log = QueryLog(label, budget)
+    token = _active.set(log)
+    try:
+        yield log
+    finally:
+        _active.reset(token)
+    check(log, mode)
+
+
+class QueryBudgetMiddleware:
+    """Checks each request against the budget of the view it resolved to"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with query_budget() as log:
+            response = self.get_response(request)
+            if log is not None:
+                match = request.resolver_match
+                log.label = match.view_name if match else None
+                if settings.DEBUG:
+                    response['X-Query-Count'] = str(log.count)
+        return response
+
+
+def drf_view_names():
+    """URL names of the DRF views defined in apps/"""
+    from django.urls import URLResolver, get_resolver
+
+    def walk(patterns, namespace=None):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                inner = ':'.join(filter(None, [namespace, pattern.namespace])) or None
+                yield from walk(pattern.url_patterns, inner)
+                continue
+            view = getattr(pattern.callback, 'cls', None)
+            if view is not None and view.__module__.startswith('apps.') and pattern.name:
+                yield ':'.join(filter(None, [namespace, pattern.name]))
+
+    return sorted(set(walk(get_resolver().url_patterns)))
+
+
+def unbudgeted_views():
+    """DRF views in apps/ with no entry in QUERY_BUDGETS"""
+    return [name for name in drf_view_names() if name not in QUERY_BUDGETS]
@@ -0,0 +1,60 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+def query_param_set(request, name):
+    """Comma-separated query parameter as a set (empty if absent)"""
+    if request is None:
+        return set()
+    value = request.query_params.get(name, "")
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+def included_fields(request, names, expandable=(), collapse_expandable=False):
+    """
+    The subset of field `names` a response should contain.
+
+    `?fields=a,b` keeps only the listed fields; `?expand=x,y` adds expandable
+    fields. With `collapse_expandable` (list views) expandable fields are left
+    out unless expanded.
+    """
+    fields = query_param_set(request, "fields")
+    expand = query_param_set(request, "expand")
+    expandable = set(expandable)
+
+    included = []
+    for name in names:
+        if name in expand:
+            included.append(name)
+        elif name in expandable and collapse_expandable:
+            continue
+        elif not fields or name in fields:
+            included.append(name)
+    return included
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for sparse fieldsets, driven by the request in context.
+
+    Relations listed in `Meta.expandable_fields` are expensive (nested lists,
+    nested serializers); they are dropped from list responses unless asked for
+    with `?expand=`. `?fields=` narrows any response to the named fields.
+    Only reads are narrowed: on writes the dropped fields would be skipped by
+    validation instead of rejected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        keep = set(included_fields(
+            request,
+            self.fields.keys(),
+            expandable=getattr(self.Meta, "expandable_fields", ()),
+            collapse_expandable=self.context.get("collapse_expandable", False),
+        ))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
@@ -1,3 +1,396 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+from urllib.parse import urlsplit
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.client import MULTIPART_CONTENT
+from django.urls import resolve
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.budget.factories import BudgetAllocationFactory, ExpenseFactory, RelocationCaseFactory
+from apps.chat.factories import ConversationFactory, MessageFactory
+from apps.chat.routing import websocket_urlpatterns
+from apps.profiles.factories import ConsultantFactory, DocumentFactory, ProfileFactory, TaskFactory
+from apps.profiles.models import Consultant
+from apps.profiles.serializers import TaskSerializer
+from apps.users.factories import UserFactory
+
+from .counters import allocate
+from .query_budgets import QUERY_BUDGETS
+from .querycount import QueryBudgetExceeded, drf_view_names, query_budget, unbudgeted_views
+
+
+class AllocateTests(TestCase):
+    def test_blocks_are_consecutive_and_disjoint(self):
+        self.assertEqual(allocate("test", 3), range(1, 4))
+        self.assertEqual(allocate("test"), range(4, 5))
+        self.assertEqual(allocate("test", 2), range(5, 7))
+
+    def test_counters_are_independent(self):
+        allocate("first", 5)
+        self.assertEqual(allocate("second", 2), range(1, 3))
+
+    def test_count_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            allocate("test", 0)
+
+
+class SparseFieldsetTests(TestCase):
+    def fields(self, method):
+        request = Request(getattr(APIRequestFactory(), method)("/api/v1/profile/tasks/?fields=id"))
+        return set(TaskSerializer(context={"request": request}).fields)
+
+    def test_fields_narrows_reads(self):
+        self.assertEqual(self.fields("get"), {"id"})
+
+    def test_fields_ignored_on_writes(self):
+        self.assertIn("title", self.fields("post"))
+        self.assertIn("title", self.fields("patch"))
+
+
+class QueryBudgetRegistryTests(TestCase):
+    def test_every_view_has_a_budget(self):
+        self.assertEqual(unbudgeted_views(), [])
+
+    def test_every_budget_names_a_view(self):
+        views = set(drf_view_names())
+        # "<Consumer>.<handler>" keys budget WebSocket consumers, not URLs
+        stale = [name for name in QUERY_BUDGETS if "." not in name and name not in views]
+        self.assertEqual(stale, [])
+
+
+class QueryBudgetTests(TestCase):
+    def run_queries(self, count):
+        with connection.cursor() as cursor:
+            for i in range(count):
+                cursor.execute("SELECT %s", [i])
+
+    def test_within_budget(self):
+        with query_budget("test", budget=3, mode="raise") as log:
+            self.run_queries(2)
+        self.assertEqual(log.count, 2)
+
+    def test_over_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget("test", budget=1, mode="raise"):
+                self.run_queries(2)
+
+    def test_repeated_shape_raises_without_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget("test", mode="raise"):
+                self.run_queries(5)
+
+
+# Budgeted views the endpoint tests don't call, and why
+NOT_EXERCISED = {
+    "cases-list": "N+1: RelocationCaseSerializer",
+    "cases-detail": "N+1: RelocationCaseSerializer",
+    "expenses-list": "N+1: ExpenseSerializer.created_by_name",
+    "conversation_stats": "N+1: ConversationSerializer",
+    "chat_list": "N+1: ChatListSerializer",
+    "conversation_search": "N+1: ChatListSerializer",
+    "conversation-list": "N+1: ConversationSerializer",
+    "conversation-messages": "N+1: MessageSerializer",
+    "message-list": "N+1: MessageSerializer",
+    "profile-client-details": "answers 403 to everyone: consultants are staff",
+    "document-update-status-bulk": "takes pk but the viewset looks documents up by id",
+}
+
+
+@override_settings(
+    QUERY_BUDGET_MODE="raise",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    RESUMABLE_UPLOAD_DIR=tempfile.mkdtemp(),
+)
+class EndpointQueryBudgetTests(TestCase):
+    """
+    Registered endpoints stay within their QUERY_BUDGETS entry whatever the
+    number of rows: QueryBudgetMiddleware raises QueryBudgetExceeded, which
+    the test client re-raises. Each endpoint is called by every role it
+    serves differently; there are more rows than the repeated-shape
+    threshold everywhere, so per-row queries fail too.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserFactory(is_staff=True, is_superuser=True)
+        cls.consultant = ConsultantFactory(max_clients=20)
+        cls.other_consultant = ConsultantFactory(max_clients=20)
+        cls.profiles = ProfileFactory.create_batch(6)
+        for profile in cls.profiles:
+            # The profile already exists (signal), so get_or_create ignores extra fields
+            profile.relocation_consultant = cls.consultant
+            profile.save(update_fields=["relocation_consultant"])
+            TaskFactory.create_batch(6, profile=profile)
+            DocumentFactory.create_batch(6, profile=profile, reviewed_by=cls.consultant)
+        Consultant.objects.filter(pk=cls.consultant.pk).update(current_client_count=len(cls.profiles))
+        cls.profile = cls.profiles[0]
+        cls.client_user = cls.profile.user
+        cls.consultant_user = cls.consultant.user
+
+        cls.case = RelocationCaseFactory(user=cls.client_user, consultant=cls.consultant_user)
+        allocations = [BudgetAllocationFactory(case=cls.case) for _ in range(3)]
+        for allocation in allocations:
+            ExpenseFactory.create_batch(3, case=cls.case, category=allocation.category)
+        cls.allocation = allocations[0]
+        cls.expense = ExpenseFactory(
+            case=cls.case, category=cls.allocation.category, status="draft", receipt="receipts/receipt.pdf"
+        )
+        cls.consultant_expense = ExpenseFactory(
+            case=cls.case, category=cls.allocation.category, status="submitted", created_by=cls.consultant_user
+        )
+
+        user1, user2 = sorted([cls.client_user, cls.consultant_user], key=lambda user: user.pk)
+        cls.conversation = ConversationFactory(user1=user1, user2=user2)
+        MessageFactory.create_batch(6, conversation=cls.conversation, sender=cls.client_user)
+        cls.message = MessageFactory(conversation=cls.conversation, sender=cls.client_user, image="chat_images/image.png")
+
+    def call(self, user, method, path, data=None, **extra):
+        token = RefreshToken.for_user(user).access_token
+        if data is not None and "content_type" not in extra:
+            extra.update(data=json.dumps(data), content_type="application/json")
+        elif data is not None:
+            extra["data"] = data
+        response = getattr(self.client, method)(path, HTTP_AUTHORIZATION=f"Bearer {token}", **extra)
+        self.assertLess(response.status_code, 400, response.content[:200])
+        return response
+
+    def run_requests(self, requests):
+        """Call each (user, method, path[, data[, extra]]) request"""
+        for user, method, path, *rest in requests:
+            data, extra = (rest + [None, {}][len(rest):])[:2]
+            with self.subTest(user=user.username, method=method, path=path):
+                self.call(user, method, path, data, **extra)
+
+    def profile_requests(self):
+        admin, consultant, client = self.admin, self.consultant_user, self.client_user
+        profile = f"/api/v1/profile/profiles/{self.profile.id}/"
+        requests = [
+            (admin, "get", f"/api/v1/profile/consultants/{self.consultant.pk}/"),
+            (client, "get", "/api/v1/profile/consultants/available_consultants/"),
+            (consultant, "post", f"/api/v1/profile/consultants/{self.consultant.pk}/update_availability/",
+             {"availability_status": "available"}),
+            (consultant, "get", profile),
+            (client, "get", profile),
+            (consultant, "post", profile + "update_progress/"),
+            (admin, "post", f"/api/v1/profile/profiles/{self.profiles[-1].id}/assign_consultant/",
+             {"consultant_id": str(self.other_consultant.id)}),
+            (admin, "post", "/api/v1/profile/profiles/auto_assign/"),
+            (consultant, "get", "/api/v1/profile/consultant-clients/"),
+            (consultant, "get", "/api/v1/profile/consultant-clients/client_stats/"),
+        ]
+        for user in (admin, consultant, client):
+            requests += [
+                (user, "get", "/api/v1/profile/consultants/"),
+                (user, "get", "/api/v1/profile/profiles/"),
+                (user, "get", "/api/v1/profile/profiles/?expand=documents,tasks,consultant_details"),
+                (user, "get", "/api/v1/profile/get_profile/"),
+                (user, "get", "/api/v1/profile/document_status_overview/"),
+                (user, "get", "/api/v1/profile/document_status_overview/?status=submitted"),
+                (user, "get", "/api/v1/profile/search_documents/?q=passport"),
+                (user, "get", "/api/v1/profile/search_tasks/?q=the"),
+                (user, "get", "/api/v1/profile/task_due_overview/"),
+            ]
+        return requests
+
+    def document_requests(self):
+        consultant, client = self.consultant_user, self.client_user
+        document = f"/api/v1/profile/documents/{self.profile.documents.first().id}/"
+        ids = [str(pk) for pk in self.profile.documents.values_list("id", flat=True)]
+        upload = {"document_type": "visa", "document_file": SimpleUploadedFile("visa.pdf", b"%PDF-1.4\n")}
+        return [
+            (self.admin, "get", "/api/v1/profile/documents/"),
+            (consultant, "get", "/api/v1/profile/documents/"),
+            (client, "get", "/api/v1/profile/documents/"),
+            (client, "get", document),
+            (client, "get", document + "download/"),
+            (consultant, "get", document + "download/"),
+            (consultant, "post", document + "update_status/", {"status": "approved"}),
+            (consultant, "post", "/api/v1/profile/documents/bulk_review/",
+             {"reviews": [{"id": pk, "status": "rejected"} for pk in ids]}),
+            (client, "post", "/api/v1/profile/documents/upload/", upload, {"content_type": MULTIPART_CONTENT}),
+        ]
+
+    def task_requests(self):
+        consultant, client = self.consultant_user, self.client_user
+        task = f"/api/v1/profile/tasks/{self.profile.tasks.first().id}/"
+        ids = [str(pk) for pk in self.profile.tasks.values_list("id", flat=True)]
+        new_tasks = [
+            {"title": f"Task {i}", "stage": "visa_processing", "profile": str(self.profile.id), "due_date": "2030-01-01"}
+            for i in range(6)
+        ]
+        return [
+            (self.admin, "get", "/api/v1/profile/tasks/"),
+            (consultant, "get", "/api/v1/profile/tasks/"),
+            (client, "get", "/api/v1/profile/tasks/"),
+            (client, "get", task),
+            (client, "patch", task, {"title": "Renamed"}),
+            (client, "post", task + "mark_complete/"),
+            (consultant, "post", "/api/v1/profile/tasks/bulk_create/", {"tasks": new_tasks}),
+            (client, "post", "/api/v1/profile/tasks/bulk_complete/", {"ids": ids}),
+            (consultant, "post", "/api/v1/profile/tasks/bulk_complete/", {"ids": ids, "is_completed": False}),
+            (client, "post", "/api/v1/profile/tasks/bulk_reorder/",
+             {"tasks": [{"id": pk, "order": i} for i, pk in enumerate(ids)]}),
+            (client, "post", "/api/v1/profile/tasks/bulk_move/", {"ids": ids, "stage": "housing_search"}),
+            (consultant, "get", f"/api/v1/profile/tasks/progress/?profile_id={self.profile.id}"),
+            (client, "get", f"/api/v1/profile/tasks/progress/?profile_id={self.profile.id}"),
+            (consultant, "get", f"/api/v1/profile/tasks/stage_tasks/?profile_id={self.profile.pk}"),
+            (client, "get", "/api/v1/profile/tasks/stage_tasks/"),
+            (consultant, "get", "/api/v1/profile/tasks/overdue_tasks/"),
+            (client, "get", "/api/v1/profile/tasks/overdue_tasks/"),
+            (consultant, "get", "/api/v1/profile/tasks/overdue_summary/"),
+            (client, "get", "/api/v1/profile/tasks/overdue_summary/"),
+        ]
+
+    def budget_requests(self):
+        consultant, client = self.consultant_user, self.client_user
+        expense = f"/api/v1/budget/expenses/{self.expense.pk}/"
+        requests = [
+            (client, "get", expense),
+            (client, "get", expense + "receipt/"),
+            (client, "post", expense + "submit_for_approval/"),
+            (consultant, "post", f"/api/v1/budget/expenses/{self.consultant_expense.pk}/approve/"),
+            (client, "get", f"/api/v1/budget/allocation/{self.allocation.pk}/"),
+        ]
+        for user in (consultant, client):
+            requests += [
+                (user, "get", "/api/v1/budget/allocation/"),
+                (user, "get", f"/api/v1/budget/allocation/?case_id={self.case.pk}"),
+                (user, "get", "/api/v1/budget/dashboard/budget_summary/"),
+            ]
+        return requests
+
+    def chat_requests(self):
+        consultant, client = self.consultant_user, self.client_user
+        conversation = f"/api/v1/chat/conversations/{self.conversation.id}/"
+        message = f"/api/v1/chat/messages/{self.message.pk}/"
+        requests = []
+        for user in (consultant, client):
+            requests += [
+                (user, "get", "/api/v1/chat/search/?q=bench"),
+                (user, "get", "/api/v1/chat/search-test/?q=bench"),
+                (user, "get", "/api/v1/chat/profile/"),
+                (user, "get", "/api/v1/chat/users/online/"),
+                (user, "get", conversation),
+                (user, "get", message),
+            ]
+        return requests + [
+            (client, "post", conversation + "mark_as_read/"),
+            (client, "post", "/api/v1/chat/messages/mark_as_read/", {"message_ids": [str(self.message.id)]}),
+            (consultant, "post", "/api/v1/chat/messages/mark_as_delivered/", {"message_ids": [str(self.message.id)]}),
+            (client, "get", message + "image/"),
+            (client, "put", message + "update_text/", {"text": "Edited"}),
+            (client, "post", message + "delete/", {"message_id": str(self.message.id)}),
+            (client, "post", "/api/v1/chat/conversations/start/", {"username": self.profiles[1].user.username}),
+            (client, "post", conversation + "archive/"),
+        ]
+
+    def upload_requests(self):
+        return [(self.client_user, "post", "/api/v1/uploads/sessions/",
+                 {"target": "document", "filename": "visa.pdf", "length": 9, "metadata": {"document_type": "visa"}})]
+
+    def test_profile_endpoints(self):
+        self.run_requests(self.profile_requests())
+
+    def test_document_endpoints(self):
+        self.run_requests(self.document_requests())
+
+    def test_task_endpoints(self):
+        self.run_requests(self.task_requests())
+
+    def test_budget_endpoints(self):
+        self.run_requests(self.budget_requests())
+
+    def test_chat_endpoints(self):
+        self.run_requests(self.chat_requests())
+
+    def test_upload_endpoints(self):
+        self.run_requests(self.upload_requests())
+        session = f"/api/v1/uploads/sessions/{self.client_user.upload_sessions.get().id}/"
+        self.call(self.client_user, "get", session)
+        self.call(
+            self.client_user, "patch", session, b"%PDF-1.4\n",
+            content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET="0",
+        )
+        self.call(self.client_user, "post", session + "finalize/")
+
+    def test_every_budgeted_view_is_exercised(self):
+        requests = (
+            self.profile_requests() + self.document_requests() + self.task_requests()
+            + self.budget_requests() + self.chat_requests() + self.upload_requests()
+        )
+        exercised = {resolve(urlsplit(path).path).view_name for _, _, path, *_ in requests}
+        # test_upload_endpoints calls these on the session it creates
+        exercised |= {"upload-sessions-detail", "upload-sessions-finalize"}
+        missing = [
+            name for name in QUERY_BUDGETS
+            if "." not in name and name not in exercised and name not in NOT_EXERCISED
+        ]
+        self.assertEqual(missing, [])
+
+
+@override_settings(
+    QUERY_BUDGET_MODE="raise",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class ConsumerQueryBudgetTests(TransactionTestCase):
+    """
+    Each consumer handler stays within its "<Consumer>.<handler>" budget. A
+    handler that exceeds it fails the consumer, and the communicator re-raises
+    the QueryBudgetExceeded on the next send or on disconnect.
+    """
+
+    def setUp(self):
+        self.user, self.other = UserFactory.create_batch(2)
+        user1, user2 = sorted([self.user, self.other], key=lambda user: user.pk)
+        conversation = ConversationFactory(user1=user1, user2=user2)
+        MessageFactory.create_batch(6, conversation=conversation, sender=self.other)
+        for _ in range(5):
+            ConversationFactory(user1=self.user, user2=UserFactory())
+
+    async def session(self, path, frames):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), path)
+        communicator.scope["user"] = self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        for frame in frames:
+            await communicator.send_json_to(frame)
+            await asyncio.sleep(0.1)
+        await communicator.disconnect()
+
+    def run_session(self, path, *frames):
+        async_to_sync(self.session)(path, frames)
+
+    def test_chat_consumer(self):
+        self.run_session(
+            f"/ws/chat/{self.other.username}/",
+            {"type": "message", "text": "Hello"},
+            {"type": "typing", "is_typing": True},
+            {"type": "load_more", "before_id": None},
+            {"type": "ping"},
+        )
+
+    def test_chat_list_consumer(self):
+        self.run_session("/ws/chat/list/", {"type": "ping"})
+
+    def test_online_status_consumer(self):
+        self.run_session("/ws/status/", {"type": "update_status", "status": "busy"})
+
+    def test_gateway_consumer(self):
+        self.run_session(
+            "/ws/gateway/",
+            {"action": "subscribe", "stream": "chatlist"},
+            {"action": "subscribe", "stream": "presence"},
+            {"action": "subscribe", "stream": "conversation", "username": self.other.username},
+            {"type": "ping"},
+        )
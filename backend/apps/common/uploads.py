@@ -0,0 +1,40 @@
+"""Upload handling shared by the apps"""
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+CHECKSUM_CHUNK_SIZE = 64 * 1024
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams every uploaded file to a temporary file on disk and computes its
+    SHA-256 as the chunks pass through, so upload memory stays at one chunk
+    whatever the file size. The hex digest is set as `file.checksum`.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.checksum = self.hasher.hexdigest()
+        return file
+
+
+def file_checksum(file):
+    """SHA-256 of a file, from `file.checksum` when an upload handler set it"""
+    checksum = getattr(file, 'checksum', None)
+    if checksum:
+        return checksum
+
+    hasher = hashlib.sha256()
+    for chunk in file.chunks(CHECKSUM_CHUNK_SIZE):
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
@@ -1,3 +1,14 @@
-from django.shortcuts import render
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.views.decorators.http import require_safe
 
-# Create your views here.
+from .protected_media import resolve, serve
+
+
+@require_safe
+def protected_media(request, token):
+    """Serve a protected file named by a signed token; the token is the authorization"""
+    name = resolve(token)
+    if name is None or not default_storage.exists(name):
+        raise Http404("Link is invalid or has expired.")
+    return serve(name, default_storage)
@@ -1,6 +1,9 @@
 # admin.py
 from django.contrib import admin
-from .models import Consultant, Profile, Document, Task
+from .models import Consultant, Profile, Document, Task, TaskTemplate
+from .assignment import auto_assign, recount_client_loads, release_slots, reserve_slots
+from .progress import deferred_progress
+from .provisioning import provision_default_tasks
 
 @admin.register(Consultant)
 class ConsultantAdmin(admin.ModelAdmin):
@@ -8,26 +11,70 @@ class ConsultantAdmin(admin.ModelAdmin):
     readonly_fields = ('employee_id', 'current_client_count', "is_consultant")
     search_fields = ('employee_id', 'user__first_name', 'user__last_name')
     list_filter = ('specialization', 'is_active', 'availability_status')
+    actions = ['recount_clients']
+
+    @admin.action(description='Recount client loads for all consultants')
+    def recount_clients(self, request, queryset):
+        fixed = recount_client_loads()
+        self.message_user(request, f"Corrected {fixed} consultants.")
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'relocation_type', 'current_city', 'destination_city', 'get_consultant_employee_id', 'overall_progress')
     list_filter = ('relocation_type', 'current_country', 'destination_country')
     search_fields = ('user__first_name', 'user__last_name', 'relocation_consultant__employee_id')
+    actions = ['provision_tasks', 'auto_assign_consultants']
     
     def get_consultant_employee_id(self, obj):
         return obj.get_consultant_employee_id()
     get_consultant_employee_id.short_description = 'Consultant ID'
 
+    @admin.action(description='Create default tasks for selected profiles')
+    def provision_tasks(self, request, queryset):
+        created = provision_default_tasks(queryset)
+        self.message_user(request, f"Created {created} tasks.")
+
+    @admin.action(description='Auto-assign consultants to selected profiles')
+    def auto_assign_consultants(self, request, queryset):
+        result = auto_assign(queryset)
+        self.message_user(request, f"Assigned {result['assigned']} profiles, {result['unmatched']} without a match.")
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Admins may override capacity, but the counts must follow the change
+        if change and 'relocation_consultant' in form.changed_data:
+            previous = form.initial.get('relocation_consultant')
+            if previous:
+                release_slots(previous)
+            if obj.relocation_consultant_id:
+                reserve_slots(obj.relocation_consultant_id, enforce_capacity=False)
+        elif not change and obj.relocation_consultant_id:
+            reserve_slots(obj.relocation_consultant_id, enforce_capacity=False)
+
+    def delete_queryset(self, request, queryset):
+        # Cascaded task deletes would otherwise recalculate once per task
+        with deferred_progress():
+            super().delete_queryset(request, queryset)
+
 
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
-    list_display = ('profile', 'document_type', 'created_at', 'reviewed_by', "status")
-    list_filter = ('document_type', 'status')
+    list_display = ('profile', 'document_type', 'created_at', 'reviewed_by', "status", 'validation_status')
+    list_filter = ('document_type', 'status', 'validation_status')
     search_fields = ('profile__user__first_name', 'profile__user__last_name', 'document_type')
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('profile', 'description',  'due_date', 'title', "is_completed",)
     list_filter = ('title', "profile")
-    search_fields = ('profile__user__first_name', 'profile__user__last_name', 'task_type')
\ No newline at end of file
+    search_fields = ('profile__user__first_name', 'profile__user__last_name', 'task_type')
+
+    def delete_queryset(self, request, queryset):
+        with deferred_progress():
+            super().delete_queryset(request, queryset)
+
+@admin.register(TaskTemplate)
+class TaskTemplateAdmin(admin.ModelAdmin):
+    list_display = ('title', 'stage', 'relocation_type', 'order', 'due_after_days', 'is_active')
+    list_filter = ('relocation_type', 'stage', 'is_active')
+    search_fields = ('title', 'description')
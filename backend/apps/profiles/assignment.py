@@ -0,0 +1,186 @@
+"""
+Consultant assignment.
+
+`Consultant.current_client_count` is only changed here, with conditional
+F() updates: a slot is taken only if the consultant is active and below
+`max_clients`, so concurrent assignments can't oversubscribe anyone and no
+assignment needs to recount the consultant's clients.
+"""
+import heapq
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Consultant, Profile
+
+
+class ConsultantUnavailable(Exception):
+    """The consultant is inactive or has no free client slots."""
+
+
+def reserve_slots(consultant_id, count=1, enforce_capacity=True):
+    """Take `count` client slots from a consultant. Returns False if they aren't free."""
+    consultants = Consultant.objects.filter(pk=consultant_id)
+    if enforce_capacity:
+        consultants = consultants.filter(is_active=True, current_client_count__lte=F('max_clients') - count)
+    return consultants.update(current_client_count=F('current_client_count') + count) == 1
+
+
+def release_slots(consultant_id, count=1):
+    """Give back `count` client slots, never going below zero."""
+    updated = Consultant.objects.filter(pk=consultant_id, current_client_count__gte=count).update(
+        current_client_count=F('current_client_count') - count
+    )
+    if not updated:
+        Consultant.objects.filter(pk=consultant_id).update(current_client_count=0)
+
+
+@transaction.atomic
+def assign_consultant(profile, consultant, enforce_capacity=True):
+    """
+    Assign (or reassign) a profile to a consultant.
+
+    The profile row is locked so concurrent reassignments of the same profile
+    release the right previous consultant. Raises ConsultantUnavailable when
+    the consultant has no free slot. Returns False if nothing changed.
+    """
+    previous_id = (
+        Profile.objects.select_for_update()
+        .values_list('relocation_consultant_id', flat=True)
+        .get(pk=profile.pk)
+    )
+    if previous_id == consultant.pk:
+        return False
+
+    if not reserve_slots(consultant.pk, enforce_capacity=enforce_capacity):
+        raise ConsultantUnavailable("Consultant has reached maximum client capacity.")
+    if previous_id:
+        release_slots(previous_id)
+
+    Profile.objects.filter(pk=profile.pk).update(relocation_consultant=consultant, updated_at=timezone.now())
+    profile.relocation_consultant = consultant
+    return True
+
+
+@transaction.atomic
+def unassign_consultant(profile):
+    previous_id = (
+        Profile.objects.select_for_update()
+        .values_list('relocation_consultant_id', flat=True)
+        .get(pk=profile.pk)
+    )
+    if previous_id is None:
+        return False
+
+    release_slots(previous_id)
+    Profile.objects.filter(pk=profile.pk).update(relocation_consultant=None, updated_at=timezone.now())
+    profile.relocation_consultant = None
+    return True
+
+
+def plan_assignments(profiles, consultants):
+    """
+    Match profiles to consultants, least-loaded first.
+
+    A profile's relocation type must match the consultant's specialization;
+    consultants in the profile's country are preferred, any country is the
+    fallback. Load is the share of `max_clients` in use, so larger
+    consultants take proportionally more clients. Pure Python, no queries.
+    Returns {consultant pkid: [profile pkid, ...]}.
+    """
+    load = {}
+    pools = defaultdict(list)
+
+    def push(consultant_id, specialization, country):
+        used, capacity = load[consultant_id]
+        if used < capacity:
+            entry = (used / capacity, used, consultant_id)
+            heapq.heappush(pools[(specialization, country)], entry)
+            heapq.heappush(pools[(specialization, None)], entry)
+
+    meta = {}
+    for consultant in consultants:
+        load[consultant['pkid']] = [consultant['current_client_count'], consultant['max_clients']]
+        meta[consultant['pkid']] = (consultant['specialization'], consultant['country'])
+        push(consultant['pkid'], *meta[consultant['pkid']])
+
+    def pop(key):
+        pool = pools.get(key)
+        while pool:
+            _, used, consultant_id = heapq.heappop(pool)
+            # Skip entries made stale by an assignment through the other pool
+            if load[consultant_id][0] == used and used < load[consultant_id][1]:
+                return consultant_id
+        return None
+
+    plan = defaultdict(list)
+    for profile in profiles:
+        consultant_id = pop((profile['relocation_type'], profile['country'])) or pop((profile['relocation_type'], None))
+        if consultant_id is None:
+            continue
+        plan[consultant_id].append(profile['pkid'])
+        load[consultant_id][0] += 1
+        push(consultant_id, *meta[consultant_id])
+    return plan
+
+
+def auto_assign(profiles=None):
+    """
+    Assign unassigned client profiles to matching consultants in bulk.
+
+    Reads candidates and consultant loads once, plans in memory, then writes
+    per consultant: one conditional slot reservation and one profile UPDATE,
+    whatever the number of profiles. Profiles that were assigned meanwhile or
+    whose consultant filled up are left for the next run.
+    Returns {"assigned": n, "unmatched": n}.
+    """
+    if profiles is None:
+        profiles = Profile.objects.all()
+    candidates = list(
+        profiles.filter(relocation_consultant__isnull=True, is_consultant=False, relocation_type__isnull=False)
+        .order_by('created_at')
+        .values('pkid', 'relocation_type', 'country')
+    )
+    consultants = (
+        Consultant.objects.filter(
+            is_active=True, availability_status="available", current_client_count__lt=F('max_clients')
+        )
+        .values('pkid', 'specialization', 'country', 'current_client_count', 'max_clients')
+    )
+
+    plan = plan_assignments(candidates, consultants)
+    now = timezone.now()
+    assigned = 0
+    for consultant_id, profile_ids in plan.items():
+        with transaction.atomic():
+            if not reserve_slots(consultant_id, len(profile_ids)):
+                continue
+            updated = Profile.objects.filter(pk__in=profile_ids, relocation_consultant__isnull=True).update(
+                relocation_consultant_id=consultant_id, updated_at=now
+            )
+            if updated < len(profile_ids):
+                release_slots(consultant_id, len(profile_ids) - updated)
+        assigned += updated
+
+    return {"assigned": assigned, "unmatched": len(candidates) - assigned}
+
+
+def recount_client_loads():
+    """Resynchronise every consultant's current_client_count with its assigned profiles."""
+    counts = dict(
+        Profile.objects.filter(relocation_consultant__isnull=False)
+        .order_by()
+        .values_list('relocation_consultant_id')
+        .annotate(total=Count('pkid'))
+    )
+    drifted = [
+        consultant
+        for consultant in Consultant.objects.only('pkid', 'current_client_count')
+        if consultant.current_client_count != counts.get(consultant.pk, 0)
+    ]
+    for consultant in drifted:
+        consultant.current_client_count = counts.get(consultant.pk, 0)
+    Consultant.objects.bulk_update(drifted, ['current_client_count'], batch_size=500)
+    return len(drifted)
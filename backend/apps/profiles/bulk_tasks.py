@@ -0,0 +1,120 @@
+"""
+Bulk task operations.
+
+Create, complete/uncomplete, reorder and stage moves for many tasks in one
+request. Each operation runs in one transaction: the tasks (or profiles) are
+resolved with one query against the caller's scope, written with one
+bulk_create/bulk_update, and progress is recalculated once for every
+affected profile with `recalculate_progress_many()`. bulk writes skip the
+Task signals, so nothing is recalculated per row.
+
+Either every id resolves and all rows are written, or UnknownObjects is
+raised and none are.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+from .progress import recalculate_progress_many
+
+MAX_BULK_TASKS = 500
+
+
+class UnknownObjects(Exception):
+    """Some ids don't exist or are outside the caller's scope."""
+
+    def __init__(self, message, ids):
+        super().__init__(message)
+        self.ids = ids
+
+
+def _locked(tasks, ids, fields):
+    """The tasks of `tasks` with `ids`, locked, or UnknownObjects if any is missing"""
+    found = list(
+        tasks.select_for_update(of=('self',))
+        .filter(id__in=ids)
+        .select_related(None)
+        .order_by()
+        .only('pkid', 'id', 'profile_id', 'updated_at', *fields)
+    )
+    if len(found) != len(ids):
+        seen = {task.id for task in found}
+        raise UnknownObjects("Tasks not found.", [str(task_id) for task_id in ids if task_id not in seen])
+    return found
+
+
+def _write(changed, fields, recalculate=True):
+    now = timezone.now()
+    for task in changed:
+        task.updated_at = now
+    Task.objects.bulk_update(changed, [*fields, 'updated_at'], batch_size=MAX_BULK_TASKS)
+    if recalculate:
+        recalculate_progress_many(task.profile_id for task in changed)
+    return len(changed)
+
+
+@transaction.atomic
+def create_tasks(profiles, rows):
+    """
+    Create a task for each row (validated TaskCreateSerializer data).
+
+    `profiles` is the Profile queryset the caller may add tasks to; each
+    row's `profile` is a profile id in it. Returns the created tasks.
+    """
+    profile_ids = {row['profile'] for row in rows}
+    by_id = {profile.id: profile for profile in profiles.filter(id__in=profile_ids).select_related('user')}
+    if len(by_id) != len(profile_ids):
+        raise UnknownObjects("Profiles not found.", [str(profile_id) for profile_id in profile_ids - by_id.keys()])
+
+    tasks = []
+    for row in rows:
+        fields = {key: value for key, value in row.items() if key != 'profile'}
+        task = Task(profile=by_id[row['profile']], **fields)
+        if not task.order:
+            task.order = Task.default_order(task.stage)
+        tasks.append(task)
+
+    Task.objects.bulk_create(tasks, batch_size=MAX_BULK_TASKS)
+    recalculate_progress_many(profile.pk for profile in by_id.values())
+    return tasks
+
+
+@transaction.atomic
+def set_completed(tasks, ids, is_completed=True):
+    """Mark the tasks with `ids` complete (or not). Returns the number changed."""
+    ids = set(ids)
+    changed = [task for task in _locked(tasks, ids, ['is_completed']) if task.is_completed != is_completed]
+    for task in changed:
+        task.is_completed = is_completed
+    return _write(changed, ['is_completed'])
+
+
+@transaction.atomic
+def reorder_tasks(tasks, orders):
+    """
+    Set display order from `orders`, a mapping of task id to order.
+
+    Order doesn't affect progress, so nothing is recalculated. Returns the
+    number changed.
+    """
+    changed = [task for task in _locked(tasks, set(orders), ['order']) if task.order != orders[task.id]]
+    for task in changed:
+        task.order = orders[task.id]
+    return _write(changed, ['order'], recalculate=False)
+
+
+@transaction.atomic
+def move_tasks(tasks, ids, stage):
+    """
+    Move the tasks with `ids` to `stage`. Returns the number changed.
+
+    Tasks still at their old stage's default order take the new stage's, the
+    way Task.save() assigns it.
+    """
+    ids = set(ids)
+    changed = [task for task in _locked(tasks, ids, ['stage', 'order']) if task.stage != stage]
+    for task in changed:
+        if task.order == Task.default_order(task.stage):
+            task.order = Task.default_order(stage)
+        task.stage = stage
+    return _write(changed, ['stage', 'order'])
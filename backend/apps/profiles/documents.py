@@ -0,0 +1,98 @@
+"""
+Document file storage and validation.
+
+Uploads reach the view already on disk and hashed (HashingUploadHandler).
+Files are stored content-addressed under documents/sha256/, so re-uploading
+the same passport or certificate, by any client, reuses the stored file
+instead of writing another copy. The same client re-uploading the same file
+for the same document type gets the existing document back.
+
+Format and size checks run after the upload, in the validate_document Celery
+task, and never hold the file in memory.
+"""
+import os
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.common.uploads import file_checksum
+
+from .models import Document
+
+# Leading bytes of the accepted formats
+DOCUMENT_SIGNATURES = {
+    b'%PDF-': 'PDF',
+    b'\x89PNG\r\n\x1a\n': 'PNG',
+    b'\xff\xd8\xff': 'JPEG',
+    b'II*\x00': 'TIFF',
+    b'MM\x00*': 'TIFF',
+    b'PK\x03\x04': 'Office Open XML',
+    b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1': 'Microsoft Office',
+}
+SIGNATURE_LENGTH = max(len(signature) for signature in DOCUMENT_SIGNATURES)
+
+
+def content_name(checksum, filename):
+    """Storage name for a file with `checksum`, keeping the upload's extension"""
+    extension = os.path.splitext(filename or '')[1].lower()[:10]
+    return f"documents/sha256/{checksum[:2]}/{checksum}{extension}"
+
+
+def store_file(upload, checksum):
+    """Store `upload` under its content name unless an identical file is already stored"""
+    storage = Document._meta.get_field('document_file').storage
+    name = content_name(checksum, upload.name)
+    if storage.exists(name):
+        return name
+    return storage.save(name, upload)
+
+
+def store_document(profile, document_type, upload):
+    """
+    Create a Document for `upload`, or return the client's existing copy.
+
+    Returns (document, created). New documents are queued for validation once
+    the transaction commits.
+    """
+    checksum = file_checksum(upload)
+    # Read before storing: storage may move a file that is already on disk
+    size = upload.size
+    existing = (
+        Document.objects.filter(profile=profile, document_type=document_type, checksum=checksum)
+        .exclude(status="rejected")
+        .exclude(validation_status="failed")
+        .first()
+    )
+    if existing:
+        return existing, False
+
+    document = Document.objects.create(
+        profile=profile,
+        document_type=document_type,
+        document_file=store_file(upload, checksum),
+        checksum=checksum,
+        file_size=size,
+    )
+
+    from .tasks import validate_document
+    transaction.on_commit(lambda: validate_document.delay(document.pk))
+    return document, True
+
+
+def validation_error(document):
+    """Why `document`'s file is not acceptable, or None"""
+    document_file = document.document_file
+    if not document_file or not document_file.storage.exists(document_file.name):
+        return "File is missing."
+
+    size = document_file.size
+    if size == 0:
+        return "File is empty."
+    if size > settings.DOCUMENT_MAX_UPLOAD_SIZE:
+        return f"File is larger than {settings.DOCUMENT_MAX_UPLOAD_SIZE // (1024 * 1024)} MB."
+
+    with document_file.open('rb') as f:
+        header = f.read(SIGNATURE_LENGTH)
+    if not any(header.startswith(signature) for signature in DOCUMENT_SIGNATURES):
+        return "Unsupported file format."
+    return None
@@ -0,0 +1,60 @@
+import factory
+from factory import fuzzy
+
+from apps.users.factories import UserFactory
+
+from .models import Consultant, Document, Profile, Task
+
+
+class ConsultantFactory(factory.django.DjangoModelFactory):
+    """Consultant.save() allocates the employee ID; bulk_create callers use Consultant.assign_employee_ids()"""
+
+    class Meta:
+        model = Consultant
+
+    user = factory.SubFactory(UserFactory)
+    specialization = fuzzy.FuzzyChoice([code for code, _ in Consultant.SPECIALIZATION_CHOICES])
+    years_experience = fuzzy.FuzzyInteger(1, 25)
+    max_clients = 200
+    work_email = factory.LazyAttribute(lambda consultant: consultant.user.email)
+
+
+class ProfileFactory(factory.django.DjangoModelFactory):
+    """
+    A client profile. Creating a User already creates its Profile (signal), so
+    `create()` fills that one in; bulk seeding builds profiles for users that
+    were bulk-created without signals.
+    """
+
+    class Meta:
+        model = Profile
+        django_get_or_create = ("user",)
+
+    user = factory.SubFactory(UserFactory)
+    relocation_type = fuzzy.FuzzyChoice([code for code, _ in Profile.RELOCATION_TYPES])
+    current_country = factory.Faker("country")
+    current_city = factory.Faker("city")
+    destination_country = factory.Faker("country")
+    destination_city = factory.Faker("city")
+    expected_move_date = factory.Faker("date_between", start_date="+1m", end_date="+1y")
+    family_members = fuzzy.FuzzyInteger(1, 6)
+
+
+class TaskFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Task
+
+    profile = factory.SubFactory(ProfileFactory)
+    title = factory.Faker("sentence", nb_words=4)
+    description = factory.Faker("paragraph")
+    stage = fuzzy.FuzzyChoice([code for code, _ in Task.RELOCATION_STAGES])
+    due_date = factory.Faker("date_between", start_date="-2m", end_date="+4m")
+
+
+class DocumentFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Document
+
+    profile = factory.SubFactory(ProfileFactory)
+    document_type = fuzzy.FuzzyChoice(["passport", "visa", "birth_certificate", "employment_letter", "lease"])
+    document_file = factory.django.FileField(filename="document.pdf", data=b"%PDF-1.4\n")
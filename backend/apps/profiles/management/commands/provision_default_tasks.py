@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from apps.profiles.models import Profile
+from apps.profiles.provisioning import provision_default_tasks
+
+
+class Command(BaseCommand):
+    """
+    Create the default task set for client profiles that have no tasks yet,
+    e.g. after a bulk import of clients.
+
+        python manage.py provision_default_tasks --relocation-type international
+    """
+
+    help = "Create default tasks (from TaskTemplate) for client profiles without tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--relocation-type", choices=[code for code, _ in Profile.RELOCATION_TYPES],
+            help="Only provision profiles of this relocation type.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Profiles per transaction.")
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.filter(is_consultant=False, tasks__isnull=True).order_by("pkid")
+        if options["relocation_type"]:
+            profiles = profiles.filter(relocation_type=options["relocation_type"])
+
+        chunk_size = options["chunk_size"]
+        total = 0
+        last_pkid = 0
+        while True:
+            chunk = list(profiles.filter(pkid__gt=last_pkid).only("pkid", "relocation_type")[:chunk_size])
+            if not chunk:
+                break
+            total += provision_default_tasks(chunk, skip_existing=False)
+            last_pkid = chunk[-1].pkid
+
+        self.stdout.write(self.style.SUCCESS(f"Created {total} tasks."))
@@ -0,0 +1,8 @@
+from prometheus_client import Counter
+
+# Saves of models the Profile mirrors, and whether they led to a profile write
+PROFILE_SYNC = Counter(
+    "atlas_profile_sync_total",
+    "User/Consultant saves considered for propagation to Profile.",
+    ["source", "result"],
+)
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:57
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0005_consultant_is_consultant"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskTemplate",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "relocation_type",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("corporate_law", "Corporate Relocation"),
+                            ("international", "International Relocation"),
+                            ("domestic", "Domestic Relocation"),
+                            ("family", "Family Relocation"),
+                        ],
+                        max_length=50,
+                        null=True,
+                        verbose_name="Relocation Type",
+                    ),
+                ),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("initial_consultation", "Initial Consultation"),
+                            ("document_collection", "Document Collection"),
+                            ("visa_processing", "Visa Processing"),
+                            ("housing_search", "Housing Search"),
+                            ("school_enrollment", "School Enrollment"),
+                            ("final_relocation", "Final Relocation"),
+                        ],
+                        default="initial_consultation",
+                        max_length=50,
+                        verbose_name="Relocation Stage",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200, verbose_name="Task Title")),
+                (
+                    "description",
+                    models.TextField(blank=True, verbose_name="Task Description"),
+                ),
+                (
+                    "order",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Display Order"
+                    ),
+                ),
+                (
+                    "due_after_days",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Due After (days)"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(default=True, verbose_name="Is Active"),
+                ),
+            ],
+            options={
+                "ordering": ["stage", "order"],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:58
+
+from django.db import migrations
+
+DEFAULT_TEMPLATES = [
+    # Initial Consultation
+    ("initial_consultation", "Complete initial consultation form", 1),
+    ("initial_consultation", "Discuss relocation goals and timeline", 2),
+    # Document Collection
+    ("document_collection", "Submit passport copies", 1),
+    ("document_collection", "Provide proof of income", 2),
+    ("document_collection", "Submit educational certificates", 3),
+    # Visa Processing
+    ("visa_processing", "Complete visa application", 1),
+    ("visa_processing", "Schedule visa interview", 2),
+    ("visa_processing", "Submit medical examination results", 3),
+    # Housing Search
+    ("housing_search", "Define housing preferences", 1),
+    ("housing_search", "Research neighborhoods", 2),
+    ("housing_search", "Schedule property viewings", 3),
+    # School Enrollment
+    ("school_enrollment", "Research schools in area", 1),
+    ("school_enrollment", "Submit school applications", 2),
+    ("school_enrollment", "Complete enrollment paperwork", 3),
+    # Final Relocation
+    ("final_relocation", "Book moving services", 1),
+    ("final_relocation", "Arrange temporary accommodation", 2),
+    ("final_relocation", "Confirm travel arrangements", 3),
+]
+
+
+def seed_templates(apps, schema_editor):
+    TaskTemplate = apps.get_model("profiles", "TaskTemplate")
+    TaskTemplate.objects.bulk_create(
+        TaskTemplate(stage=stage, title=title, order=order)
+        for stage, title, order in DEFAULT_TEMPLATES
+    )
+
+
+def remove_templates(apps, schema_editor):
+    TaskTemplate = apps.get_model("profiles", "TaskTemplate")
+    TaskTemplate.objects.filter(
+        relocation_type__isnull=True,
+        title__in=[title for _, title, _ in DEFAULT_TEMPLATES],
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0006_tasktemplate"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_templates, remove_templates),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:00
+
+import re
+
+from django.db import migrations
+
+COUNTER_NAME = "consultant_employee_id"
+
+
+def seed_counter(apps, schema_editor):
+    """Start the counter after the highest ATP number already issued"""
+    Consultant = apps.get_model("profiles", "Consultant")
+    Counter = apps.get_model("common", "Counter")
+
+    highest = 0
+    for employee_id in Consultant.objects.values_list("employee_id", flat=True):
+        match = re.fullmatch(r"ATP(\d+)", employee_id)
+        if match:
+            highest = max(highest, int(match.group(1)))
+
+    Counter.objects.update_or_create(name=COUNTER_NAME, defaults={"value": highest})
+
+
+def remove_counter(apps, schema_editor):
+    Counter = apps.get_model("common", "Counter")
+    Counter.objects.filter(name=COUNTER_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0001_initial"),
+        ("profiles", "0007_seed_task_templates"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_counter, remove_counter),
+    ]
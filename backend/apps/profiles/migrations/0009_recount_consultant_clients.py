@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:10
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def recount_clients(apps, schema_editor):
+    """current_client_count is maintained incrementally from here on; start it from the truth"""
+    Consultant = apps.get_model("profiles", "Consultant")
+    Profile = apps.get_model("profiles", "Profile")
+
+    counts = dict(
+        Profile.objects.filter(relocation_consultant__isnull=False)
+        .order_by()
+        .values_list("relocation_consultant_id")
+        .annotate(total=Count("pkid"))
+    )
+    consultants = list(Consultant.objects.only("pkid", "current_client_count"))
+    for consultant in consultants:
+        consultant.current_client_count = counts.get(consultant.pk, 0)
+    Consultant.objects.bulk_update(consultants, ["current_client_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0008_seed_employee_id_counter"),
+    ]
+
+    operations = [
+        migrations.RunPython(recount_clients, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0009_recount_consultant_clients"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsultantDocumentSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status_counts",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Status Counts"
+                    ),
+                ),
+                (
+                    "total_reviewed",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total Reviewed"
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="Refreshed At")),
+                (
+                    "consultant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="document_summary",
+                        to="profiles.consultant",
+                    ),
+                ),
+            ],
+        ),
+    ]
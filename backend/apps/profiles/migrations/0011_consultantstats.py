@@ -0,0 +1,81 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0010_consultantdocumentsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsultantStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total_clients",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total Clients"
+                    ),
+                ),
+                (
+                    "average_progress",
+                    models.FloatField(default=0, verbose_name="Average Progress (%)"),
+                ),
+                (
+                    "high_progress_clients",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="High Progress Clients"
+                    ),
+                ),
+                (
+                    "progress_distribution",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Progress Distribution"
+                    ),
+                ),
+                (
+                    "relocation_type_counts",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Relocation Type Counts"
+                    ),
+                ),
+                (
+                    "document_status_counts",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Document Status Counts"
+                    ),
+                ),
+                (
+                    "total_tasks",
+                    models.PositiveIntegerField(default=0, verbose_name="Total Tasks"),
+                ),
+                (
+                    "completed_tasks",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Completed Tasks"
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="Refreshed At")),
+                (
+                    "consultant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="profiles.consultant",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:09
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.common.operations import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0011_consultantstats"),
+    ]
+
+    # The tsvector expressions must match apps.profiles.search.search_vector()
+    operations = [
+        TrigramExtension(),
+        PostgresRunSQL(
+            sql="""CREATE INDEX IF NOT EXISTS "document_search_idx" ON "profiles_document" USING gin ((to_tsvector('english'::regconfig, COALESCE("document_type", ''))))""",
+            reverse_sql='DROP INDEX IF EXISTS "document_search_idx"',
+        ),
+        PostgresRunSQL(
+            sql='CREATE INDEX IF NOT EXISTS "document_type_trgm_idx" ON "profiles_document" USING gin ("document_type" gin_trgm_ops)',
+            reverse_sql='DROP INDEX IF EXISTS "document_type_trgm_idx"',
+        ),
+        PostgresRunSQL(
+            sql="""CREATE INDEX IF NOT EXISTS "task_search_idx" ON "profiles_task" USING gin ((to_tsvector('english'::regconfig, COALESCE("title", '') || ' ' || COALESCE("description", ''))))""",
+            reverse_sql='DROP INDEX IF EXISTS "task_search_idx"',
+        ),
+        PostgresRunSQL(
+            sql='CREATE INDEX IF NOT EXISTS "task_title_trgm_idx" ON "profiles_task" USING gin ("title" gin_trgm_ops)',
+            reverse_sql='DROP INDEX IF EXISTS "task_title_trgm_idx"',
+        ),
+    ]
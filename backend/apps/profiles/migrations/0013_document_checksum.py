@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0012_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="checksum",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                max_length=64,
+                verbose_name="SHA-256 Checksum",
+            ),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="file_size",
+            field=models.PositiveBigIntegerField(default=0, verbose_name="File Size"),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="validation_error",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="Validation Error"
+            ),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="validation_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("passed", "Passed"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+                verbose_name="Validation Status",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0013_document_checksum"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OverdueTaskSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "overdue_tasks",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Overdue Tasks"
+                    ),
+                ),
+                ("oldest_due_date", models.DateField(verbose_name="Oldest Due Date")),
+                ("as_of", models.DateField(verbose_name="As Of")),
+                ("refreshed_at", models.DateTimeField(verbose_name="Refreshed At")),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["due_date", "profile"],
+                name="task_pending_due_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="overduetasksnapshot",
+            name="consultant",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="overdue_snapshots",
+                to="profiles.consultant",
+            ),
+        ),
+        migrations.AddField(
+            model_name="overduetasksnapshot",
+            name="profile",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="overdue_snapshot",
+                to="profiles.profile",
+            ),
+        ),
+    ]
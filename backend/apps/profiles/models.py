@@ -1,4 +1,5 @@
 from django.db import models
+from apps.common.counters import allocate
 from apps.common.models import TimeStampedUUIDModel
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
@@ -57,12 +58,26 @@ class Consultant(TimeStampedUUIDModel):
         verbose_name=_("Availability Status")
     )
 
+    EMPLOYEE_ID_COUNTER = "consultant_employee_id"
+
+    @staticmethod
+    def format_employee_id(number):
+        return f"ATP{number:04d}"
+
+    @classmethod
+    def assign_employee_ids(cls, consultants):
+        """Give consultants without an employee ID one each, e.g. before bulk_create"""
+        pending = [consultant for consultant in consultants if not consultant.employee_id]
+        if pending:
+            numbers = allocate(cls.EMPLOYEE_ID_COUNTER, len(pending))
+            for consultant, number in zip(pending, numbers):
+                consultant.employee_id = cls.format_employee_id(number)
+        return consultants
+
     def save(self, *args, **kwargs):
         if not self.employee_id:
-            count = Consultant.objects.count()
-            self.employee_id = f"ATP{count + 1:04d}"
+            self.assign_employee_ids([self])
         super().save(*args, **kwargs)
-        self.user.profile.is_consultant = True
 
     def __str__(self):
         if self.user and hasattr(self.user, 'get_full_name'):
@@ -256,46 +271,10 @@ class Profile(TimeStampedUUIDModel):
             return self.relocation_consultant.user.get_full_name()
         return "No Consultant Assigned"
     
-    def calculate_stage_progress(self, stage):
-        """Calculate progress percentage for a specific stage"""
-        stage_tasks = self.tasks.filter(stage=stage)
-        if not stage_tasks.exists():
-            return 0
-        
-        completed_tasks = stage_tasks.filter(is_completed=True).count()
-        total_tasks = stage_tasks.count()
-        
-        return int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
-    
-    def calculate_overall_progress(self):
-        """Calculate overall relocation progress"""
-        total_stages = len(Task.RELOCATION_STAGES)
-        if total_stages == 0:
-            return 0
-        
-        total_progress = sum(
-            self.calculate_stage_progress(stage[0]) 
-            for stage in Task.RELOCATION_STAGES
-        )
-        
-        return int(total_progress / total_stages)
-    
     def update_progress(self):
-        """Update and save the overall progress"""
-        self.overall_progress = self.calculate_overall_progress()
-        
-        # Update current stage based on progress
-        stages = [stage[0] for stage in Task.RELOCATION_STAGES]
-        for i, stage in enumerate(stages):
-            stage_progress = self.calculate_stage_progress(stage)
-            if stage_progress < 100 and (i == 0 or self.calculate_stage_progress(stages[i-1]) == 100):
-                self.current_stage = Task.RELOCATION_STAGES[i][1]
-                break
-        else:
-            # All stages complete
-            self.current_stage = "Completed"
-        
-        self.save()
+        """Recalculate overall progress and current stage from the tasks"""
+        from .progress import recalculate_progress
+        return recalculate_progress(self)
     
 
 class Document(TimeStampedUUIDModel):
@@ -334,6 +313,27 @@ class Document(TimeStampedUUIDModel):
         related_name='reviewed_documents',
         verbose_name=_("Reviewed By")
     )
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        verbose_name=_("SHA-256 Checksum")
+    )
+    file_size = models.PositiveBigIntegerField(default=0, verbose_name=_("File Size"))
+
+    VALIDATION_CHOICES = [
+        ("pending", "Pending"),
+        ("passed", "Passed"),
+        ("failed", "Failed"),
+    ]
+
+    validation_status = models.CharField(
+        max_length=20,
+        choices=VALIDATION_CHOICES,
+        default="pending",
+        verbose_name=_("Validation Status")
+    )
+    validation_error = models.CharField(max_length=255, blank=True, verbose_name=_("Validation Error"))
 
     def __str__(self):
         if self.profile and self.profile.user and hasattr(self.profile.user, 'get_full_name'):
@@ -386,6 +386,14 @@ class Task(TimeStampedUUIDModel):
 
     class Meta:
         ordering = ['order', 'created_at']
+        indexes = [
+            # Pending tasks by due date: overdue lists, reminders and snapshots
+            models.Index(
+                fields=['due_date', 'profile'],
+                condition=models.Q(is_completed=False),
+                name='task_pending_due_idx',
+            ),
+        ]
 
     def __str__(self):
         if self.profile and self.profile.user and hasattr(self.profile.user, 'get_full_name'):
@@ -393,9 +401,129 @@ class Task(TimeStampedUUIDModel):
             return f"Task: {self.title} for {full_name}"
         return f"Task: {self.title}"
 
+    @classmethod
+    def default_order(cls, stage):
+        """Display order for a task of `stage` when none is given"""
+        return STAGE_ORDER.get(stage, 0)
+
     def save(self, *args, **kwargs):
         # Auto-set order based on stage if not provided
         if not self.order:
-            stage_order = dict((stage, idx) for idx, (stage, _) in enumerate(self.RELOCATION_STAGES))
-            self.order = stage_order.get(self.stage, 0)
-        super().save(*args, **kwargs)
\ No newline at end of file
+            self.order = self.default_order(self.stage)
+        super().save(*args, **kwargs)
+
+
+STAGE_ORDER = {stage: idx for idx, (stage, _) in enumerate(Task.RELOCATION_STAGES)}
+
+
+class TaskTemplate(TimeStampedUUIDModel):
+    """
+    A task every new client gets. Templates without a relocation type apply
+    to all clients; the others only to profiles of that type.
+    """
+    relocation_type = models.CharField(
+        max_length=50,
+        choices=Profile.RELOCATION_TYPES,
+        null=True,
+        blank=True,
+        verbose_name=_("Relocation Type")
+    )
+    stage = models.CharField(
+        max_length=50,
+        choices=Task.RELOCATION_STAGES,
+        default="initial_consultation",
+        verbose_name=_("Relocation Stage")
+    )
+    title = models.CharField(
+        max_length=200,
+        verbose_name=_("Task Title")
+    )
+    description = models.TextField(
+        blank=True,
+        verbose_name=_("Task Description")
+    )
+    order = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Display Order")
+    )
+    due_after_days = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_("Due After (days)")
+    )
+    is_active = models.BooleanField(default=True, verbose_name=_("Is Active"))
+
+    class Meta:
+        ordering = ['stage', 'order']
+
+    def __str__(self):
+        return f"Task Template: {self.title} ({self.relocation_type or 'all'})"
+
+
+class ConsultantDocumentSummary(models.Model):
+    """
+    Per-consultant document review counts, rebuilt periodically by
+    `apps.profiles.tasks.refresh_document_summaries` for the admin overview.
+    """
+    consultant = models.OneToOneField(
+        Consultant,
+        on_delete=models.CASCADE,
+        related_name='document_summary'
+    )
+    status_counts = models.JSONField(default=dict, blank=True, verbose_name=_("Status Counts"))
+    total_reviewed = models.PositiveIntegerField(default=0, verbose_name=_("Total Reviewed"))
+    refreshed_at = models.DateTimeField(verbose_name=_("Refreshed At"))
+
+    def __str__(self):
+        return f"Document summary for {self.consultant_id}"
+
+
+class ConsultantStats(models.Model):
+    """
+    Dashboard rollup of a consultant's book of clients, rebuilt by
+    `apps.profiles.tasks.refresh_consultant_stats`.
+    """
+    consultant = models.OneToOneField(
+        Consultant,
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    total_clients = models.PositiveIntegerField(default=0, verbose_name=_("Total Clients"))
+    average_progress = models.FloatField(default=0, verbose_name=_("Average Progress (%)"))
+    high_progress_clients = models.PositiveIntegerField(default=0, verbose_name=_("High Progress Clients"))
+    progress_distribution = models.JSONField(default=dict, blank=True, verbose_name=_("Progress Distribution"))
+    relocation_type_counts = models.JSONField(default=dict, blank=True, verbose_name=_("Relocation Type Counts"))
+    document_status_counts = models.JSONField(default=dict, blank=True, verbose_name=_("Document Status Counts"))
+    total_tasks = models.PositiveIntegerField(default=0, verbose_name=_("Total Tasks"))
+    completed_tasks = models.PositiveIntegerField(default=0, verbose_name=_("Completed Tasks"))
+    refreshed_at = models.DateTimeField(verbose_name=_("Refreshed At"))
+
+    def __str__(self):
+        return f"Stats for {self.consultant_id}"
+
+
+class OverdueTaskSnapshot(models.Model):
+    """
+    A client's overdue tasks as of the last nightly
+    `apps.profiles.tasks.snapshot_overdue_tasks` run. Only profiles with
+    overdue tasks have a row.
+    """
+    profile = models.OneToOneField(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name='overdue_snapshot'
+    )
+    consultant = models.ForeignKey(
+        Consultant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='overdue_snapshots'
+    )
+    overdue_tasks = models.PositiveIntegerField(default=0, verbose_name=_("Overdue Tasks"))
+    oldest_due_date = models.DateField(verbose_name=_("Oldest Due Date"))
+    as_of = models.DateField(verbose_name=_("As Of"))
+    refreshed_at = models.DateTimeField(verbose_name=_("Refreshed At"))
+
+    def __str__(self):
+        return f"Overdue snapshot for {self.profile_id}"
@@ -0,0 +1,163 @@
+"""
+Overdue tasks.
+
+Pending tasks are indexed by due date (the partial `task_pending_due_idx`),
+so overdue lookups read the index rather than the task table. Once a night
+`rebuild_overdue_snapshots()` stores each client's overdue count in
+OverdueTaskSnapshot with one grouped query, and `queue_overdue_reminders()`
+sends the reminder emails in batches from those snapshots: one email per
+client and one digest per consultant.
+"""
+from collections import defaultdict
+
+from django.core.mail import send_mass_mail
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import OverdueTaskSnapshot, Task
+
+# Recipients per send_overdue_reminders task (one mail connection each)
+REMINDER_BATCH_SIZE = 100
+
+
+def overdue(tasks, today=None):
+    """Tasks of `tasks` past their due date and not completed"""
+    today = today or timezone.now().date()
+    return tasks.filter(is_completed=False, due_date__lt=today)
+
+
+@transaction.atomic
+def rebuild_overdue_snapshots(today=None):
+    """
+    Replace OverdueTaskSnapshot with the overdue counts as of `today`.
+
+    One grouped query over the pending-task index and one bulk upsert;
+    profiles with nothing overdue lose their row. Returns the number of
+    profiles with overdue tasks.
+    """
+    today = today or timezone.now().date()
+    rows = (
+        overdue(Task.objects.all(), today)
+        .order_by()
+        .values('profile_id', 'profile__relocation_consultant_id')
+        .annotate(count=models.Count('pkid'), oldest=models.Min('due_date'))
+    )
+
+    now = timezone.now()
+    snapshots = [
+        OverdueTaskSnapshot(
+            profile_id=row['profile_id'],
+            consultant_id=row['profile__relocation_consultant_id'],
+            overdue_tasks=row['count'],
+            oldest_due_date=row['oldest'],
+            as_of=today,
+            refreshed_at=now,
+        )
+        for row in rows
+    ]
+    OverdueTaskSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['profile'],
+        update_fields=['consultant', 'overdue_tasks', 'oldest_due_date', 'as_of', 'refreshed_at'],
+    )
+    OverdueTaskSnapshot.objects.exclude(refreshed_at=now).delete()
+    return len(snapshots)
+
+
+def overdue_summary(snapshots):
+    """Totals and per-client rows for an OverdueTaskSnapshot queryset"""
+    snapshots = list(snapshots.select_related('profile__user').order_by('oldest_due_date', 'profile_id'))
+    clients = [
+        {
+            "profile_id": snapshot.profile.id,
+            "client_name": snapshot.profile.user.get_full_name(),
+            "overdue_tasks": snapshot.overdue_tasks,
+            "oldest_due_date": snapshot.oldest_due_date,
+        }
+        for snapshot in snapshots
+    ]
+    return {
+        "overdue_tasks": sum(client["overdue_tasks"] for client in clients),
+        "clients": clients,
+        "as_of": snapshots[0].as_of if snapshots else None,
+    }
+
+
+def client_reminders(profile_ids):
+    """send_mass_mail messages for the clients' overdue snapshots"""
+    snapshots = OverdueTaskSnapshot.objects.filter(profile_id__in=profile_ids).select_related('profile__user')
+    messages = []
+    for snapshot in snapshots:
+        user = snapshot.profile.user
+        if not user.email:
+            continue
+        messages.append((
+            "You have overdue relocation tasks",
+            f"Hi {user.first_name},\n\n"
+            f"{snapshot.overdue_tasks} of your relocation tasks are past their due date, "
+            f"the oldest since {snapshot.oldest_due_date:%Y-%m-%d}. "
+            "Please sign in to review them.\n",
+            None,
+            [user.email],
+        ))
+    return messages
+
+
+def consultant_digests(consultant_ids):
+    """send_mass_mail messages, one digest per consultant, for their clients' snapshots"""
+    snapshots = (
+        OverdueTaskSnapshot.objects.filter(consultant_id__in=consultant_ids)
+        .select_related('profile__user', 'consultant__user')
+        .order_by('oldest_due_date')
+    )
+    by_consultant = defaultdict(list)
+    for snapshot in snapshots:
+        by_consultant[snapshot.consultant].append(snapshot)
+
+    messages = []
+    for consultant, client_snapshots in by_consultant.items():
+        if not consultant.user.email:
+            continue
+        lines = "\n".join(
+            f"- {snapshot.profile.user.get_full_name()}: {snapshot.overdue_tasks} overdue, "
+            f"oldest since {snapshot.oldest_due_date:%Y-%m-%d}"
+            for snapshot in client_snapshots
+        )
+        messages.append((
+            f"{len(client_snapshots)} clients have overdue tasks",
+            f"Hi {consultant.user.first_name},\n\nClients with overdue tasks:\n{lines}\n",
+            None,
+            [consultant.user.email],
+        ))
+    return messages
+
+
+def send_reminders(profile_ids=(), consultant_ids=()):
+    """Send the reminder emails for a batch of recipients over one connection"""
+    messages = client_reminders(profile_ids) + consultant_digests(consultant_ids)
+    return send_mass_mail(messages, fail_silently=False) if messages else 0
+
+
+def _batches(ids):
+    ids = list(ids)
+    return [ids[i:i + REMINDER_BATCH_SIZE] for i in range(0, len(ids), REMINDER_BATCH_SIZE)]
+
+
+def queue_overdue_reminders():
+    """Queue send_overdue_reminders tasks for every current snapshot, in batches"""
+    from .tasks import send_overdue_reminders
+
+    profile_ids = OverdueTaskSnapshot.objects.values_list('profile_id', flat=True)
+    consultant_ids = (
+        OverdueTaskSnapshot.objects.filter(consultant__isnull=False)
+        .order_by().values_list('consultant_id', flat=True).distinct()
+    )
+    batches = (
+        [{"profile_ids": batch} for batch in _batches(profile_ids)]
+        + [{"consultant_ids": batch} for batch in _batches(consultant_ids)]
+    )
+    for batch in batches:
+        send_overdue_reminders.delay(**batch)
+    return len(batches)
@@ -0,0 +1,228 @@
+"""
+Relocation progress for client profiles.
+
+This module is the only writer of `Profile.overall_progress` and
+`Profile.current_stage`. Anything that changes a profile's tasks ends up in
+`recalculate_progress()`; the Task signals call it for single saves/deletes.
+
+Each recalculation also refreshes a cached per-profile snapshot of the stage
+breakdown, so dashboards can read progress without touching the task table.
+
+Bulk writes wrap themselves in `deferred_progress()`, which turns the
+per-row recalculations into one batched recalculation at the end.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Profile, Task
+
+COMPLETED_STAGE = "Completed"
+
+# Bounds staleness after bulk queryset updates, which bypass the signals
+SNAPSHOT_TIMEOUT = 60 * 15
+
+# Profile pkids collected by the innermost active deferred_progress() block
+_pending = ContextVar('pending_progress', default=None)
+
+
+def stage_entry(stage_code, stage_name, total, completed):
+    return {
+        "stage": stage_code,
+        "name": stage_name,
+        "progress": round((completed / total) * 100, 2) if total > 0 else 0,
+        "total_tasks": total,
+        "completed_tasks": completed,
+    }
+
+
+def stage_breakdown(tasks):
+    """
+    Per-stage totals for a Task queryset, in one grouped query.
+
+    Returns one entry per Task.RELOCATION_STAGES stage, in stage order,
+    including stages that have no tasks.
+    """
+    rows = (
+        tasks.order_by()
+        .values('stage')
+        .annotate(total=Count('pkid'), completed=Count('pkid', filter=Q(is_completed=True)))
+    )
+    counts = {row['stage']: (row['total'], row['completed']) for row in rows}
+
+    return [
+        stage_entry(stage_code, stage_name, *counts.get(stage_code, (0, 0)))
+        for stage_code, stage_name in Task.RELOCATION_STAGES
+    ]
+
+
+def weighted_progress(stages):
+    """Overall progress (%) weighted by task count, to two decimals"""
+    total_tasks = sum(stage["total_tasks"] for stage in stages)
+    completed_tasks = sum(stage["completed_tasks"] for stage in stages)
+    return round((completed_tasks / total_tasks) * 100, 2) if total_tasks > 0 else 0
+
+
+def summarize(stages):
+    """
+    Overall progress and current stage for a stage breakdown.
+
+    Overall progress is weighted by task count. The current stage is the
+    first stage with unfinished tasks; stages without tasks don't hold a
+    profile back.
+    """
+    total_tasks = sum(stage["total_tasks"] for stage in stages)
+    completed_tasks = sum(stage["completed_tasks"] for stage in stages)
+
+    if total_tasks == 0:
+        return 0, Task.RELOCATION_STAGES[0][1]
+
+    overall_progress = int((completed_tasks / total_tasks) * 100)
+    for stage in stages:
+        if stage["completed_tasks"] < stage["total_tasks"]:
+            return overall_progress, stage["name"]
+    return overall_progress, COMPLETED_STAGE
+
+
+def recalculate_progress(profile):
+    """
+    Recompute and store progress for a profile (instance or pkid).
+
+    Issues one aggregate query and, only when a value changed, one UPDATE.
+    A passed instance is kept in sync. Returns (overall_progress, current_stage).
+    """
+    profile_id = getattr(profile, 'pk', profile)
+    stages = stage_breakdown(Task.objects.filter(profile_id=profile_id))
+    overall_progress, current_stage = summarize(stages)
+    transaction.on_commit(lambda: store_snapshot(profile_id, stages))
+
+    Profile.objects.filter(pk=profile_id).exclude(
+        overall_progress=overall_progress, current_stage=current_stage
+    ).update(
+        overall_progress=overall_progress,
+        current_stage=current_stage,
+        updated_at=timezone.now(),
+    )
+
+    if isinstance(profile, Profile):
+        profile.overall_progress = overall_progress
+        profile.current_stage = current_stage
+    return overall_progress, current_stage
+
+
+def recalculate_progress_many(profile_ids, batch_size=500):
+    """
+    Recompute and store progress for many profiles (pkids) at once.
+
+    One aggregate grouped by profile and stage, one read of the current
+    values and one bulk UPDATE of the profiles whose values changed.
+    """
+    profile_ids = list(set(profile_ids))
+    if not profile_ids:
+        return 0
+
+    counts = {}
+    rows = (
+        Task.objects.filter(profile_id__in=profile_ids)
+        .order_by()
+        .values('profile_id', 'stage')
+        .annotate(total=Count('pkid'), completed=Count('pkid', filter=Q(is_completed=True)))
+    )
+    for row in rows:
+        counts.setdefault(row['profile_id'], {})[row['stage']] = (row['total'], row['completed'])
+
+    now = timezone.now()
+    changed = []
+    snapshots = {}
+    for profile in Profile.objects.filter(pk__in=profile_ids).only('pkid', 'overall_progress', 'current_stage'):
+        profile_counts = counts.get(profile.pk, {})
+        stages = [
+            stage_entry(stage_code, stage_name, *profile_counts.get(stage_code, (0, 0)))
+            for stage_code, stage_name in Task.RELOCATION_STAGES
+        ]
+        overall_progress, current_stage = summarize(stages)
+        snapshots[snapshot_key(profile.pk)] = {"overall_progress": weighted_progress(stages), "stages": stages}
+
+        if (profile.overall_progress, profile.current_stage) != (overall_progress, current_stage):
+            profile.overall_progress = overall_progress
+            profile.current_stage = current_stage
+            profile.updated_at = now
+            changed.append(profile)
+
+    Profile.objects.bulk_update(changed, ['overall_progress', 'current_stage', 'updated_at'], batch_size=batch_size)
+    transaction.on_commit(lambda: cache.set_many(snapshots, SNAPSHOT_TIMEOUT))
+    return len(changed)
+
+
+def snapshot_key(profile_id):
+    return f"profile_progress:{profile_id}"
+
+
+def store_snapshot(profile_id, stages):
+    snapshot = {"overall_progress": weighted_progress(stages), "stages": stages}
+    cache.set(snapshot_key(profile_id), snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def progress_snapshot(profile_id):
+    """
+    Cached {"overall_progress", "stages"} for a profile (pkid).
+
+    Served from the cache when present, otherwise computed with one
+    aggregate query and cached.
+    """
+    snapshot = cache.get(snapshot_key(profile_id))
+    if snapshot is None:
+        snapshot = store_snapshot(profile_id, stage_breakdown(Task.objects.filter(profile_id=profile_id)))
+    return snapshot
+
+
+def schedule_recalculation(profile_id):
+    """Recalculate a profile now, or at the end of the active deferred_progress() block"""
+    pending = _pending.get()
+    if pending is None:
+        recalculate_progress(profile_id)
+    else:
+        pending.add(profile_id)
+
+
+@contextmanager
+def deferred_progress(use_celery=False):
+    """
+    Batch progress recalculation for bulk Task/Profile writes.
+
+    Inside the block the progress signals only collect profile ids; on exit
+    every affected profile is recalculated once, with a single
+    `recalculate_progress_many()` call or, with `use_celery`, a Celery task
+    enqueued after commit. An error inside a transaction skips the
+    recalculation. Nested blocks join the outermost one. Works as a
+    decorator too:
+
+        @deferred_progress()
+        def import_clients(rows): ...
+    """
+    if _pending.get() is not None:
+        yield
+        return
+
+    token = _pending.set(set())
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        profile_ids = _pending.get()
+        _pending.reset(token)
+        # After an error inside a transaction the writes roll back with it
+        if profile_ids and not (failed and transaction.get_connection().in_atomic_block):
+            if use_celery:
+                from .tasks import recalculate_profiles_progress
+                transaction.on_commit(lambda: recalculate_profiles_progress.delay(list(profile_ids)))
+            else:
+                recalculate_progress_many(profile_ids)
@@ -0,0 +1,81 @@
+"""
+Default task provisioning for client profiles.
+
+Tasks come from the active TaskTemplate rows for the profile's relocation
+type (plus the templates that apply to every type). They are inserted with
+bulk_create, so no per-task signals run, and progress is recalculated once
+for the whole batch.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task, TaskTemplate
+from .progress import recalculate_progress_many
+
+
+def templates_by_type(relocation_types):
+    """Active templates for each relocation type (None included), in display order"""
+    relocation_types = set(relocation_types)
+    templates = TaskTemplate.objects.filter(is_active=True).filter(
+        Q(relocation_type__isnull=True) | Q(relocation_type__in=relocation_types - {None})
+    )
+
+    shared = []
+    specific = {}
+    for template in templates:
+        if template.relocation_type is None:
+            shared.append(template)
+        else:
+            specific.setdefault(template.relocation_type, []).append(template)
+
+    return {
+        relocation_type: shared + specific.get(relocation_type, [])
+        for relocation_type in relocation_types
+    }
+
+
+def build_tasks(profile, templates, today=None):
+    today = today or timezone.now().date()
+    return [
+        Task(
+            profile=profile,
+            stage=template.stage,
+            title=template.title,
+            description=template.description,
+            order=template.order or Task.default_order(template.stage),
+            due_date=today + timedelta(days=template.due_after_days) if template.due_after_days is not None else None,
+        )
+        for template in templates
+    ]
+
+
+@transaction.atomic
+def provision_default_tasks(profiles, skip_existing=True, batch_size=1000):
+    """
+    Create the default tasks for `profiles` and recalculate their progress.
+
+    With `skip_existing`, profiles that already have tasks are left alone, so
+    running this again over the same clients is safe. Returns the number of
+    tasks created.
+    """
+    profiles = list(profiles)
+    if skip_existing:
+        with_tasks = set(
+            Task.objects.filter(profile__in=profiles).order_by().values_list('profile_id', flat=True).distinct()
+        )
+        profiles = [profile for profile in profiles if profile.pk not in with_tasks]
+    if not profiles:
+        return 0
+
+    templates = templates_by_type(profile.relocation_type for profile in profiles)
+    today = timezone.now().date()
+    tasks = []
+    for profile in profiles:
+        tasks.extend(build_tasks(profile, templates[profile.relocation_type], today))
+
+    Task.objects.bulk_create(tasks, batch_size=batch_size)
+    recalculate_progress_many(profile.pk for profile in profiles)
+    return len(tasks)
@@ -0,0 +1,87 @@
+"""
+Bulk document review.
+
+A consultant sends many (document id, status) pairs in one request. Ownership
+is checked with one query, all changes are written with one bulk_update in a
+transaction, and each affected client gets one notification for the whole
+batch once it commits. Notifications go to the client's chat-list group,
+which every chat socket of theirs joins (ChatListMixin.documents_reviewed).
+"""
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Document
+
+MAX_BULK_REVIEW = 500
+
+
+class UnknownDocuments(Exception):
+    """Some documents don't exist or aren't assigned to the consultant."""
+
+    def __init__(self, ids):
+        super().__init__("Documents not found for this consultant.")
+        self.ids = ids
+
+
+async def _notify_clients(channel_layer, batches, reviewer):
+    for user_id, documents in batches.items():
+        await channel_layer.group_send(f'user_{user_id}_chatlist', {
+            'type': 'documents_reviewed',
+            'reviewed_by': reviewer,
+            'documents': documents,
+        })
+
+
+def notify_reviews(documents, reviewer):
+    """One notification per client for a batch of reviewed documents"""
+    batches = defaultdict(list)
+    for document in documents:
+        batches[str(document.profile.user.id)].append({
+            'id': str(document.id),
+            'document_type': document.document_type,
+            'status': document.status,
+        })
+    channel_layer = get_channel_layer()
+    if batches and channel_layer is not None:
+        async_to_sync(_notify_clients)(channel_layer, batches, reviewer)
+
+
+def review_documents(consultant, statuses):
+    """
+    Set the status of many documents, as reviewed by `consultant`.
+
+    `statuses` maps document id (UUID) to status. Either every document
+    belongs to one of the consultant's clients and all are updated, or
+    UnknownDocuments is raised and none are. Returns the number of documents
+    whose status or reviewer changed.
+    """
+    with transaction.atomic():
+        documents = list(
+            Document.objects.select_for_update(of=('self',))
+            .filter(id__in=statuses.keys(), profile__relocation_consultant=consultant)
+            .select_related('profile__user')
+            .only('pkid', 'id', 'document_type', 'status', 'reviewed_by', 'updated_at', 'profile__user__id')
+        )
+        if len(documents) != len(statuses):
+            found = {document.id for document in documents}
+            raise UnknownDocuments([str(document_id) for document_id in statuses if document_id not in found])
+
+        now = timezone.now()
+        changed = []
+        for document in documents:
+            new_status = statuses[document.id]
+            if document.status != new_status or document.reviewed_by_id != consultant.pk:
+                document.status = new_status
+                document.reviewed_by_id = consultant.pk
+                document.updated_at = now
+                changed.append(document)
+
+        Document.objects.bulk_update(changed, ['status', 'reviewed_by', 'updated_at'], batch_size=MAX_BULK_REVIEW)
+
+        reviewer = consultant.user.get_full_name()
+        transaction.on_commit(lambda: notify_reviews(changed, reviewer))
+    return len(changed)
@@ -0,0 +1,102 @@
+"""
+Search for the profiles domain.
+
+Tasks and documents are matched with Postgres full-text search over their own
+text plus trigram word similarity over their short fields and the client's
+name. Every predicate is served by a GIN index: the tsvector and trigram
+indexes on the task/document tables and the name trigram indexes on the user
+table (profiles migration 0012, users migration 0002). Results are ranked
+by text rank plus the best trigram similarity.
+
+`RankedSearchFilter` plugs this into the DRF `SearchFilter` slot; plain
+APIViews call `ranked_search()` / `matching()` directly. On other databases
+everything falls back to `icontains`.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from rest_framework.filters import SearchFilter
+
+SEARCH_CONFIG = 'english'
+
+CLIENT_NAME_FIELDS = ('profile__user__first_name', 'profile__user__last_name')
+
+# Per model: fields of the full-text vector, fields matched by trigram similarity
+SEARCH_FIELDS = {
+    'profiles.Task': {
+        'vector': ('title', 'description'),
+        'trigram': ('title',) + CLIENT_NAME_FIELDS,
+    },
+    'profiles.Document': {
+        'vector': ('document_type',),
+        'trigram': ('document_type',) + CLIENT_NAME_FIELDS,
+    },
+}
+
+
+def search_vector(*fields):
+    """The tsvector expression; the GIN expression indexes are built on exactly this"""
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def is_searchable(queryset):
+    """Whether `queryset` can use the indexed search (registered model on Postgres)"""
+    return (
+        queryset.model._meta.label in SEARCH_FIELDS
+        and connections[queryset.db].vendor == 'postgresql'
+    )
+
+
+def _search_query(term):
+    return SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def matching(queryset, term):
+    """Rows of `queryset` matching `term`, in the queryset's own order"""
+    fields = SEARCH_FIELDS[queryset.model._meta.label]
+
+    if not is_searchable(queryset):
+        condition = Q()
+        for field in dict.fromkeys(fields['vector'] + fields['trigram']):
+            condition |= Q(**{f"{field}__icontains": term})
+        return queryset.filter(condition)
+
+    condition = Q(search_document=_search_query(term))
+    for field in fields['trigram']:
+        condition |= Q(**{f"{field}__trigram_word_similar": term})
+    return queryset.alias(search_document=search_vector(*fields['vector'])).filter(condition)
+
+
+def ranked_search(queryset, term):
+    """
+    Rows of `queryset` matching `term`, most relevant first.
+
+    The rank is exposed as `search_rank`. Outside Postgres the rows are only
+    filtered and keep the queryset's order.
+    """
+    results = matching(queryset, term)
+    if not is_searchable(queryset):
+        return results
+
+    fields = SEARCH_FIELDS[queryset.model._meta.label]
+    similarity = Greatest(*(TrigramWordSimilarity(term, field) for field in fields['trigram']))
+    return results.annotate(
+        search_rank=SearchRank(F('search_document'), _search_query(term)) + similarity
+    ).order_by('-search_rank', '-created_at', '-pkid')
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by `ranked_search()` for the models in SEARCH_FIELDS.
+
+    Results come back by relevance unless the request also asks for an
+    ordering. Other models, and other databases, get SearchFilter's
+    `icontains` over the view's `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not is_searchable(queryset):
+            return super().filter_queryset(request, queryset, view)
+        return ranked_search(queryset, ' '.join(terms))
@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from apps.common.serializers import SparseFieldsetMixin
 from .models import Profile, Consultant, Document, Task
+from .bulk_tasks import MAX_BULK_TASKS
+from .reviews import MAX_BULK_REVIEW
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,7 +12,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
 
-class ConsultantSerializer(serializers.ModelSerializer):
+class ConsultantSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     full_name = serializers.CharField(source = 'user.get_full_name', read_only=True)
     email = serializers.EmailField(source = 'user.email', read_only=True)
@@ -51,7 +54,7 @@ class ConsultantCreateSerializer(serializers.ModelSerializer):
 
         return Consultant.objects.create(**validated_data)
     
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     document_name = serializers.CharField(source='document_type', read_only=True)
     client_name = serializers.CharField(source='profile.user.get_full_name', read_only=True)
     reviewed_by_name = serializers.CharField(source='reviewed_by.user.get_full_name', read_only=True)
@@ -60,10 +63,36 @@ class DocumentSerializer(serializers.ModelSerializer):
         model = Document
         fields = [
             'id', 'profile', 'document_type', 'document_name', 'document_file',
-            'status', 'reviewed_by', 'reviewed_by_name', 'client_name', 'created_at', 'updated_at'
+            'status', 'reviewed_by', 'reviewed_by_name', 'client_name', 'created_at', 'updated_at',
+            'checksum', 'file_size', 'validation_status', 'validation_error'
         ]
-        read_only_fields = ['created_at', 'updated_at', "profile"]
-        
+        # Files only arrive through DocumentViewset.upload (store_document)
+        read_only_fields = [
+            'created_at', 'updated_at', "profile", 'document_file',
+            'checksum', 'file_size', 'validation_status', 'validation_error'
+        ]
+
+
+class DocumentUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ['document_type', 'document_file']
+
+
+class DocumentReviewSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=Document.STATUS_CHOICES)
+
+
+class BulkDocumentReviewSerializer(serializers.Serializer):
+    reviews = DocumentReviewSerializer(many=True, allow_empty=False, max_length=MAX_BULK_REVIEW)
+
+    def validate_reviews(self, value):
+        ids = [review['id'] for review in value]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Each document can only appear once.")
+        return value
+
 
 class TaskCreateSerializer(serializers.ModelSerializer):
     profile = serializers.UUIDField(write_only=True)
@@ -73,7 +102,38 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "description", "stage", "due_date", "profile"]
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class BulkTaskCreateSerializer(serializers.Serializer):
+    tasks = TaskCreateSerializer(many=True, allow_empty=False, max_length=MAX_BULK_TASKS)
+
+
+class BulkTaskIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=MAX_BULK_TASKS)
+
+
+class BulkTaskCompleteSerializer(BulkTaskIdsSerializer):
+    is_completed = serializers.BooleanField(default=True)
+
+
+class BulkTaskMoveSerializer(BulkTaskIdsSerializer):
+    stage = serializers.ChoiceField(choices=Task.RELOCATION_STAGES)
+
+
+class TaskOrderSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    order = serializers.IntegerField(min_value=0)
+
+
+class BulkTaskReorderSerializer(serializers.Serializer):
+    tasks = TaskOrderSerializer(many=True, allow_empty=False, max_length=MAX_BULK_TASKS)
+
+    def validate_tasks(self, value):
+        ids = [task['id'] for task in value]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Each task can only appear once.")
+        return value
+
+
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='profile.user.get_full_name', read_only=True)
     due_date_formatted = serializers.DateField(source='due_date', format='%Y-%m-%d', read_only=True)
     stage_display = serializers.CharField(source='get_stage_display', read_only=True)
@@ -97,7 +157,7 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', "profile"]
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     consultant = ConsultantSerializer(read_only=True)
     full_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -121,7 +181,25 @@ class ProfileSerializer(serializers.ModelSerializer):
             'consultant_name', 'consultant_employee_id', 'overall_progress',
             'current_stage', 'documents', 'tasks', 'created_at', 'updated_at', "consultant", 'is_consultant'
         ]
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at', 'overall_progress', 'current_stage']
+        # Left out of list responses unless requested with ?expand=
+        expandable_fields = ['documents', 'tasks', 'consultant', 'consultant_details']
+
+class ConsultantClientSerializer(serializers.ModelSerializer):
+    """Slim client row for the consultant dashboard; counts come from annotations."""
+    full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    email = serializers.CharField(source='user.email', read_only=True)
+    task_count = serializers.IntegerField(read_only=True)
+    completed_task_count = serializers.IntegerField(read_only=True)
+    document_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = [
+            'id', 'full_name', 'email', 'profile_photo', 'phone_number', 'relocation_type',
+            'current_city', 'destination_city', 'overall_progress', 'current_stage',
+            'task_count', 'completed_task_count', 'document_count', 'updated_at'
+        ]
 
 class ProfileCreateSerializer(serializers.ModelSerializer):
     user_id = serializers.PrimaryKeyRelatedField(
@@ -166,6 +244,9 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
             'preferred_contact_method', 'notification_preferences',
             'relocation_consultant', 'overall_progress', 'current_stage'
         ]
+        # Maintained by apps.profiles.progress from the profile's tasks, and by
+        # apps.profiles.assignment (assign_consultant action) respectively
+        read_only_fields = ['overall_progress', 'current_stage', 'relocation_consultant']
 
 class ConsultantUpdateSerialzier(serializers.ModelSerializer):
     class Meta:
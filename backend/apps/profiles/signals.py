@@ -2,7 +2,14 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import Profile, Consultant, Task
-from django.db.models.signals import m2m_changed, pre_save
+from .assignment import release_slots
+from .metrics import PROFILE_SYNC
+from .progress import schedule_recalculation
+from .provisioning import provision_default_tasks
+from django.db.models.signals import post_delete, pre_delete
+
+# Task fields that can change a profile's progress
+PROGRESS_FIELDS = {'is_completed', 'stage', 'profile'}
 
 User = get_user_model() 
 
@@ -12,8 +19,19 @@ def create_user_profile(sender, instance, created, **kwargs):
         Profile.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+def count_skipped_profile_save(sender, instance, created, **kwargs):
+    """
+    The profile copies no User columns, so a User save (logins, password
+    changes, ...) never needs a profile write. Counted to show the writes the
+    old unconditional `instance.profile.save()` used to cost.
+    """
+    if not created:
+        PROFILE_SYNC.labels(source="user", result="skipped").inc()
+
+def sync_profile_consultant_flag(user_id, is_consultant):
+    """Write Profile.is_consultant only when it differs"""
+    written = Profile.objects.filter(user_id=user_id).exclude(is_consultant=is_consultant).update(is_consultant=is_consultant)
+    PROFILE_SYNC.labels(source="consultant", result="written" if written else "skipped").inc()
 
 @receiver(post_save, sender=Consultant)
 def update_consultant_user_permissions(sender, instance, created, **kwargs):
@@ -24,63 +42,40 @@ def update_consultant_user_permissions(sender, instance, created, **kwargs):
     if created:
         user = instance.user
         user.is_staff = True
-        user.save()
+        user.save(update_fields=['is_staff'])
+    sync_profile_consultant_flag(instance.user_id, True)
+
+@receiver(post_delete, sender=Consultant)
+def clear_profile_consultant_flag(sender, instance, **kwargs):
+    sync_profile_consultant_flag(instance.user_id, False)
 
 @receiver(post_save, sender=Task)
-def update_profile_progress_on_task_change(sender, instance, **kwargs):
+def update_profile_progress_on_task_change(sender, instance, update_fields=None, **kwargs):
     """
     Update profile progress when tasks are completed/added.
     """
-    profile = instance.profile
-    total_tasks = profile.tasks.count()
-    completed_tasks = profile.tasks.filter(is_completed=True).count()
-    
-    if total_tasks > 0:
-        profile.overall_progress = int((completed_tasks / total_tasks) * 100)
-        profile.save()
+    if update_fields is not None and not PROGRESS_FIELDS.intersection(update_fields):
+        return
+    schedule_recalculation(instance.profile_id)
 
-@receiver(pre_save, sender=Profile)
-def update_progress_based_on_tasks(sender, instance, **kwargs):
+@receiver(post_delete, sender=Task)
+def update_profile_progress_on_task_delete(sender, instance, **kwargs):
     """
-    Auto calculate progress based on completed tasks.
+    Update profile progress when tasks are removed.
     """
-    if instance.pk: #Only for existing profiles
-        total_tasks = instance.tasks.count()
-        completed_tasks = instance.tasks.filter(is_completed=True).count()
-        
-        if total_tasks > 0:
-            instance.overall_progress = int((completed_tasks / total_tasks) * 100)
+    schedule_recalculation(instance.profile_id)
+
+@receiver(pre_delete, sender=Profile)
+def release_consultant_slot(sender, instance, **kwargs):
+    """
+    Free the consultant's slot when an assigned client profile is deleted.
+    Runs inside the delete's transaction; the assignment is re-read because
+    bulk assignment doesn't update loaded instances.
+    """
+    consultant_id = Profile.objects.filter(pk=instance.pk).values_list('relocation_consultant_id', flat=True).first()
+    if consultant_id:
+        release_slots(consultant_id)
+
 def create_default_tasks(profile):
-    default_tasks = [
-        # Initial Consultation
-        {'stage': 'initial_consultation', 'title': 'Complete initial consultation form', 'order': 1},
-        {'stage': 'initial_consultation', 'title': 'Discuss relocation goals and timeline', 'order': 2},
-        
-        # Document Collection
-        {'stage': 'document_collection', 'title': 'Submit passport copies', 'order': 1},
-        {'stage': 'document_collection', 'title': 'Provide proof of income', 'order': 2},
-        {'stage': 'document_collection', 'title': 'Submit educational certificates', 'order': 3},
-        
-        # Visa Processing
-        {'stage': 'visa_processing', 'title': 'Complete visa application', 'order': 1},
-        {'stage': 'visa_processing', 'title': 'Schedule visa interview', 'order': 2},
-        {'stage': 'visa_processing', 'title': 'Submit medical examination results', 'order': 3},
-        
-        # Housing Search
-        {'stage': 'housing_search', 'title': 'Define housing preferences', 'order': 1},
-        {'stage': 'housing_search', 'title': 'Research neighborhoods', 'order': 2},
-        {'stage': 'housing_search', 'title': 'Schedule property viewings', 'order': 3},
-        
-        # School Enrollment
-        {'stage': 'school_enrollment', 'title': 'Research schools in area', 'order': 1},
-        {'stage': 'school_enrollment', 'title': 'Submit school applications', 'order': 2},
-        {'stage': 'school_enrollment', 'title': 'Complete enrollment paperwork', 'order': 3},
-        
-        # Final Relocation
-        {'stage': 'final_relocation', 'title': 'Book moving services', 'order': 1},
-        {'stage': 'final_relocation', 'title': 'Arrange temporary accommodation', 'order': 2},
-        {'stage': 'final_relocation', 'title': 'Confirm travel arrangements', 'order': 3},
-    ]
-    
-    for task_data in default_tasks:
-        Task.objects.create(profile=profile, **task_data)
\ No newline at end of file
+    """Create the default task set for a single profile."""
+    return provision_default_tasks([profile])
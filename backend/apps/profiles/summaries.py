@@ -0,0 +1,174 @@
+"""
+Precomputed per-consultant rollups for the dashboards.
+
+The admin document overview reads ConsultantDocumentSummary and the
+consultant dashboard reads ConsultantStats, one query each however many
+consultants or clients there are. Celery beat rebuilds both from a fixed
+number of grouped queries.
+"""
+from collections import defaultdict
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Consultant, ConsultantDocumentSummary, ConsultantStats, Document, Profile, Task
+
+PROGRESS_BUCKETS = {
+    '0-25%': (0, 25),
+    '26-50%': (26, 50),
+    '51-75%': (51, 75),
+    '76-100%': (76, 100),
+}
+HIGH_PROGRESS = 75
+
+
+def status_pivot(documents):
+    """{status: count} for a Document queryset, in one grouped query"""
+    rows = documents.order_by().values('status').annotate(count=models.Count('pkid'))
+    return {row['status']: row['count'] for row in rows}
+
+
+def rebuild_document_summaries():
+    rows = (
+        Document.objects.filter(reviewed_by__isnull=False)
+        .order_by()
+        .values('reviewed_by', 'status')
+        .annotate(count=models.Count('pkid'))
+    )
+    counts = defaultdict(dict)
+    for row in rows:
+        counts[row['reviewed_by']][row['status']] = row['count']
+
+    now = timezone.now()
+    summaries = [
+        ConsultantDocumentSummary(
+            consultant_id=consultant_id,
+            status_counts=counts.get(consultant_id, {}),
+            total_reviewed=sum(counts.get(consultant_id, {}).values()),
+            refreshed_at=now,
+        )
+        for consultant_id in Consultant.objects.values_list('pkid', flat=True)
+    ]
+    ConsultantDocumentSummary.objects.bulk_create(
+        summaries,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['consultant'],
+        update_fields=['status_counts', 'total_reviewed', 'refreshed_at'],
+    )
+    return len(summaries)
+
+
+def consultant_overview():
+    """The admin consultant overview, read from the summary table"""
+    summaries = ConsultantDocumentSummary.objects.select_related('consultant__user').order_by('consultant__employee_id')
+    overview = []
+    for summary in summaries:
+        consultant = summary.consultant
+        document_counts = [
+            {"status": status, "count": count} for status, count in sorted(summary.status_counts.items())
+        ]
+        overview.append({
+            "consultant_id": consultant.id,
+            "consultant_name": consultant.user.get_full_name(),
+            "document_counts": document_counts,
+            "employee_id": consultant.employee_id,
+            "specialization": consultant.specialization,
+            "status_breakdown": document_counts,
+            "total_reviewed": summary.total_reviewed,
+            "refreshed_at": summary.refreshed_at,
+        })
+    return overview
+
+
+def rebuild_consultant_stats(consultant_ids=None):
+    """
+    Rebuild ConsultantStats for the given consultants (pkids), or all of them.
+
+    Five grouped queries and one bulk upsert, independent of the number of
+    consultants, clients, tasks or documents.
+    """
+    consultants = Consultant.objects.all()
+    clients = Profile.objects.filter(relocation_consultant__isnull=False)
+    if consultant_ids is not None:
+        consultants = consultants.filter(pkid__in=consultant_ids)
+        clients = clients.filter(relocation_consultant__in=consultant_ids)
+    clients = clients.order_by()
+
+    bucket_counts = {
+        label: models.Count('pkid', filter=Q(overall_progress__range=bounds))
+        for label, bounds in PROGRESS_BUCKETS.items()
+    }
+    progress_rows = clients.values('relocation_consultant').annotate(
+        total=models.Count('pkid'),
+        average=models.Avg('overall_progress'),
+        high=models.Count('pkid', filter=Q(overall_progress__gte=HIGH_PROGRESS)),
+        **{f"bucket_{i}": count for i, count in enumerate(bucket_counts.values())},
+    )
+
+    stats = defaultdict(lambda: {
+        "relocation_type_counts": {}, "document_status_counts": {}, "total_tasks": 0, "completed_tasks": 0,
+    })
+    for row in progress_rows:
+        entry = stats[row['relocation_consultant']]
+        entry["total_clients"] = row['total']
+        entry["average_progress"] = round(row['average'] or 0, 2)
+        entry["high_progress_clients"] = row['high']
+        entry["progress_distribution"] = {
+            label: row[f"bucket_{i}"] for i, label in enumerate(bucket_counts)
+        }
+
+    for row in clients.values('relocation_consultant', 'relocation_type').annotate(count=models.Count('pkid')):
+        stats[row['relocation_consultant']]["relocation_type_counts"][row['relocation_type'] or ""] = row['count']
+
+    documents = Document.objects.filter(profile__in=clients.values('pkid')).order_by()
+    for row in documents.values('profile__relocation_consultant', 'status').annotate(count=models.Count('pkid')):
+        stats[row['profile__relocation_consultant']]["document_status_counts"][row['status']] = row['count']
+
+    tasks = Task.objects.filter(profile__in=clients.values('pkid')).order_by()
+    task_rows = tasks.values('profile__relocation_consultant').annotate(
+        total=models.Count('pkid'), completed=models.Count('pkid', filter=Q(is_completed=True))
+    )
+    for row in task_rows:
+        entry = stats[row['profile__relocation_consultant']]
+        entry["total_tasks"] = row['total']
+        entry["completed_tasks"] = row['completed']
+
+    now = timezone.now()
+    empty_distribution = dict.fromkeys(PROGRESS_BUCKETS, 0)
+    rollups = []
+    for consultant_id in consultants.values_list('pkid', flat=True):
+        entry = stats.get(consultant_id, {})
+        rollups.append(ConsultantStats(
+            consultant_id=consultant_id,
+            total_clients=entry.get("total_clients", 0),
+            average_progress=entry.get("average_progress", 0),
+            high_progress_clients=entry.get("high_progress_clients", 0),
+            progress_distribution=entry.get("progress_distribution", empty_distribution),
+            relocation_type_counts=entry.get("relocation_type_counts", {}),
+            document_status_counts=entry.get("document_status_counts", {}),
+            total_tasks=entry.get("total_tasks", 0),
+            completed_tasks=entry.get("completed_tasks", 0),
+            refreshed_at=now,
+        ))
+    ConsultantStats.objects.bulk_create(
+        rollups,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['consultant'],
+        update_fields=[
+            'total_clients', 'average_progress', 'high_progress_clients', 'progress_distribution',
+            'relocation_type_counts', 'document_status_counts', 'total_tasks', 'completed_tasks', 'refreshed_at',
+        ],
+    )
+    return len(rollups)
+
+
+def consultant_stats(consultant):
+    """The consultant's ConsultantStats, built on first use"""
+    try:
+        return ConsultantStats.objects.get(consultant=consultant)
+    except ConsultantStats.DoesNotExist:
+        rebuild_consultant_stats([consultant.pk])
+        return ConsultantStats.objects.get(consultant=consultant)
@@ -0,0 +1,68 @@
+import logging
+
+from celery import shared_task
+
+from .documents import validation_error
+from .models import Document
+from .overdue import queue_overdue_reminders, rebuild_overdue_snapshots, send_reminders
+from .progress import recalculate_progress_many
+from .summaries import rebuild_consultant_stats, rebuild_document_summaries
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def recalculate_profiles_progress(profile_ids):
+    """Recalculate progress for profiles collected by a deferred_progress() block"""
+    changed = recalculate_progress_many(profile_ids)
+    logger.info(f"Recalculated progress for {len(profile_ids)} profiles, {changed} changed")
+    return changed
+
+
+@shared_task
+def refresh_document_summaries():
+    """Rebuild ConsultantDocumentSummary from one grouped query over reviewed documents"""
+    refreshed = rebuild_document_summaries()
+    logger.info(f"Refreshed document summaries for {refreshed} consultants")
+    return refreshed
+
+
+@shared_task
+def refresh_consultant_stats():
+    """Rebuild the ConsultantStats dashboard rollups"""
+    refreshed = rebuild_consultant_stats()
+    logger.info(f"Refreshed dashboard stats for {refreshed} consultants")
+    return refreshed
+
+
+@shared_task
+def snapshot_overdue_tasks():
+    """Nightly: rebuild OverdueTaskSnapshot, then queue the reminder emails from it"""
+    profiles = rebuild_overdue_snapshots()
+    batches = queue_overdue_reminders()
+    logger.info(f"{profiles} profiles have overdue tasks, queued {batches} reminder batches")
+    return profiles
+
+
+@shared_task
+def send_overdue_reminders(profile_ids=(), consultant_ids=()):
+    """Send one batch of overdue reminders: client emails and consultant digests"""
+    return send_reminders(profile_ids, consultant_ids)
+
+
+@shared_task
+def validate_document(document_id):
+    """Check an uploaded document's format and size; a failed file rejects the document"""
+    document = Document.objects.filter(pk=document_id).first()
+    if document is None:
+        return None
+
+    error = validation_error(document)
+    if error:
+        Document.objects.filter(pk=document_id).update(
+            validation_status="failed", validation_error=error, status="rejected"
+        )
+        logger.warning(f"Document {document.id} failed validation: {error}")
+    else:
+        Document.objects.filter(pk=document_id).update(validation_status="passed", validation_error="")
+    return error is None
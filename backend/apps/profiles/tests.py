@@ -1,3 +1,76 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .assignment import ConsultantUnavailable, assign_consultant, release_slots, reserve_slots
+from .factories import ConsultantFactory, ProfileFactory
+
+
+class ConsultantSlotTests(TestCase):
+    def setUp(self):
+        self.consultant = ConsultantFactory(max_clients=2)
+
+    def client_count(self, consultant=None):
+        consultant = consultant or self.consultant
+        consultant.refresh_from_db(fields=["current_client_count"])
+        return consultant.current_client_count
+
+    def test_reserve_refuses_at_capacity(self):
+        self.assertTrue(reserve_slots(self.consultant.pk))
+        self.assertTrue(reserve_slots(self.consultant.pk))
+        self.assertFalse(reserve_slots(self.consultant.pk))
+        self.assertEqual(self.client_count(), 2)
+
+    def test_reserve_refuses_a_block_that_does_not_fit(self):
+        self.assertTrue(reserve_slots(self.consultant.pk))
+        self.assertFalse(reserve_slots(self.consultant.pk, count=2))
+        self.assertEqual(self.client_count(), 1)
+
+    def test_reserve_refuses_inactive_consultant(self):
+        self.consultant.is_active = False
+        self.consultant.save(update_fields=["is_active"])
+        self.assertFalse(reserve_slots(self.consultant.pk))
+        self.assertEqual(self.client_count(), 0)
+
+    def test_release_never_goes_below_zero(self):
+        reserve_slots(self.consultant.pk)
+        release_slots(self.consultant.pk, count=3)
+        self.assertEqual(self.client_count(), 0)
+
+
+class AssignConsultantTests(TestCase):
+    def setUp(self):
+        self.first = ConsultantFactory(max_clients=1)
+        self.second = ConsultantFactory(max_clients=1)
+        self.profile = ProfileFactory()
+
+    def client_count(self, consultant):
+        consultant.refresh_from_db(fields=["current_client_count"])
+        return consultant.current_client_count
+
+    def test_assign_takes_a_slot(self):
+        self.assertTrue(assign_consultant(self.profile, self.first))
+        self.assertEqual(self.client_count(self.first), 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.relocation_consultant, self.first)
+
+    def test_reassigning_the_same_consultant_changes_nothing(self):
+        assign_consultant(self.profile, self.first)
+        self.assertFalse(assign_consultant(self.profile, self.first))
+        self.assertEqual(self.client_count(self.first), 1)
+
+    def test_reassign_releases_previous_slot(self):
+        assign_consultant(self.profile, self.first)
+        assign_consultant(self.profile, self.second)
+        self.assertEqual(self.client_count(self.first), 0)
+        self.assertEqual(self.client_count(self.second), 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.relocation_consultant, self.second)
+
+    def test_full_consultant_keeps_previous_assignment(self):
+        assign_consultant(self.profile, self.first)
+        assign_consultant(ProfileFactory(), self.second)
+        with self.assertRaises(ConsultantUnavailable):
+            assign_consultant(self.profile, self.second)
+        self.assertEqual(self.client_count(self.first), 1)
+        self.assertEqual(self.client_count(self.second), 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.relocation_consultant, self.first)
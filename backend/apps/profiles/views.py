@@ -3,29 +3,48 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from .models import Profile, Consultant, Document, Task
+from rest_framework.settings import api_settings
+from apps.common.mixins import SparseFieldsetViewMixin
+from apps.common.pagination import MAX_PAGE_SIZE, CountFreePagination, StandardPagination, TimeCursorPagination
+from .models import Profile, Consultant, Document, Task, OverdueTaskSnapshot
+from .assignment import ConsultantUnavailable, assign_consultant, auto_assign
+from .documents import store_document
+from .bulk_tasks import UnknownObjects, create_tasks, move_tasks, reorder_tasks, set_completed
+from .reviews import UnknownDocuments, review_documents
+from .overdue import overdue, overdue_summary
+from .progress import deferred_progress, progress_snapshot, stage_entry
+from .search import RankedSearchFilter, matching, ranked_search
+from .summaries import consultant_overview, consultant_stats, status_pivot
 from .serializers import (
     ProfileSerializer,
     ConsultantSerializer,
     ConsultantCreateSerializer,
     DocumentSerializer,
+    DocumentUploadSerializer,
+    BulkDocumentReviewSerializer,
     TaskSerializer,
     ProfileCreateSerializer,
     ProfileUpdateSerializer,
     ConsultantUpdateSerialzier,
-    TaskCreateSerializer
+    TaskCreateSerializer,
+    BulkTaskCreateSerializer,
+    BulkTaskCompleteSerializer,
+    BulkTaskMoveSerializer,
+    BulkTaskReorderSerializer,
+    ConsultantClientSerializer
 )
 from django.db import models
+from django.shortcuts import redirect
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
 from rest_framework.views import APIView
 
-from django.core.paginator import Paginator
 from datetime import datetime
-from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
 
 class ConsultantViewset(viewsets.ModelViewSet):
-    queryset = Consultant.objects.select_related('user').all()
+    # Paginated: pkid breaks created_at ties so pages never overlap
+    queryset = Consultant.objects.select_related('user').order_by('-created_at', 'pkid')
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["specialization", "country", "availability_status", "is_active"]
@@ -57,12 +76,17 @@ class ConsultantViewset(viewsets.ModelViewSet):
     def available_consultants(self, request):
         available_consultants = self.get_queryset().filter( 
             current_client_count__lt=models.F('max_clients')
-        )
-        serializer = self.get_serializer(available_consultants, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        ).order_by('current_client_count', 'employee_id')
+        page = self.paginate_queryset(available_consultants)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
-class ProfileViewset(viewsets.ModelViewSet):
-    queryset = Profile.objects.select_related('user', "relocation_consultant__user").prefetch_related("documents", "tasks").all()
+class ProfileViewset(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Profile.objects.select_related('user', "relocation_consultant__user").order_by('-created_at', 'pkid')
+    expandable_prefetches = {
+        "documents": ["documents__reviewed_by__user"],
+        "tasks": ["tasks"],
+    }
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["relocation_type","current_country", "destination_country", "has_children"]
@@ -83,17 +107,19 @@ class ProfileViewset(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
+        # Base queryset with only the requested relations prefetched
+        queryset = super().get_queryset()
 
         if hasattr(user, "consultant_profile"):
-            return self.queryset.filter(relocation_consultant=user.consultant_profile)
+            return queryset.filter(relocation_consultant=user.consultant_profile)
         
         # if user is a client, only show their own profile
         elif hasattr(user, "profile"):
-            return self.queryset.filter(user=user)
+            return queryset.filter(user=user)
         
         # For other users (e.g., admins), return all profiles
         elif user.is_staff:
-            return self.queryset
+            return queryset
         return Profile.objects.none()
     
     def retrieve(self, request, *args, **kwargs):
@@ -104,6 +130,11 @@ class ProfileViewset(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+
+    def perform_destroy(self, instance):
+        # One recalculation instead of one per cascaded task
+        with deferred_progress():
+            instance.delete()
     
     @action(detail=True, methods=['post'])
     def assign_consultant(self, request, id=None):
@@ -124,30 +155,35 @@ class ProfileViewset(viewsets.ModelViewSet):
         except Consultant.DoesNotExist:
             return Response({"error": "Consultant not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if consultant.current_client_count >= consultant.max_clients:
-            return Response({"error": "Consultant has reached maximum client capacity."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            assign_consultant(profile, consultant)
+        except ConsultantUnavailable as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        profile.relocation_consultant = consultant
-        profile.save()
+        return Response({"status": "Consultant assigned successfully."}, status=status.HTTP_200_OK)
 
-        consultant.current_client_count = consultant.assigned_clients.count()
-        consultant.save()
+    @action(detail=False, methods=['post'])
+    def auto_assign(self, request):
+        """Assign unassigned clients to the least-loaded matching consultants."""
+        # Consultants are staff too (see signals.py); only admins may reassign everyone
+        user = request.user
+        if not (user.is_superuser or (user.is_staff and not user.is_consultant)):
+            return Response({"error": "Only admins can auto-assign consultants."}, status=status.HTTP_403_FORBIDDEN)
 
-        return Response({"status": "Consultant assigned successfully."}, status=status.HTTP_200_OK)
+        result = auto_assign()
+        return Response(result, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"])   
-    def update_progress(self, request, pk=None):
+    def update_progress(self, request, id=None):
+        """Recalculate progress from the profile's tasks."""
         profile = self.get_object()
-        progress = request.data.get("progress")
-        current_stage = request.data.get("current_stage")
-
-        if progress is not None:
-            profile.overall_progress = progress
-        if current_stage:
-            profile.current_stage = current_stage
+        overall_progress, current_stage = profile.update_progress()
 
-        profile.save()
-        return Response({"status": "Profile progress updated."}, status=status.HTTP_200_OK)
+        return Response({
+            "status": "Profile progress updated.",
+            "overall_progress": overall_progress,
+            "current_stage": current_stage,
+        }, status=status.HTTP_200_OK)
     
     @action(detail=True, methods=["get"])
     def client_details(self, request, id=None):
@@ -169,11 +205,20 @@ class DocumentViewset(viewsets.ModelViewSet):
     queryset = Document.objects.select_related('profile__user', 'reviewed_by__user').all()
     serializer_class = DocumentSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ["document_type", "status", "profile"]
+    pagination_class = TimeCursorPagination
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, OrderingFilter]
+    filterset_fields = ["document_type", "status", "profile", "profile__id"]
     search_fields = ["document_type", "profile__user__first_name", "profile__user__last_name"]
     lookup_field = 'id'
 
+    @property
+    def paginator(self):
+        # The created_at cursor would re-sort ranked search results
+        if not hasattr(self, '_paginator'):
+            searching = self.request.query_params.get(api_settings.SEARCH_PARAM)
+            self._paginator = CountFreePagination() if searching else self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
         user = self.request.user
         
@@ -202,6 +247,35 @@ class DocumentViewset(viewsets.ModelViewSet):
         
         return Response({"error": "Invalid status."}, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=["post"], url_path="bulk_review")
+    def bulk_review(self, request):
+        """Set the status of many documents of the consultant's clients at once"""
+        consultant = getattr(request.user, 'consultant_profile', None)
+
+        if not consultant:
+            return Response({"error": "Only consultants can update document status."}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = BulkDocumentReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reviews = serializer.validated_data['reviews']
+
+        try:
+            updated = review_documents(consultant, {review['id']: review['status'] for review in reviews})
+        except UnknownDocuments as e:
+            return Response({"error": str(e), "ids": e.ids}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"updated": updated, "total": len(reviews)}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, id=None):
+        """Redirect to a signed, expiring link for a document the user can see"""
+        document = self.get_object()
+        return redirect(document.document_file.url)
+
+    def create(self, request, *args, **kwargs):
+        # Same path as upload: hashed, deduplicated and queued for validation
+        return self.upload(request)
+
     @action(detail=False, methods=["post"], url_path="upload")
     def upload(self, request):
         profile = getattr(request.user, 'profile', None)
@@ -209,10 +283,17 @@ class DocumentViewset(viewsets.ModelViewSet):
         if not profile:
             return Response({"error": "Only clients can upload documents."}, status=status.HTTP_403_FORBIDDEN)
         
-        serializer = DocumentSerializer(data=request.data)
+        serializer = DocumentUploadSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(profile=profile)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            document, created = store_document(
+                profile,
+                serializer.validated_data['document_type'],
+                serializer.validated_data['document_file'],
+            )
+            return Response(
+                DocumentSerializer(document).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=["post"])
@@ -235,8 +316,8 @@ class TaskViewset(viewsets.ModelViewSet):
     queryset = Task.objects.select_related('profile__user').all()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ["is_completed", "due_date", "profile"]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, OrderingFilter]
+    filterset_fields = ["is_completed", "due_date", "profile", "profile__id"]
     search_fields = ["title", "description", "profile__user__first_name", "profile__user__last_name"]
     ordering_fields = ["due_date", "created_at", "is_completed"]
     lookup_field = 'id'
@@ -257,7 +338,60 @@ class TaskViewset(viewsets.ModelViewSet):
             return self.queryset
         
         return Task.objects.none()
-    
+
+    def get_profile_queryset(self):
+        """Profiles the user may add tasks to"""
+        user = self.request.user
+
+        if hasattr(user, 'consultant_profile'):
+            return Profile.objects.filter(relocation_consultant=user.consultant_profile)
+        elif hasattr(user, 'profile'):
+            return Profile.objects.filter(user=user)
+        elif user.is_staff:
+            return Profile.objects.all()
+
+        return Profile.objects.none()
+
+    def bulk_response(self, operation, *args):
+        try:
+            updated = operation(self.get_queryset(), *args)
+        except UnknownObjects as e:
+            return Response({"error": str(e), "ids": e.ids}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="bulk_create")
+    def bulk_create(self, request):
+        serializer = BulkTaskCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            tasks = create_tasks(self.get_profile_queryset(), serializer.validated_data['tasks'])
+        except UnknownObjects as e:
+            return Response({"error": str(e), "ids": e.ids}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(TaskSerializer(tasks, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="bulk_complete")
+    def bulk_complete(self, request):
+        """Mark many tasks complete, or incomplete with `is_completed: false`"""
+        serializer = BulkTaskCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.bulk_response(set_completed, serializer.validated_data['ids'], serializer.validated_data['is_completed'])
+
+    @action(detail=False, methods=["post"], url_path="bulk_reorder")
+    def bulk_reorder(self, request):
+        serializer = BulkTaskReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        orders = {task['id']: task['order'] for task in serializer.validated_data['tasks']}
+        return self.bulk_response(reorder_tasks, orders)
+
+    @action(detail=False, methods=["post"], url_path="bulk_move")
+    def bulk_move(self, request):
+        """Move many tasks to another relocation stage"""
+        serializer = BulkTaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.bulk_response(move_tasks, serializer.validated_data['ids'], serializer.validated_data['stage'])
+
     def perform_create(self, serializer):
         profile_id = serializer.validated_data.get('profile')
 
@@ -312,15 +446,25 @@ class TaskViewset(viewsets.ModelViewSet):
         profile_id = request.query_params.get('profile_id')
         if profile_id:
             tasks = self.get_queryset().filter(profile_id=profile_id)
+        elif hasattr(request.user, 'consultant_profile') or request.user.is_staff:
+            # Grouping every client's tasks would be unbounded
+            return Response({"error": "profile_id is required"}, status=status.HTTP_400_BAD_REQUEST)
         else:
             tasks = self.get_queryset()
-        
+
+        # One ordered fetch, grouped in Python
+        grouped = {stage_code: [] for stage_code, _ in Task.RELOCATION_STAGES}
+        for task in TaskSerializer(tasks.order_by('order', 'created_at'), many=True).data:
+            grouped.setdefault(task['stage'], []).append(task)
+
         stage_tasks = {}
         for stage_code, stage_name in Task.RELOCATION_STAGES:
+            stage_list = grouped[stage_code]
+            completed = sum(1 for task in stage_list if task['is_completed'])
             stage_tasks[stage_code] = {
                 'name': stage_name,
-                'tasks': TaskSerializer(tasks.filter(stage=stage_code), many=True).data,
-                'progress': 0  # Will be calculated in frontend
+                'tasks': stage_list,
+                'progress': stage_entry(stage_code, stage_name, len(stage_list), completed)['progress'],
             }
         
         return Response(stage_tasks, status=status.HTTP_200_OK)
@@ -332,53 +476,40 @@ class TaskViewset(viewsets.ModelViewSet):
         if not profile_id:
             return Response({"error": "profile_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        tasks = self.get_queryset().filter(profile__id=profile_id)
-        if not tasks.exists():
+        # Also checks the caller can see this profile's tasks
+        profile_pkid = self.get_queryset().filter(profile__id=profile_id).values_list('profile_id', flat=True).first()
+        if profile_pkid is None:
             return Response({
                 "overall_progress": 0,
                 "stages": []
             }, status=status.HTTP_200_OK)
 
-        stage_progress_data = []
-        total_tasks = 0
-        total_completed_tasks = 0
-
-        # Loop through each stage
-        for stage_code, stage_name in Task.RELOCATION_STAGES:
-            stage_tasks = tasks.filter(stage=stage_code)
-            total_stage = stage_tasks.count()
-            completed_stage = stage_tasks.filter(is_completed=True).count()
-
-            progress = round((completed_stage / total_stage) * 100, 2) if total_stage > 0 else 0
+        return Response(progress_snapshot(profile_pkid), status=status.HTTP_200_OK)
 
-            # Accumulate for overall progress
-            total_tasks += total_stage
-            total_completed_tasks += completed_stage
 
-            stage_progress_data.append({
-                "stage": stage_code,
-                "name": stage_name,
-                "progress": progress,
-                "total_tasks": total_stage,
-                "completed_tasks": completed_stage
-            })
-
-        # ✅ Weighted overall progress based on total tasks completed
-        overall_progress = round((total_completed_tasks / total_tasks) * 100, 2) if total_tasks > 0 else 0
+    @action(detail=False, methods=["get"])
+    def overdue_tasks(self, request):
+        overdue_tasks = overdue(self.get_queryset()).order_by('due_date', 'pkid')
+        paginator = CountFreePagination()
+        page = paginator.paginate_queryset(overdue_tasks, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-        return Response({
-            "overall_progress": overall_progress,
-            "stages": stage_progress_data
-        }, status=status.HTTP_200_OK)
+    @action(detail=False, methods=["get"])
+    def overdue_summary(self, request):
+        """Overdue counts per client from the nightly snapshot"""
+        user = request.user
 
+        if hasattr(user, 'consultant_profile'):
+            snapshots = OverdueTaskSnapshot.objects.filter(consultant=user.consultant_profile)
+        elif hasattr(user, 'profile'):
+            snapshots = OverdueTaskSnapshot.objects.filter(profile__user=user)
+        elif user.is_staff:
+            snapshots = OverdueTaskSnapshot.objects.all()
+        else:
+            snapshots = OverdueTaskSnapshot.objects.none()
 
-    @action(detail=False, methods=["get"])
-    def overdue_tasks(self, request):
-        from django.utils import timezone
-        today = timezone.now().date()
-        overdue_tasks = self.get_queryset().filter(is_completed=False, due_date__lt=today)
-        serializer = self.get_serializer(overdue_tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(overdue_summary(snapshots), status=status.HTTP_200_OK)
     
 class GetProfileAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -392,7 +523,11 @@ class GetProfileAPIView(APIView):
                     return Response({"error": "Consultant profile not found."}, status=status.HTTP_404_NOT_FOUND)
                 serializer = ConsultantSerializer(profile)
             else:
-                profile = Profile.objects.get(user=user)
+                profile = (
+                    Profile.objects.select_related('user', 'relocation_consultant__user')
+                    .prefetch_related('documents__reviewed_by__user', 'tasks')
+                    .get(user=user)
+                )
                 if not profile:
                     return Response({"error": "User profile not found."}, status=status.HTTP_404_NOT_FOUND)
                 serializer = ProfileSerializer(profile)
@@ -408,25 +543,25 @@ class DocumentSearchAPIView(APIView):
         user = request.user
 
         if hasattr(user, 'consultant_profile'):
-            documents = Document.objects.filter(
-                profile__relocation_consultant=user.consultant_profile,
-                document_type__icontains=query
-            )
+            documents = Document.objects.filter(profile__relocation_consultant=user.consultant_profile)
         elif hasattr(user, 'profile'):
-            documents = Document.objects.filter(
-                profile__user=user,
-                document_type__icontains=query
-            )
+            documents = Document.objects.filter(profile__user=user)
         elif user.is_staff:
-            documents = Document.objects.filter(document_type__icontains=query)
+            documents = Document.objects.all()
         else:
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
-        serializer = DocumentSerializer(documents, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        documents = ranked_search(documents, query) if query else documents.order_by('-created_at')
+
+        paginator = CountFreePagination()
+        page = paginator.paginate_queryset(documents.select_related('profile__user', 'reviewed_by__user'), request, view=self)
+        serializer = DocumentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
 
 class DocumentStatusOverviewAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
     def get(self, request):
         user =self.request.user
         status_filter = request.query_params.get('status', None)
@@ -437,54 +572,41 @@ class DocumentStatusOverviewAPIView(APIView):
             consulant = user.consultant_profile
             documents = documents.filter(reviewed_by=consulant)
 
+        elif user.is_staff or user.is_superuser:
+            pass
+
         elif hasattr(user, "profile"):
             documents = documents.filter(profile__user=user)
         else:
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
         if status_filter:
-            documents = Document.objects.filter(status=status_filter)
-            serializer = DocumentSerializer(documents, many=True)
+            documents = (
+                documents.filter(status=status_filter)
+                .select_related('profile__user', 'reviewed_by__user')
+                .order_by('-created_at', 'pkid')
+            )
+            paginator = StandardPagination()
+            page = paginator.paginate_queryset(documents, request, view=self)
+            serializer = DocumentSerializer(page, many=True)
             return Response({
                 "status": status_filter,
+                "count": paginator.page.paginator.count,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
                 "documents": serializer.data,
-                "count": documents.count()
             }, status=status.HTTP_200_OK)
         
-        status_count = (
-            Document.objects
-            .values('status')
-            .annotate(count=models.Count('id'))
-            .order_by('status')
-        )
-        total_documents = Document.objects.count()
+        status_count = status_pivot(documents)
 
         consultant_data = []
-
-        consultants = Consultant.objects.select_related('user').all()
-
         if user.is_staff or user.is_superuser:
-            for consultant in consultants:
-                consultant_docs = Document.objects.filter(reviewed_by=consultant)
-                consultant_counts ={
-                    consultant_docs.values('status')
-                    .annotate(count=models.Count('id'))
-                    .order_by('status')
-                }
-
-                consultant_data.append({
-                    "consultant_id": consultant.id,
-                    "consultant_name": consultant.user.get_full_name(),
-                    "document_counts": list(consultant_counts),
-                    "employee_id": consultant.employee_id,
-                    "specialization": consultant.specialization,
-                    "status_breakdown": consultant_counts,
-                    "total_reviewed": consultant_docs.count()
-                })
+            # Precomputed by the refresh_document_summaries beat task
+            consultant_data = consultant_overview()
 
         return Response({
-            "total_documents": total_documents,
-            "status_overview": list(status_count),
+            "total_documents": sum(status_count.values()),
+            "status_overview": [{"status": key, "count": count} for key, count in sorted(status_count.items())],
             "consultant_overview": consultant_data
         }, status=status.HTTP_200_OK)
     
@@ -496,33 +618,42 @@ class TaskSearchAPIView(APIView):
         user = request.user
 
         if hasattr(user, 'consultant_profile'):
-            tasks = Task.objects.filter(
-                profile__relocation_consultant=user.consultant_profile,
-                title__icontains=query
-            )
+            tasks = Task.objects.filter(profile__relocation_consultant=user.consultant_profile)
         elif hasattr(user, 'profile'):
-            tasks = Task.objects.filter(
-                profile__user=user,
-                title__icontains=query
-            )
+            tasks = Task.objects.filter(profile__user=user)
         elif user.is_staff:
-            tasks = Task.objects.filter(title__icontains=query)
+            tasks = Task.objects.all()
         else:
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if query:
+            tasks = ranked_search(tasks, query)
+
+        paginator = CountFreePagination()
+        page = paginator.paginate_queryset(tasks.select_related('profile__user'), request, view=self)
+        serializer = TaskSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
 class TaskDueOverviewAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
-    
+    histogram_buckets = {'week': TruncWeek, 'month': TruncMonth}
+
     def get(self, request):
         try:
             user = request.user
             filter_type = request.query_params.get('filter', 'all')  # New parameter for filter type
             search_query = request.query_params.get('q', '')  # Search query parameter
-            page = request.query_params.get('page', 1)
-            page_size = request.query_params.get('page_size', 10)
+            bucket = request.query_params.get('bucket', 'week')  # Histogram bucket: week or month
+            try:
+                page = max(int(request.query_params.get('page', 1)), 1)
+            except (TypeError, ValueError):
+                page = 1
+            try:
+                page_size = max(min(int(request.query_params.get('page_size', 10)), MAX_PAGE_SIZE), 1)
+            except (TypeError, ValueError):
+                page_size = 10
+            if bucket not in self.histogram_buckets:
+                bucket = 'week'
 
             # Base queryset based on user role
             if hasattr(user, "consultant_profile"):
@@ -543,10 +674,7 @@ class TaskDueOverviewAPIView(APIView):
 
             # Apply search filter if query provided
             if search_query:
-                tasks = tasks.filter(
-                    models.Q(title__icontains=search_query) |
-                    models.Q(description__icontains=search_query)
-                )
+                tasks = matching(tasks, search_query)
 
             # Apply filter type
             if filter_type == 'completed':
@@ -554,30 +682,47 @@ class TaskDueOverviewAPIView(APIView):
             elif filter_type == 'pending':
                 tasks = tasks.filter(is_completed=False)
             elif filter_type == 'overdue':
-                today = timezone.now().date()
-                tasks = tasks.filter(is_completed=False, due_date__lt=today)
+                tasks = overdue(tasks)
             # 'all' - no additional filtering needed
 
-            # Apply pagination
-            paginator = Paginator(tasks.order_by('due_date'), page_size)
-            paginated_tasks = paginator.get_page(page)
+            # The page and the filtered total in one query
+            def fetch_page(number):
+                offset = (number - 1) * page_size
+                return list(
+                    tasks.select_related('profile__user')
+                    .annotate(total_count=models.Window(models.Count('pkid')))
+                    .order_by('due_date', 'pkid')[offset:offset + page_size]
+                )
+
+            page_tasks = fetch_page(page)
+            if page_tasks:
+                total_tasks = page_tasks[0].total_count
+            else:
+                # Past the last page: clamp to it, like Paginator.get_page
+                total_tasks = tasks.count()
+                last_page = max((total_tasks + page_size - 1) // page_size, 1)
+                if page > last_page:
+                    page = last_page
+                    page_tasks = fetch_page(page) if total_tasks else []
+            total_pages = max((total_tasks + page_size - 1) // page_size, 1)
 
-            serializer = TaskSerializer(paginated_tasks, many=True)
+            serializer = TaskSerializer(page_tasks, many=True)
 
-            # Aggregate overview (for all tasks, not just paginated)
+            # Aggregate overview (for all tasks, not just paginated), one row per bucket
             due_count = (
-                tasks.values('due_date')
-                .annotate(count=models.Count('id'))
-                .order_by('due_date')
+                tasks.annotate(period=self.histogram_buckets[bucket]('due_date'))
+                .values('period')
+                .annotate(count=models.Count('pkid'))
+                .order_by('period')
             )
-            total_tasks = tasks.count()
 
             return Response({
                 "total_tasks": total_tasks,
-                "page": paginated_tasks.number,
-                "total_pages": paginator.num_pages,
-                "has_next": paginated_tasks.has_next(),
-                "has_previous": paginated_tasks.has_previous(),
+                "page": page,
+                "total_pages": total_pages,
+                "has_next": page < total_pages,
+                "has_previous": page > 1,
+                "bucket": bucket,
                 "due_overview": list(due_count),
                 "tasks": serializer.data,
                 "filter_type": filter_type,
@@ -590,6 +735,18 @@ class TaskDueOverviewAPIView(APIView):
             traceback.print_exc()
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def related_count(model, **filters):
+    """Correlated per-profile row count, evaluated only for the rows on the page"""
+    counts = (
+        model.objects.filter(profile=models.OuterRef('pk'), **filters)
+        .order_by()
+        .values('profile')
+        .annotate(count=models.Count('pkid'))
+        .values('count')
+    )
+    return Coalesce(models.Subquery(counts), 0)
+
+
 class ConsultantClientsViewset(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -599,7 +756,16 @@ class ConsultantClientsViewset(viewsets.ViewSet):
         if not hasattr(user, 'consultant_profile'):
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
         consultant = user.consultant_profile
-        clients = Profile.objects.filter(relocation_consultant=consultant).select_related('user').all().prefetch_related('documents', 'tasks')
+        clients = (
+            Profile.objects.filter(relocation_consultant=consultant)
+            .select_related('user')
+            .annotate(
+                task_count=related_count(Task),
+                completed_task_count=related_count(Task, is_completed=True),
+                document_count=related_count(Document),
+            )
+            .order_by('-updated_at')
+        )
 
         search_query = request.query_params.get('search', '')
 
@@ -621,19 +787,24 @@ class ConsultantClientsViewset(viewsets.ViewSet):
             elif progress_filter == "low":
                 clients = clients.filter(overall_progress__lt=25)
 
-        serializer = ProfileSerializer(clients, many=True)
+        paginator = StandardPagination()
+        page = paginator.paginate_queryset(clients, request, view=self)
+        serializer = ConsultantClientSerializer(page, many=True, context={"request": request})
 
-        total_clients = clients.count()
-        avg_progress = clients.aggregate(avg_progress=models.Avg('overall_progress'))['avg_progress'] or 0 
-        high_progress_count = clients.filter(overall_progress__gte=75).count()
+        # Whole-book figures from the rollup, refreshed by Celery beat
+        stats = consultant_stats(consultant)
 
         return Response({
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
             "clients": serializer.data,
             "summary": {
-                "total_clients": total_clients,
-                "average_progress": round(avg_progress, 2),
-                "high_progress_clients": high_progress_count,
-                "consultant_capacity": f"{consultant.current_client_count}/{consultant.max_clients}"
+                "total_clients": stats.total_clients,
+                "average_progress": stats.average_progress,
+                "high_progress_clients": stats.high_progress_clients,
+                "consultant_capacity": f"{consultant.current_client_count}/{consultant.max_clients}",
+                "refreshed_at": stats.refreshed_at,
             }
         })
     
@@ -648,46 +819,23 @@ class ConsultantClientsViewset(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        consultant = user.consultant_profile
-        clients = Profile.objects.filter(relocation_consultant=consultant)
-
-        # Relocation type breakdown
-        relocation_stats = (
-            clients
-            .values('relocation_type')
-            .annotate(count=models.Count('id'))
-            .order_by('-count')
-        )
+        stats = consultant_stats(user.consultant_profile)
+        task_completion_rate = (stats.completed_tasks / stats.total_tasks * 100) if stats.total_tasks > 0 else 0
 
-        # Progress distribution
-        progress_distribution = {
-            '0-25%': clients.filter(overall_progress__range=[0, 25]).count(),
-            '26-50%': clients.filter(overall_progress__range=[26, 50]).count(),
-            '51-75%': clients.filter(overall_progress__range=[51, 75]).count(),
-            '76-100%': clients.filter(overall_progress__range=[76, 100]).count(),
-        }
-
-        # Document status summary
-        document_stats = (
-            Document.objects.filter(profile__relocation_consultant=consultant)
-            .values('status')
-            .annotate(count=models.Count('id'))
-            .order_by('status')
+        relocation_stats = sorted(
+            ({'relocation_type': key or None, 'count': count} for key, count in stats.relocation_type_counts.items()),
+            key=lambda row: -row['count']
         )
-
-        # Task completion stats
-        total_tasks = Task.objects.filter(profile__relocation_consultant=consultant).count()
-        completed_tasks = Task.objects.filter(
-            profile__relocation_consultant=consultant, 
-            is_completed=True
-        ).count()
-        task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        document_stats = [
+            {'status': key, 'count': count} for key, count in sorted(stats.document_status_counts.items())
+        ]
         
         return Response({
-            'relocation_type_breakdown': list(relocation_stats),
-            'progress_distribution': progress_distribution,
-            'document_status': list(document_stats),
+            'relocation_type_breakdown': relocation_stats,
+            'progress_distribution': stats.progress_distribution,
+            'document_status': document_stats,
             'task_completion_rate': round(task_completion_rate, 1),
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks
-        })
\ No newline at end of file
+            'total_tasks': stats.total_tasks,
+            'completed_tasks': stats.completed_tasks,
+            'refreshed_at': stats.refreshed_at,
+        })
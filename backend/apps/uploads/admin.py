@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import UploadSession
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'user', 'target', 'offset', 'length', 'status', 'expires_at')
+    list_filter = ('target', 'status')
+    search_fields = ('filename', 'user__email')
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:16
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[
+                            ("document", "Document"),
+                            ("receipt", "Expense Receipt"),
+                        ],
+                        max_length=20,
+                        verbose_name="Target",
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=255, verbose_name="File Name"),
+                ),
+                (
+                    "length",
+                    models.PositiveBigIntegerField(verbose_name="Upload Length"),
+                ),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Upload Offset"
+                    ),
+                ),
+                (
+                    "metadata",
+                    models.JSONField(blank=True, default=dict, verbose_name="Metadata"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("uploading", "Uploading"),
+                            ("completed", "Completed"),
+                        ],
+                        default="uploading",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "result_id",
+                    models.UUIDField(blank=True, null=True, verbose_name="Result ID"),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(db_index=True, verbose_name="Expires At"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
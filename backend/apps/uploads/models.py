@@ -0,0 +1,50 @@
+import os
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.common.models import TimeStampedUUIDModel
+
+
+class UploadSession(TimeStampedUUIDModel):
+    """
+    A resumable upload. Its bytes are appended to a partial file until
+    `offset` reaches `length`, then finalize attaches the file to its target.
+    See apps/uploads/resumable.py.
+    """
+    TARGET_CHOICES = [
+        ("document", "Document"),
+        ("receipt", "Expense Receipt"),
+    ]
+    STATUS_CHOICES = [
+        ("uploading", "Uploading"),
+        ("completed", "Completed"),
+    ]
+
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES, verbose_name=_("Target"))
+    filename = models.CharField(max_length=255, verbose_name=_("File Name"))
+    length = models.PositiveBigIntegerField(verbose_name=_("Upload Length"))
+    offset = models.PositiveBigIntegerField(default=0, verbose_name=_("Upload Offset"))
+    metadata = models.JSONField(default=dict, blank=True, verbose_name=_("Metadata"))
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="uploading",
+        verbose_name=_("Status")
+    )
+    # id of the Document or Expense the file was attached to
+    result_id = models.UUIDField(null=True, blank=True, verbose_name=_("Result ID"))
+    expires_at = models.DateTimeField(db_index=True, verbose_name=_("Expires At"))
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.offset}/{self.length})"
+
+    @property
+    def partial_path(self):
+        return os.path.join(settings.RESUMABLE_UPLOAD_DIR, str(self.id))
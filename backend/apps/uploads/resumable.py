@@ -0,0 +1,195 @@
+"""
+Resumable uploads, tus-style.
+
+A client creates a session with the file's name and total length, then sends
+the bytes in any number of PATCH requests, each starting at the offset the
+server holds; after a dropped connection it reads the offset back and
+carries on from there. Request bodies are appended to a partial file under
+RESUMABLE_UPLOAD_DIR as they are read, CHUNK_SIZE bytes at a time, so no
+request holds more than one chunk in memory.
+
+Once the whole length is in, `finalize()` attaches the file to a Document
+(through store_document, so it is hashed, deduplicated and validated like any
+other upload) or to an Expense receipt. Storage moves the partial file into
+place rather than copying it. Sessions expire RESUMABLE_UPLOAD_TTL seconds
+after their last write and are removed by the expire_upload_sessions task.
+"""
+import fcntl
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from apps.budget.models import Expense
+from apps.profiles.documents import store_document
+
+from .models import UploadSession
+
+CHUNK_SIZE = 64 * 1024
+
+# Uploads a user may have in progress at once
+MAX_ACTIVE_SESSIONS = 10
+
+
+class UploadError(Exception):
+    """The request doesn't fit the upload session."""
+
+
+class UploadConflict(UploadError):
+    """The request raced another one: wrong offset, or the file is being written."""
+
+
+class PartialFile(File):
+    """A finished partial file; storage moves it into place instead of copying it"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def expiry():
+    return timezone.now() + timedelta(seconds=settings.RESUMABLE_UPLOAD_TTL)
+
+
+@contextmanager
+def locked_partial(session, mode):
+    """Open the session's partial file with an exclusive, non-blocking lock"""
+    if session.status != "uploading":
+        raise UploadError("Upload is already finalized.")
+    try:
+        f = open(session.partial_path, mode)
+    except FileNotFoundError:
+        raise UploadError("Upload data is gone; start a new upload.")
+    with f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadConflict("Another request is writing to this upload.")
+        # The stored offset is authoritative once the lock is held
+        session.refresh_from_db(fields=['offset', 'status'])
+        yield f
+
+
+def create_session(user, target, filename, length, metadata):
+    with transaction.atomic():
+        # Serialise the user's session creation so concurrent requests can't
+        # all pass the cap; locking the sessions would miss a user with none yet
+        get_user_model().objects.select_for_update().only('pk').get(pk=user.pk)
+        if user.upload_sessions.filter(status="uploading").count() >= MAX_ACTIVE_SESSIONS:
+            raise UploadError(f"At most {MAX_ACTIVE_SESSIONS} uploads can be in progress at once.")
+
+        session = UploadSession.objects.create(
+            user=user,
+            target=target,
+            filename=filename,
+            length=length,
+            metadata=metadata,
+            expires_at=expiry(),
+        )
+    os.makedirs(settings.RESUMABLE_UPLOAD_DIR, exist_ok=True)
+    open(session.partial_path, 'wb').close()
+    return session
+
+
+def append_chunk(session, offset, stream, content_length):
+    """
+    Append `content_length` bytes from `stream` at `offset`.
+
+    The offset must match the session's. If the client goes away mid-body,
+    whatever arrived is kept and the offset reflects it.
+    """
+    with locked_partial(session, 'r+b') as f:
+        if session.status != "uploading":
+            raise UploadError("Upload is already finalized.")
+        if offset != session.offset:
+            raise UploadConflict(f"Upload offset is {session.offset}, not {offset}.")
+        if content_length > session.length - session.offset:
+            raise UploadError("Chunk runs past the end of the upload.")
+
+        # Drop bytes a failed request wrote past the recorded offset
+        f.seek(session.offset)
+        f.truncate()
+
+        written = 0
+        try:
+            while written < content_length:
+                data = stream.read(min(CHUNK_SIZE, content_length - written))
+                if not data:
+                    break
+                f.write(data)
+                written += len(data)
+        except UnreadablePostError:
+            pass
+        f.flush()
+
+        session.offset += written
+        session.expires_at = expiry()
+        session.save(update_fields=['offset', 'expires_at', 'updated_at'])
+    return session
+
+
+def attach_document(session, file):
+    profile = getattr(session.user, 'profile', None)
+    if profile is None:
+        raise UploadError("Only clients can upload documents.")
+    document, _ = store_document(profile, session.metadata['document_type'], file)
+    return document
+
+
+def attach_receipt(session, file):
+    expense = Expense.objects.filter(id=session.metadata.get('expense'), created_by=session.user).first()
+    if expense is None:
+        raise UploadError("Expense not found.")
+    expense.receipt.save(os.path.basename(session.filename), file, save=True)
+    return expense
+
+
+ATTACHERS = {
+    "document": attach_document,
+    "receipt": attach_receipt,
+}
+
+
+def finalize(session):
+    """Attach a fully uploaded file to its target. Returns the Document or Expense."""
+    with locked_partial(session, 'rb') as f:
+        if session.status != "uploading":
+            raise UploadError("Upload is already finalized.")
+        if session.offset != session.length:
+            raise UploadError(f"Upload is incomplete: {session.offset} of {session.length} bytes.")
+
+        result = ATTACHERS[session.target](session, PartialFile(f, name=session.filename))
+
+        session.status = "completed"
+        session.result_id = result.id
+        session.expires_at = expiry()
+        session.save(update_fields=['status', 'result_id', 'expires_at', 'updated_at'])
+
+    discard_partial(session)
+    return result
+
+
+def discard_partial(session):
+    try:
+        os.remove(session.partial_path)
+    except FileNotFoundError:
+        pass
+
+
+def abort(session):
+    discard_partial(session)
+    session.delete()
+
+
+def expire_sessions():
+    """Delete sessions past their expiry, with their partial files"""
+    expired = UploadSession.objects.filter(expires_at__lt=timezone.now())
+    for session in expired.only('pkid', 'id').iterator():
+        discard_partial(session)
+    deleted, _ = expired.delete()
+    return deleted
@@ -0,0 +1,55 @@
+import uuid
+
+from django.conf import settings
+from rest_framework import serializers
+
+from apps.budget.models import Expense
+
+from .models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'target', 'filename', 'length', 'offset', 'metadata',
+            'status', 'result_id', 'expires_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class UploadSessionCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['target', 'filename', 'length', 'metadata']
+
+    def validate_length(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Upload length must be positive.")
+        if value > settings.DOCUMENT_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                f"Uploads are limited to {settings.DOCUMENT_MAX_UPLOAD_SIZE // (1024 * 1024)} MB."
+            )
+        return value
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        metadata = attrs.get('metadata') or {}
+
+        if attrs['target'] == "document":
+            if not hasattr(user, 'profile'):
+                raise serializers.ValidationError("Only clients can upload documents.")
+            document_type = metadata.get('document_type')
+            if not isinstance(document_type, str) or not document_type.strip() or len(document_type) > 100:
+                raise serializers.ValidationError({"metadata": "A document_type of up to 100 characters is required."})
+            attrs['metadata'] = {'document_type': document_type.strip()}
+        else:
+            try:
+                expense_id = uuid.UUID(str(metadata.get('expense')))
+            except ValueError:
+                expense_id = None
+            expense = Expense.objects.filter(id=expense_id, created_by=user).only('id').first()
+            if expense is None:
+                raise serializers.ValidationError({"metadata": "An expense you created is required."})
+            attrs['metadata'] = {'expense': str(expense.id)}
+        return attrs
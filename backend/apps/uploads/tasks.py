@@ -0,0 +1,15 @@
+import logging
+
+from celery import shared_task
+
+from .resumable import expire_sessions
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def expire_upload_sessions():
+    """Remove resumable uploads that have been idle past RESUMABLE_UPLOAD_TTL"""
+    deleted = expire_sessions()
+    logger.info(f"Expired {deleted} upload sessions")
+    return deleted
@@ -0,0 +1,27 @@
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from apps.users.factories import UserFactory
+
+from .resumable import MAX_ACTIVE_SESSIONS, UploadError, create_session
+
+
+@override_settings(RESUMABLE_UPLOAD_DIR=tempfile.mkdtemp())
+class CreateSessionTests(TestCase):
+    def create(self, user):
+        return create_session(user, "document", "passport.pdf", 10, {"document_type": "passport"})
+
+    def test_active_sessions_are_capped(self):
+        user = UserFactory()
+        for _ in range(MAX_ACTIVE_SESSIONS):
+            self.create(user)
+        with self.assertRaises(UploadError):
+            self.create(user)
+
+    def test_finished_sessions_free_the_cap(self):
+        user = UserFactory()
+        sessions = [self.create(user) for _ in range(MAX_ACTIVE_SESSIONS)]
+        sessions[0].status = "completed"
+        sessions[0].save(update_fields=["status"])
+        self.create(user)
@@ -0,0 +1,89 @@
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.budget.serializers import ExpenseSerializer
+from apps.profiles.serializers import DocumentSerializer
+
+from .models import UploadSession
+from .resumable import UploadConflict, UploadError, abort, append_chunk, create_session, finalize
+from .serializers import UploadSessionCreateSerializer, UploadSessionSerializer
+
+RESULT_SERIALIZERS = {
+    "document": DocumentSerializer,
+    "receipt": ExpenseSerializer,
+}
+
+
+def error_response(error):
+    code = status.HTTP_409_CONFLICT if isinstance(error, UploadConflict) else status.HTTP_400_BAD_REQUEST
+    return Response({"error": str(error)}, status=code)
+
+
+class UploadSessionViewset(viewsets.GenericViewSet):
+    """
+    Resumable uploads: POST to create a session, PATCH the raw bytes with an
+    Upload-Offset header, GET (or HEAD) to read the offset back after an
+    interruption, POST finalize/ to attach the file, DELETE to abort.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+    lookup_field = 'id'
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def session_response(self, session, status_code=status.HTTP_200_OK):
+        response = Response(UploadSessionSerializer(session).data, status=status_code)
+        response['Upload-Offset'] = str(session.offset)
+        response['Upload-Length'] = str(session.length)
+        return response
+
+    def create(self, request):
+        serializer = UploadSessionCreateSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session = create_session(request.user, **serializer.validated_data)
+        except UploadError as e:
+            return error_response(e)
+        return self.session_response(session, status.HTTP_201_CREATED)
+
+    def retrieve(self, request, id=None):
+        return self.session_response(self.get_object())
+
+    def partial_update(self, request, id=None):
+        session = self.get_object()
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            content_length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "Upload-Offset and Content-Length headers are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # The body is read straight from the request stream, never parsed
+            session = append_chunk(session, offset, request.stream, content_length)
+        except UploadError as e:
+            return error_response(e)
+        return self.session_response(session)
+
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, id=None):
+        session = self.get_object()
+        try:
+            result = finalize(session)
+        except UploadError as e:
+            return error_response(e)
+
+        return Response({
+            "upload": UploadSessionSerializer(session).data,
+            "result": RESULT_SERIALIZERS[session.target](result).data,
+        }, status=status.HTTP_200_OK)
+
+    def destroy(self, request, id=None):
+        abort(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,27 @@
+from functools import lru_cache
+
+import factory
+from django.contrib.auth.hashers import make_password
+
+from .models import User
+
+PASSWORD = "benchmark-password"
+USERNAME_PREFIX = "bench_user_"
+
+
+@lru_cache(maxsize=None)
+def password_hash():
+    """One hash shared by every built user; hashing per user would dominate bulk seeding"""
+    return make_password(PASSWORD)
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = User
+        django_get_or_create = ("username",)
+
+    username = factory.Sequence(lambda n: f"{USERNAME_PREFIX}{n}")
+    first_name = factory.Faker("first_name")
+    last_name = factory.Faker("last_name")
+    email = factory.LazyAttribute(lambda user: f"{user.username}@example.com")
+    password = factory.LazyFunction(password_hash)
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:09
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.common.operations import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0001_initial"),
+    ]
+
+    # Client-name matching in apps.profiles.search
+    operations = [
+        TrigramExtension(),
+        PostgresRunSQL(
+            sql='CREATE INDEX IF NOT EXISTS "user_first_name_trgm_idx" ON "users_user" USING gin ("first_name" gin_trgm_ops)',
+            reverse_sql='DROP INDEX IF EXISTS "user_first_name_trgm_idx"',
+        ),
+        PostgresRunSQL(
+            sql='CREATE INDEX IF NOT EXISTS "user_last_name_trgm_idx" ON "users_user" USING gin ("last_name" gin_trgm_ops)',
+            reverse_sql='DROP INDEX IF EXISTS "user_last_name_trgm_idx"',
+        ),
+    ]
@@ -46,6 +46,7 @@ LOCAL_APPS = [
     "apps.profiles",
     "apps.dashboard",
     "apps.budget",
+    "apps.uploads",
 ]
 
 DJANGO_APPS = [
@@ -57,6 +58,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_prometheus',
 ]
 
@@ -64,6 +66,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'django_prometheus.middleware.PrometheusBeforeMiddleware',
+    'apps.common.querycount.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -148,14 +151,40 @@ HEADLESS_ONLY=True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
-FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024 
-DATA_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024 
+# Uploaded files stream to a temporary file and are hashed on the way in
+# (apps/common/uploads.py), so only non-file request data is held in memory.
+FILE_UPLOAD_HANDLERS = ["apps.common.uploads.HashingUploadHandler"]
+DATA_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024
+# Checked by the validate_document task; nginx caps request bodies at 100M too
+DOCUMENT_MAX_UPLOAD_SIZE = 100 * 1024 * 1024
 STATIC_URL = "/staticfiles/"
 STATIC_ROOT = "/usr/share/nginx/html/staticfiles/"
 STATICFILES_DIRS = []
 MEDIA_URL = "/mediafiles/"
 MEDIA_ROOT = "/usr/share/nginx/html/mediafiles/"
 
+# Documents, receipts and chat images get signed, expiring download URLs and
+# are handed to nginx's internal location (apps/common/protected_media.py)
+STORAGES = {
+    "default": {"BACKEND": "apps.common.protected_media.ProtectedMediaStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+PROTECTED_MEDIA_URL_TTL = 60 * 60
+PROTECTED_MEDIA_X_ACCEL = True
+PROTECTED_MEDIA_LOCATION = "/protected-media/"
+
+# Resumable uploads (apps/uploads): partial files live on the media volume,
+# which the API and the Celery worker share; nginx refuses to serve them.
+RESUMABLE_UPLOAD_DIR = f"{MEDIA_ROOT}partial_uploads/"
+# Seconds an upload may sit idle before it is expired
+RESUMABLE_UPLOAD_TTL = 60 * 60 * 24
+
+# Per-request query budgets (apps/common/querycount.py, budgets in
+# apps/common/query_budgets.py): "log", "raise" (tests) or "off"
+QUERY_BUDGET_MODE = env("QUERY_BUDGET_MODE", default="log")
+# A query shape repeated this often in one request is reported as an N+1
+QUERY_BUDGET_REPEAT_THRESHOLD = 5
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -166,6 +195,9 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
         "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
     ),
+    # Every list is paginated; see apps/common/pagination.py
+    "DEFAULT_PAGINATION_CLASS": "apps.common.pagination.StandardPagination",
+    "PAGE_SIZE": 25,
 }
 
 # rest auth
@@ -241,4 +273,11 @@ CSRF_TRUSTED_ORIGINS = [
     'http://localhost:8080',
 ]
 
-CORS_ALLOW_CREDENTIALS = True 
\ No newline at end of file
+CORS_ALLOW_CREDENTIALS = True
+
+# WebSocket heartbeat
+# Clients send {"type": "ping"} every CHAT_HEARTBEAT_INTERVAL seconds; a socket
+# with no inbound frame for CHAT_HEARTBEAT_TIMEOUT seconds is closed, and the
+# reaper drops connections whose last heartbeat is older than that.
+CHAT_HEARTBEAT_INTERVAL = 25
+CHAT_HEARTBEAT_TIMEOUT = 75 
\ No newline at end of file
@@ -18,13 +18,50 @@ EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 #     }
 # }
 
+# Channel layer
+# Chat fan-out runs on its own Redis (`channels-redis` in docker-compose). The
+# shared `redis` instance evicts with allkeys-lru, which silently drops group
+# membership keys and queued messages once cache/Celery fill the 256mb.
+# Several hosts may be listed; channels_redis shards channels and groups
+# across them by consistent hashing.
+CHANNEL_LAYER_HOSTS = env.list("CHANNEL_LAYER_HOSTS", default=["redis://channels-redis:6379/0"])
+CHANNEL_LAYER_MODE = env("CHANNEL_LAYER_MODE", default="core")
+
+CHANNEL_LAYER_PROFILES = {
+    # List-based layer: per-channel queues with bounded capacity and expiry.
+    "core": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": CHANNEL_LAYER_HOSTS,
+            "prefix": "atlas",
+            # Messages queued per socket before group_send starts dropping
+            # for that socket (a slow consumer must not back up the room).
+            "capacity": env.int("CHANNEL_LAYER_CAPACITY", default=200),
+            # Seconds an undelivered event may wait; chat history is
+            # re-sent from the database on reconnect.
+            "expiry": env.int("CHANNEL_LAYER_EXPIRY", default=30),
+            # Consumers re-add their groups on every heartbeat, so a
+            # membership that is neither refreshed nor discarded (crashed
+            # worker, lost disconnect) lapses a few heartbeats later instead
+            # of after the library default of one day.
+            "group_expiry": env.int("CHANNEL_LAYER_GROUP_EXPIRY", default=CHAT_HEARTBEAT_TIMEOUT * 4),
+        },
+    },
+    # Redis Pub/Sub: no per-channel queues, lower latency for fan-out, but
+    # events for sockets that are not listening are simply not delivered.
+    "pubsub": {
+        "BACKEND": "channels_redis.pubsub.RedisPubSubChannelLayer",
+        "CONFIG": {
+            "hosts": CHANNEL_LAYER_HOSTS,
+            "prefix": "atlas",
+        },
+    },
+}
+
 CHANNEL_LAYERS = {
-    'default': {
-        "BACKEND": "channels_redis.core.RedisChannelLayer", 
-        'CONFIG': {
-            'hosts': [('redis', 6379)], 
-        }
-    }
+    "default": CHANNEL_LAYER_PROFILES[CHANNEL_LAYER_MODE],
+    # Both profiles stay addressable by alias for bench_channel_layer.
+    **CHANNEL_LAYER_PROFILES,
 }
 
 DATABASES = {
@@ -70,4 +107,27 @@ PAYSTACK_PLANS = {
 #         'task': 'apps.billing.tasks.process_recurring_billing',
 #         'schedule': crontab(minute='*/1'),
 #     },
-# }
\ No newline at end of file
+# }
+
+CELERY_BEAT_SCHEDULE = {
+    'reap_stale_chat_connections': {
+        'task': 'apps.chat.tasks.reap_stale_connections',
+        'schedule': crontab(minute='*/1'),
+    },
+    'refresh_document_summaries': {
+        'task': 'apps.profiles.tasks.refresh_document_summaries',
+        'schedule': crontab(minute='*/5'),
+    },
+    'refresh_consultant_stats': {
+        'task': 'apps.profiles.tasks.refresh_consultant_stats',
+        'schedule': crontab(minute='*/5'),
+    },
+    'expire_upload_sessions': {
+        'task': 'apps.uploads.tasks.expire_upload_sessions',
+        'schedule': crontab(minute=0),
+    },
+    'snapshot_overdue_tasks': {
+        'task': 'apps.profiles.tasks.snapshot_overdue_tasks',
+        'schedule': crontab(hour=2, minute=0),
+    },
+}
\ No newline at end of file
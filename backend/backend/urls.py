@@ -8,4 +8,7 @@ urlpatterns = [
     path("api/v1/auth/", include("djoser.urls.jwt")),
     path("api/v1/budget/", include("apps.budget.urls")),
     path("api/v1/chat/", include("apps.chat.urls")),
+    path("api/v1/uploads/", include("apps.uploads.urls")),
+    path("api/v1/files/", include("apps.common.urls")),
+    path("", include("django_prometheus.urls")),
 ]
@@ -61,7 +61,7 @@ export const fetchExpenses = () => async (dispatch, getState) => {
 
         dispatch({
             type: "EXPENSES_LIST_SUCCESS",
-            payload: data
+            payload: data.results ?? data
         })
 
     } catch(error) {
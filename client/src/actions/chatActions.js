@@ -1,4 +1,5 @@
 import axios from "axios";
+import { fetchAllPages } from "./pagination";
 
 const API_URL = import.meta.env.VITE_API_URL 
 
@@ -14,9 +15,9 @@ export const fetchChats = () => async (dispatch, getState) => {
             },
         };
 
-        const { data } = await axios.get(`${API_URL}/api/v1/chat/list`, config);
+        const chats = await fetchAllPages(`${API_URL}/api/v1/chat/list/`, config);
 
-        dispatch({ type: "CHAT_LIST_SUCCESS", payload: data });
+        dispatch({ type: "CHAT_LIST_SUCCESS", payload: chats });
     } catch (error) {
         dispatch({
             type: "CHAT_LIST_FAIL",
@@ -0,0 +1,17 @@
+import axios from "axios";
+
+// List endpoints are paginated ({ next, results }); follow `next` until the
+// last page and return every row. Unpaginated responses are returned as is.
+export const fetchAllPages = async (url, config) => {
+    const rows = [];
+    let next = url;
+    while (next) {
+        const { data } = await axios.get(next, config);
+        if (!data.results) {
+            return data;
+        }
+        rows.push(...data.results);
+        next = data.next;
+    }
+    return rows;
+};
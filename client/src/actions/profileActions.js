@@ -2,6 +2,7 @@ import axios from "axios";
 
 const API_URL = import.meta.env.VITE_API_URL
 import { logout } from "./userActions";
+import { fetchAllPages } from "./pagination";
 
 export const getAuthHeaders = (getState, dispatch) => {
     const { userLoginReducer } = getState();
@@ -62,7 +63,10 @@ export const loadProfile = (id) => async(dispatch, getState) => {
 
         const authHeaders = getAuthHeaders(getState);
 
-        const url = id ? `${API_URL}/api/v1/profile/profiles/${id}/client_details/`: `${API_URL}/api/v1/profile/profiles/`;
+        // The list leaves nested relations out unless expanded
+        const url = id
+            ? `${API_URL}/api/v1/profile/profiles/${id}/client_details/`
+            : `${API_URL}/api/v1/profile/profiles/?expand=documents,tasks,consultant,consultant_details`;
 
         // Correct endpoint based on your URLs
         const {data} = await axios.get(url, authHeaders);
@@ -153,7 +157,7 @@ export const loadAvailableConsultants = () => async(dispatch, getState) => {
 
         dispatch({
             type: "AVAILABLE_CONSULTANTS_LOAD_SUCCESS",
-            payload: data,
+            payload: data.results ?? data,
         })
     } catch(error) {
         dispatch({
@@ -226,14 +230,15 @@ export const loadDocuments = (profileId) => async (dispatch, getState) => {
         dispatch({ type: "DOCUMENTS_LOAD_REQUEST" });
 
         const authHeaders = getAuthHeaders(getState);
-        const { data } = await axios.get(
-            `${API_URL}/api/v1/profile/documents/`,
+        const query = profileId ? `?profile__id=${profileId}` : "";
+        const documents = await fetchAllPages(
+            `${API_URL}/api/v1/profile/documents/${query}`,
             authHeaders
         );
 
         dispatch({
             type: "DOCUMENTS_LOAD_SUCCESS",
-            payload: data,
+            payload: documents,
         });
     } catch (error) {
         dispatch({
@@ -270,19 +275,21 @@ export const uploadDocument = (documentData) => async(dispatch, getState) => {
     }
 }
 
-export const loadTasks = () => async(dispatch, getState) => {
+export const loadTasks = (profileId) => async(dispatch, getState) => {
     try {
         dispatch({ type: "TASKS_LOAD_REQUEST" });
 
         const authHeaders = getAuthHeaders(getState);
 
-        const {data} = await axios.get(`${API_URL}/api/v1/profile/tasks/`, authHeaders);
+        // Consultants see every client's tasks; narrow to one client when given
+        const query = profileId ? `?profile__id=${profileId}` : "";
+        const tasks = await fetchAllPages(`${API_URL}/api/v1/profile/tasks/${query}`, authHeaders);
 
-        console.log("Tasks loaded:", data);
+        console.log("Tasks loaded:", tasks);
 
         dispatch({
             type: "TASKS_LOAD_SUCCESS",
-            payload: data,
+            payload: tasks,
         })
     } catch(error) {
         dispatch({
@@ -334,7 +341,7 @@ export const loadOverdueTasks = () => async(dispatch, getState) => {
 
         dispatch({
             type: "OVERDUE_TASKS_LOAD_SUCCESS",
-            payload: data,
+            payload: data.results ?? data,
         })
     } catch(error) {
         dispatch({
@@ -487,7 +494,7 @@ export const documentSearch = (query) => async (dispatch, getState) => {
 
         dispatch({
             type: "DOCUMENT_SEARCH_SUCCESS",
-            payload: data,
+            payload: data.results ?? data,
         });
     } catch (error) {
         console.error("Error searching documents:", error);
@@ -548,7 +555,7 @@ export const taskSearch = (query) => async (dispatch, getState) => {
 
         dispatch({
             type: "TASK_SEARCH_SUCCESS",
-            payload: data,
+            payload: data.results ?? data,
         });
     } catch (error) {
         console.error("Error searching tasks:", error);
@@ -646,7 +653,7 @@ export const getConsultantProfile = () => async (dispatch, getState) => {
 
         dispatch({
             type: "GET_CONSULTANT_PROFILE_SUCCESS",
-            payload: data,
+            payload: data.results ?? data,
         });
     } catch (error) {
         dispatch({
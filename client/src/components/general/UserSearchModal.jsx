@@ -38,7 +38,7 @@ const UserSearchModal = ({ isOpen, onClose, onNewConversationStarted }) => {
       if (!response.ok) throw new Error('Search failed');
 
       const data = await response.json();
-      setSearchResults(data);
+      setSearchResults(data.results ?? data);
       console.log('Search results:', data);
     } catch (err) {
       console.error('Search error:', err);
@@ -348,13 +348,13 @@ const ClientDashboard = ({ stats_data }) => {
                                             <div>
                                                 <div className="text-sm text-gray-500">Tasks</div>
                                                 <div className="text-lg font-semibold text-gray-900">
-                                                    {client.tasks?.filter(t => t.is_completed).length || 0}/{client.tasks?.length || 0}
+                                                    {client.completed_task_count || 0}/{client.task_count || 0}
                                                 </div>
                                             </div>
                                             <div>
                                                 <div className="text-sm text-gray-500">Documents</div>
                                                 <div className="text-lg font-semibold text-gray-900">
-                                                    {client.documents?.length || 0}
+                                                    {client.document_count || 0}
                                                 </div>
                                             </div>
                                             <div>
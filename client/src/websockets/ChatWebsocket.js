@@ -1,4 +1,9 @@
 // ChatWebSocket.js - CORRECTED VERSION
+
+// Must stay below CHAT_HEARTBEAT_TIMEOUT on the server (75s), which closes
+// sockets that send nothing for that long.
+const HEARTBEAT_INTERVAL_MS = 25000;
+
 class ChatWebSocket {
     constructor() {
         this.chatSocket = null;
@@ -7,6 +12,23 @@ class ChatWebSocket {
         this.chatListCallbacks = null;
         this.chatCallbacks = null;
         this.statusCallbacks = null;
+        this.heartbeats = {};
+    }
+
+    startHeartbeat(name, socket) {
+        this.stopHeartbeat(name);
+        this.heartbeats[name] = setInterval(() => {
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(JSON.stringify({ type: 'ping' }));
+            }
+        }, HEARTBEAT_INTERVAL_MS);
+    }
+
+    stopHeartbeat(name) {
+        if (this.heartbeats[name]) {
+            clearInterval(this.heartbeats[name]);
+            delete this.heartbeats[name];
+        }
     }
 
     getWebSocketUrl(endpoint, accessToken) {
@@ -42,6 +64,7 @@ class ChatWebSocket {
     
         this.chatListSocket.onopen = () => {
             console.log("✅ Chat list WebSocket connected");
+            this.startHeartbeat('chatList', this.chatListSocket);
             if (this.chatListCallbacks?.onConnect) {
                 this.chatListCallbacks.onConnect();
             }
@@ -54,6 +77,8 @@ class ChatWebSocket {
     
                 if (data.type === 'chatlist_update' && this.chatListCallbacks?.onChatListUpdate) {
                     this.chatListCallbacks.onChatListUpdate(data); // Send the whole data object
+                } else if (data.type === 'documents_reviewed' && this.chatListCallbacks?.onDocumentsReviewed) {
+                    this.chatListCallbacks.onDocumentsReviewed(data);
                 } else if (data.type === 'connected' && this.chatListCallbacks?.onConnect) {
                     this.chatListCallbacks.onConnect(data);
                 }
@@ -74,6 +99,7 @@ class ChatWebSocket {
         
         this.chatListSocket.onclose = (event) => {
             console.log(`🔌 Chat list WebSocket closed: ${event.code} - ${event.reason}`);
+            this.stopHeartbeat('chatList');
             if (this.chatListCallbacks?.onDisconnect) {
                 this.chatListCallbacks.onDisconnect(event);
             }
@@ -112,6 +138,7 @@ class ChatWebSocket {
 
         this.chatSocket.onopen = () => {
             console.log("✅ Connected to chat WebSocket");
+            this.startHeartbeat('chat', this.chatSocket);
             if (this.chatCallbacks?.onConnect) {
                 this.chatCallbacks.onConnect();
             }
@@ -132,6 +159,7 @@ class ChatWebSocket {
         
         this.chatSocket.onclose = (event) => {
             console.log('🔌 Chat WebSocket disconnected:', event.code, event.reason);
+            this.stopHeartbeat('chat');
             if (this.chatCallbacks?.onDisconnect) {
                 this.chatCallbacks.onDisconnect(event);
             }
@@ -182,6 +210,7 @@ class ChatWebSocket {
         
         this.statusSocket.onopen = () => {
             console.log("✅ Status WebSocket connected");
+            this.startHeartbeat('status', this.statusSocket);
             if (this.statusCallbacks?.onConnect) {
                 this.statusCallbacks.onConnect();
             }
@@ -212,6 +241,7 @@ class ChatWebSocket {
         
         this.statusSocket.onclose = (event) => {
             console.log("🔌 Status WebSocket disconnected:", event.code, event.reason);
+            this.stopHeartbeat('status');
         };
     }
 